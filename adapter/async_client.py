@@ -0,0 +1,437 @@
+"""
+Asynchronous SofaScore adapter.
+Mirrors the synchronous fetch functions on top of httpx.AsyncClient so that
+many events can be fetched concurrently with a bounded number of requests.
+"""
+import asyncio
+import contextvars
+import concurrent.futures
+from datetime import date
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+import httpx
+from httpx import RequestError, HTTPStatusError
+from tenacity import AsyncRetrying
+
+from .models import Event
+from .store import index_events
+from .ratelimit import honor_throttling, rate_limiter, retry_policy
+from .resilience import breaker, request_timeout
+from .sofascore import (
+    API_BASE,
+    EVENTS_DAY_MAX_AGE,
+    LIVE_EVENTS_MAX_AGE,
+    EVENT_MAX_AGE,
+    EVENT_STATS_MAX_AGE,
+    LIVE_EVENTS_STALE_WHILE_REVALIDATE,
+    _client_options,
+    _events_from_payload,
+    _events_day_path,
+    _is_not_found,
+    _live_events_path,
+    _days_in_range,
+    _dedupe_day_buckets,
+    _decode_events,
+)
+from src.core.config import config
+from src.core.logging import get_logger
+from src.utils.cache import (
+    AsyncSingleFlight,
+    CachedCall,
+    StaleEntry,
+    make_cache_key,
+    NotModified,
+    UpstreamUnavailable,
+    current_revalidation,
+    revalidation_context,
+)
+
+# Setup logger
+logger = get_logger("adapter.async")
+
+T = TypeVar("T")
+
+
+class AsyncSofaScoreClient:
+    """Asynchronous SofaScore client with bounded-concurrency bulk fetching."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            concurrency: Maximum number of requests in flight (default from config)
+            client: Optional pre-configured httpx.AsyncClient to use
+            use_cache: Whether to read and write the shared file cache
+        """
+        self.concurrency = concurrency or config.ASYNC_CONCURRENCY
+        self.use_cache = use_cache
+        self._client = client
+        self._owns_client = client is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Coalesces concurrent fetches of the same cache key
+        self._flights = AsyncSingleFlight()
+        # Stale-while-revalidate refreshes still running
+        self._background: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "AsyncSofaScoreClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying httpx.AsyncClient, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(**_client_options())
+        return self._client
+
+    async def aclose(self) -> None:
+        """Wait for background refreshes, then close the HTTP client if this instance created it."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def gather(
+        self,
+        aws: Iterable[Awaitable[T]],
+        return_exceptions: bool = False,
+    ) -> List[T]:
+        """
+        Await many coroutines with at most ``concurrency`` running at once.
+
+        Args:
+            aws: Coroutines to run
+            return_exceptions: Return exceptions as results instead of raising
+
+        Returns:
+            Results in the same order as the input
+        """
+        semaphore = self._get_semaphore()
+
+        async def bounded(aw: Awaitable[T]) -> T:
+            async with semaphore:
+                return await aw
+
+        return await asyncio.gather(
+            *(bounded(aw) for aw in aws),
+            return_exceptions=return_exceptions,
+        )
+
+    async def _get(self, path: str) -> Dict[str, Any]:
+        """
+        Perform a GET request against the SofaScore API.
+        Retries network errors and throttled (429 / 503) responses, honoring
+        Retry-After, with the same policy, circuit breaker and deadline as the
+        synchronous client.
+        """
+        url = f"{API_BASE}{path}"
+        async for attempt in AsyncRetrying(**retry_policy()):
+            with attempt:
+                logger.debug(f"Making async GET request to {url}")
+                revalidation = current_revalidation()
+                headers = revalidation.request_headers() if revalidation else None
+                await rate_limiter.acquire_async(path)
+                timeout = request_timeout()
+                with breaker.guard():
+                    response = await self.client.get(url, headers=headers, timeout=timeout)
+                    if response.status_code == 304 and revalidation is not None:
+                        raise NotModified(url)
+                    honor_throttling(path, response)
+                    response.raise_for_status()
+                if revalidation is not None:
+                    revalidation.capture(
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        len(response.content),
+                    )
+                return response.json()
+
+    async def _load(self, call: CachedCall, fetch: Callable[[], Awaitable[T]], stale: Optional[StaleEntry] = None) -> T:
+        """Fetch and store a value following ``call``'s rules, revalidating an expired entry if it has validators."""
+        loop = asyncio.get_running_loop()
+        if stale is None:
+            stale = await loop.run_in_executor(None, call.stale)
+        with revalidation_context(stale.validators if stale else None) as revalidation:
+            try:
+                result = await fetch()
+            except NotModified:
+                return await loop.run_in_executor(None, call.renewed, stale)
+            except UpstreamUnavailable as e:
+                return call.unavailable(e, stale)
+        return await loop.run_in_executor(None, call.store, result, revalidation.response_validators)
+
+    async def _load_if_missing(self, call: CachedCall, fetch: Callable[[], Awaitable[T]]) -> T:
+        # A caller that missed just as the previous flight stored its result finds it here
+        cached_result = await asyncio.get_running_loop().run_in_executor(None, partial(call.fresh, count=False))
+        if cached_result is not None:
+            return cached_result
+        return await self._load(call, fetch)
+
+    async def _refresh_in_background(self, call: CachedCall, fetch: Callable[[], Awaitable[T]], stale: StaleEntry) -> None:
+        try:
+            await self._flights.do(call.key, partial(self._load, call, fetch, stale))
+        except Exception as e:
+            logger.warning(f"Background refresh of {call.key} failed: {e}")
+
+    async def _cached(
+        self,
+        key: str,
+        max_age: int,
+        fetch: Callable[[], Awaitable[T]],
+        stale_while_revalidate: int = 0,
+        decode: Optional[Callable[[Any], T]] = None,
+        fallback: Optional[Callable[[], T]] = None,
+    ) -> T:
+        """
+        Serve a value from the shared cache or fetch and store it, following
+        the same ``CachedCall`` steps as ``@cached``. Disk access runs in the
+        default executor so the event loop is not blocked.
+        """
+        call = CachedCall(key, max_age, decode, stale_while_revalidate, fallback)
+        if not self.use_cache:
+            try:
+                return await self._flights.do(key, fetch)
+            except UpstreamUnavailable as e:
+                return call.unavailable(e, None)
+
+        loop = asyncio.get_running_loop()
+        cached_result = await loop.run_in_executor(None, call.fresh)
+        if cached_result is not None:
+            logger.debug(f"Cache hit for {key}")
+            return cached_result
+
+        stale = await loop.run_in_executor(None, call.servable_stale)
+        if stale is not None:
+            if not self._flights.in_flight(key):
+                task = asyncio.ensure_future(self._refresh_in_background(call, fetch, stale))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return stale.value
+
+        return await self._flights.do(key, partial(self._load_if_missing, call, fetch))
+
+    async def list_events_for_day(self, day: date, sport: str = config.DEFAULT_SPORT) -> List[Event]:
+        """
+        List all events scheduled for a given day.
+        Returns an empty list if the endpoint returns 404, and otherwise the
+        last cached listing, or else an uncached empty list, when the request fails.
+
+        Args:
+            day: Date to fetch events for
+            sport: Sport type (default from config)
+
+        Returns:
+            List of Event objects
+        """
+        async def fetch() -> List[Event]:
+            try:
+                data = await self._get(_events_day_path(day, sport))
+            except (HTTPStatusError, RequestError) as e:
+                if not _is_not_found(e):
+                    raise UpstreamUnavailable(f"Could not fetch events for {day}: {e}") from e
+                logger.warning(f"No events listed for {day}; returning empty list.")
+                return []
+            events = _events_from_payload(data)
+            await asyncio.get_running_loop().run_in_executor(None, index_events, events, day, sport)
+            return events
+
+        key = make_cache_key("list_events_for_day", day, sport)
+        return await self._cached(key, EVENTS_DAY_MAX_AGE, fetch, decode=_decode_events, fallback=list)
+
+    async def list_events_for_range(
+        self,
+        start: date,
+        end: date,
+        sport: str = config.DEFAULT_SPORT,
+    ) -> Dict[date, List[Event]]:
+        """
+        List all events scheduled between two days, fetching the days concurrently.
+
+        Args:
+            start: First day of the range
+            end: Last day of the range (inclusive)
+            sport: Sport type (default from config)
+
+        Returns:
+            Dictionary mapping each day, in order, to its de-duplicated events
+        """
+        days = _days_in_range(start, end)
+        listings = await self.gather(self.list_events_for_day(day, sport) for day in days)
+        return dict(_dedupe_day_buckets(zip(days, listings)))
+
+    async def list_live_events(self, sport: str = config.DEFAULT_SPORT) -> List[Event]:
+        """
+        Fetch all currently live events for the given sport.
+        Returns an empty list if the endpoint returns 404, and otherwise the
+        last cached listing, or else an uncached empty list, when the request fails.
+
+        Args:
+            sport: Sport type (default from config)
+
+        Returns:
+            List of Event objects
+        """
+        async def fetch() -> List[Event]:
+            try:
+                data = await self._get(_live_events_path(sport))
+            except (HTTPStatusError, RequestError) as e:
+                if not _is_not_found(e):
+                    raise UpstreamUnavailable(f"Could not fetch live events: {e}") from e
+                logger.warning("No live events listed; returning empty list.")
+                return []
+            events = _events_from_payload(data)
+            await asyncio.get_running_loop().run_in_executor(None, partial(index_events, events, sport=sport))
+            return events
+
+        key = make_cache_key("list_live_events", sport)
+        return await self._cached(key, LIVE_EVENTS_MAX_AGE, fetch, LIVE_EVENTS_STALE_WHILE_REVALIDATE, _decode_events, list)
+
+    async def _get_payload(self, path: str, what: str) -> Dict[str, Any]:
+        """Get a JSON payload, raising errors other than 404 as UpstreamUnavailable."""
+        try:
+            return await self._get(path)
+        except (HTTPStatusError, RequestError) as e:
+            if _is_not_found(e):
+                raise
+            raise UpstreamUnavailable(f"Could not fetch {what}: {e}") from e
+
+    async def fetch_event(self, event_id: int) -> Dict[str, Any]:
+        """
+        Fetch detailed data for a single event.
+
+        Args:
+            event_id: ID of the event to fetch
+
+        Returns:
+            Dictionary with event data
+        """
+        key = make_cache_key("fetch_event", event_id)
+        return await self._cached(key, EVENT_MAX_AGE, partial(self._get_payload, f"/event/{event_id}", f"event {event_id}"))
+
+    async def fetch_event_stats(self, event_id: int) -> Dict[str, Any]:
+        """
+        Fetch statistical data for a single event.
+
+        Args:
+            event_id: ID of the event to fetch statistics for
+
+        Returns:
+            Dictionary with statistics data
+        """
+        key = make_cache_key("fetch_event_stats", event_id)
+        return await self._cached(key, EVENT_STATS_MAX_AGE, partial(
+            self._get_payload, f"/event/{event_id}/statistics", f"statistics for event {event_id}"
+        ))
+
+    async def _fetch_many(
+        self,
+        fetch: Callable[[int], Awaitable[Dict[str, Any]]],
+        event_ids: Iterable[int],
+    ) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Fetch one payload per event id, mapping failures to None."""
+        ids = list(dict.fromkeys(event_ids))
+        results = await self.gather((fetch(event_id) for event_id in ids), return_exceptions=True)
+
+        payloads: Dict[int, Optional[Dict[str, Any]]] = {}
+        for event_id, result in zip(ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not fetch {fetch.__name__} for event {event_id}: {result}")
+                payloads[event_id] = None
+            else:
+                payloads[event_id] = result
+        return payloads
+
+    async def fetch_events(self, event_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Fetch details for many events concurrently.
+
+        Args:
+            event_ids: IDs of the events to fetch
+
+        Returns:
+            Mapping of event id to event data, or None if the fetch failed
+        """
+        return await self._fetch_many(self.fetch_event, event_ids)
+
+    async def fetch_events_stats(self, event_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Fetch statistics for many events concurrently.
+
+        Args:
+            event_ids: IDs of the events to fetch statistics for
+
+        Returns:
+            Mapping of event id to statistics data, or None if the fetch failed
+        """
+        return await self._fetch_many(self.fetch_event_stats, event_ids)
+
+
+def run_sync(aw: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    Works even when called from a thread that already runs an event loop;
+    the coroutine sees the caller's context variables (e.g. its deadline).
+
+    Args:
+        aw: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(aw)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, aw).result()
+
+
+def fetch_events_bulk(event_ids: Iterable[int], concurrency: Optional[int] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+    """
+    Synchronous wrapper around AsyncSofaScoreClient.fetch_events.
+
+    Args:
+        event_ids: IDs of the events to fetch
+        concurrency: Maximum number of requests in flight (default from config)
+
+    Returns:
+        Mapping of event id to event data, or None if the fetch failed
+    """
+    async def run() -> Dict[int, Optional[Dict[str, Any]]]:
+        async with AsyncSofaScoreClient(concurrency=concurrency) as client:
+            return await client.fetch_events(event_ids)
+    return run_sync(run())
+
+
+def fetch_events_stats_bulk(event_ids: Iterable[int], concurrency: Optional[int] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+    """
+    Synchronous wrapper around AsyncSofaScoreClient.fetch_events_stats.
+
+    Args:
+        event_ids: IDs of the events to fetch statistics for
+        concurrency: Maximum number of requests in flight (default from config)
+
+    Returns:
+        Mapping of event id to statistics data, or None if the fetch failed
+    """
+    async def run() -> Dict[int, Optional[Dict[str, Any]]]:
+        async with AsyncSofaScoreClient(concurrency=concurrency) as client:
+            return await client.fetch_events_stats(event_ids)
+    return run_sync(run())
@@ -0,0 +1,138 @@
+"""
+Compact, shared representations of events for bulk in-memory datasets.
+
+Parsed ``Event`` models each carry their own ``Team`` instances and a full
+copy of the raw tournament dict. An ``InternPool`` makes every event share
+one team and one tournament object per id, and can convert events into
+slim immutable tuples that drop the unused raw fields but keep the live
+status and scores.
+"""
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .models import Event, Status, Team
+
+class CompactTeam(NamedTuple):
+    id: int
+    name: str
+    slug: Optional[str] = None
+
+class Tournament(NamedTuple):
+    id: Optional[int]
+    name: str
+    slug: Optional[str] = None
+    category: Optional[str] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a field like the raw tournament dict, for code written against ``Event``."""
+        value = getattr(self, key) if key in self._fields else None
+        return default if value is None else value
+
+class CompactStatus(NamedTuple):
+    code: Optional[int]
+    type: Optional[str]
+    description: Optional[str]
+
+class CompactEvent(NamedTuple):
+    id: int
+    slug: str
+    tournament: Tournament
+    home_team: CompactTeam
+    away_team: CompactTeam
+    start_timestamp: int
+    status: Optional[CompactStatus] = None
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+class InternPool:
+    """
+    Registry handing out one shared object per team and tournament id.
+
+    A pool is meant to live as long as the dataset built through it; it is
+    not thread-safe, so share one per loading thread.
+    """
+
+    def __init__(self):
+        self._teams: Dict[int, Team] = {}
+        self._tournaments: Dict[Any, Dict[str, Any]] = {}
+        self._compact_teams: Dict[int, CompactTeam] = {}
+        self._compact_tournaments: Dict[Any, Tournament] = {}
+        self._compact_statuses: Dict[CompactStatus, CompactStatus] = {}
+
+    def team(self, team: Team) -> Team:
+        """Return the shared Team for this team's id."""
+        return self._teams.setdefault(team.id, team)
+
+    def tournament(self, tournament: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the shared raw tournament dict for this tournament's id."""
+        key = tournament.get("id", tournament.get("name"))
+        return self._tournaments.setdefault(key, tournament)
+
+    def intern_event(self, event: Event) -> Event:
+        """
+        Copy an event, pointing the copy at the shared team and tournament objects.
+        The event itself is left untouched, as it may be shared (e.g. by the
+        cache's memory tier).
+
+        Args:
+            event: Parsed event
+
+        Returns:
+            A shallow copy of the event
+        """
+        return event.model_copy(update={
+            "home_team": self.team(event.home_team),
+            "away_team": self.team(event.away_team),
+            "tournament": self.tournament(event.tournament),
+        })
+
+    def compact_team(self, team: Team) -> CompactTeam:
+        """Return the shared CompactTeam for this team's id."""
+        compact = self._compact_teams.get(team.id)
+        if compact is None:
+            compact = CompactTeam(team.id, _intern(team.name), _intern(team.slug))
+            self._compact_teams[team.id] = compact
+        return compact
+
+    def compact_tournament(self, tournament: Dict[str, Any]) -> Tournament:
+        """Return the shared Tournament for this raw tournament dict."""
+        key = tournament.get("id", tournament.get("name"))
+        compact = self._compact_tournaments.get(key)
+        if compact is None:
+            category = tournament.get("category")
+            compact = Tournament(
+                tournament.get("id"),
+                _intern(tournament.get("name", "Unknown")),
+                _intern(tournament.get("slug")),
+                _intern(category.get("name")) if isinstance(category, dict) else None,
+            )
+            self._compact_tournaments[key] = compact
+        return compact
+
+    def compact_status(self, status: Optional[Status]) -> Optional[CompactStatus]:
+        """Return the shared CompactStatus equal to this status."""
+        if status is None:
+            return None
+        compact = CompactStatus(status.code, _intern(status.type), _intern(status.description))
+        return self._compact_statuses.setdefault(compact, compact)
+
+    def compact_event(self, event: Event) -> CompactEvent:
+        """Convert an event into its compact form."""
+        return CompactEvent(
+            event.id,
+            event.slug,
+            self.compact_tournament(event.tournament),
+            self.compact_team(event.home_team),
+            self.compact_team(event.away_team),
+            event.start_timestamp,
+            self.compact_status(event.status),
+            event.home_score,
+            event.away_score,
+        )
+
+    def compact_events(self, events: Iterable[Event]) -> List[CompactEvent]:
+        """Convert events into their compact form."""
+        return [self.compact_event(event) for event in events]
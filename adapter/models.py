@@ -1,5 +1,5 @@
 # src/adapter/models.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Dict, Any, List, Optional
 
 class Team(BaseModel):
@@ -8,10 +8,29 @@ class Team(BaseModel):
     slug: Optional[str] = None
     # Add other fields as needed
 
+class Status(BaseModel):
+    code: Optional[int] = None
+    type: Optional[str] = None  # e.g. "notstarted", "inprogress", "finished"
+    description: Optional[str] = None  # e.g. "1st half"
+
 class Event(BaseModel):
+    # Raw API items use camelCase aliases; field names are accepted as well
+    model_config = ConfigDict(populate_by_name=True)
+    
     id: int
     slug: str
     tournament: Dict[str, Any]
-    home_team: Team
-    away_team: Team
-    start_timestamp: int
\ No newline at end of file
+    home_team: Team = Field(alias="homeTeam")
+    away_team: Team = Field(alias="awayTeam")
+    start_timestamp: int = Field(alias="startTimestamp")
+    status: Optional[Status] = None
+    home_score: Optional[int] = Field(default=None, alias="homeScore")
+    away_score: Optional[int] = Field(default=None, alias="awayScore")
+    
+    @field_validator("home_score", "away_score", mode="before")
+    @classmethod
+    def _current_score(cls, value: Any) -> Any:
+        # The API sends {"current": 1, "period1": 0, ...}; keep the current score
+        if isinstance(value, dict):
+            return value.get("current")
+        return value
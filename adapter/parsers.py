@@ -1,5 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
+from pydantic import TypeAdapter
 from .models import Event, Team
+from src.utils.cache import construct_model
+
+# Built once: validates a whole listing in a single pass through pydantic-core
+_EVENT_LIST = TypeAdapter(List[Event])
 
 def parse_team(data: Dict[str, Any]) -> Team:
     """Parse raw team data into a Team model."""
@@ -7,16 +12,21 @@ def parse_team(data: Dict[str, Any]) -> Team:
 
 def parse_event(data: Dict[str, Any]) -> Event:
     """Parse raw event data into an Event model."""
-    # First parse the team objects
-    home_team = parse_team(data.get("homeTeam", {}))
-    away_team = parse_team(data.get("awayTeam", {}))
+    return Event.model_validate(data)
+
+def parse_events(items: Iterable[Dict[str, Any]], trusted: bool = False) -> List[Event]:
+    """
+    Parse a list of events in one batch.
     
-    # Then create the event with properly parsed teams
-    return Event.model_validate({
-        "id": data.get("id"),
-        "slug": data.get("slug"),
-        "tournament": data.get("tournament"),
-        "home_team": home_team,
-        "away_team": away_team,
-        "start_timestamp": data.get("startTimestamp"),
-    })
\ No newline at end of file
+    Args:
+        items: Raw API event items (camelCase keys such as ``homeTeam``), or
+            with ``trusted`` the output of ``Event.model_dump()``
+        trusted: Skip validation and build the models directly; only for
+            data that was already validated once
+            
+    Returns:
+        List of Event objects
+    """
+    if trusted:
+        return [construct_model(Event, item) for item in items]
+    return _EVENT_LIST.validate_python(items if isinstance(items, list) else list(items))
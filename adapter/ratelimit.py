@@ -0,0 +1,385 @@
+"""
+Request rate limiting and retry policy for the SofaScore adapter.
+
+Requests are throttled by token buckets, one per endpoint class, shared by
+every thread and coroutine of the process and, through a small state file
+per bucket, by every process on the host. Throttled responses (429 / 503)
+are retried after their ``Retry-After`` delay or a jittered exponential
+backoff.
+"""
+import os
+import time
+import random
+import struct
+import threading
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from httpx import HTTPStatusError, RequestError
+from tenacity import RetryCallState, retry_if_exception, stop_after_attempt
+from tenacity.wait import wait_base
+
+from src.core.config import config
+from src.core.logging import get_logger
+from .resilience import DeadlineExceeded, remaining
+
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are shared by threads and tasks only
+    fcntl = None
+
+# Setup logger
+logger = get_logger("ratelimit")
+
+# Responses that ask the client to slow down and try again
+RETRY_STATUS_CODES = frozenset((429, 503))
+
+# Shared bucket state: tokens, last refill and paused-until (both epoch seconds)
+_STATE = struct.Struct("ddd")
+
+class RateLimiter:
+    """
+    Thread-safe token bucket, optionally shared between processes.
+
+    Callers reserve a token up front and wait for their slot, so concurrent
+    callers are spaced out evenly instead of retrying against each other.
+    With a ``path``, the bucket state lives in that file, locked with
+    ``flock``, and every process using the same file draws from the same
+    bucket (POSIX only; elsewhere the bucket stays per process).
+    """
+
+    def __init__(self, rate: float = 0, burst: int = 1, path: Optional[str] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Requests per second, 0 for unlimited
+            burst: Number of requests allowed back to back after idling
+            path: State file shared with other processes (default: per process)
+        """
+        self._lock = threading.Lock()
+        self.path = Path(path) if path and fcntl is not None else None
+        self._fd: Optional[int] = None
+        self._fd_pid: Optional[int] = None
+        self._blocked_until = 0.0
+        self.configure(rate, burst)
+
+    def configure(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Change the rate (and optionally the burst size), starting with a full bucket.
+        A shared bucket keeps the state other processes left in it.
+
+        Args:
+            rate: Requests per second, 0 for unlimited
+            burst: Number of requests allowed back to back after idling
+        """
+        with self._lock:
+            self.rate = rate
+            if burst is not None:
+                self.burst = max(1, burst)
+            self._tokens = float(self.burst)
+            self._updated = time.time()
+
+    def _open(self) -> Optional[int]:
+        """Open the state file; forked children reopen it, as flock locks are shared across fork."""
+        if self._fd is not None and self._fd_pid == os.getpid():
+            return self._fd
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        except OSError as e:
+            logger.warning(f"Rate limit state {self.path} unavailable, limiting per process: {e}")
+            self.path = None
+            return None
+        return self._fd
+
+    def _update(self, apply):
+        """
+        Atomically replace the bucket state with ``apply(tokens, updated, blocked_until, now)``.
+
+        ``apply`` returns the new (tokens, updated, blocked_until) and a result,
+        which is returned. Shared buckets are shared whatever their rate, so
+        that pauses reach every process, including unlimited ones.
+        """
+        with self._lock:
+            now = time.time()
+            fd = self._open() if self.path is not None else None
+            if fd is None:
+                (self._tokens, self._updated, self._blocked_until), result = apply(
+                    self._tokens, self._updated, self._blocked_until, now
+                )
+                return result
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(fd, _STATE.size, 0)
+                state = _STATE.unpack(data) if len(data) == _STATE.size else (float(self.burst), now, 0.0)
+                state, result = apply(*state, now)
+                os.pwrite(fd, _STATE.pack(*state), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            # Keep the last state seen, as a per-process bucket would
+            self._tokens, self._updated, self._blocked_until = state
+            return result
+
+    def reserve(self) -> float:
+        """
+        Take a token.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        if self.rate <= 0 and self.path is None and self._blocked_until <= 0:
+            return 0.0
+
+        def take(tokens, updated, blocked_until, now):
+            delay = max(0.0, blocked_until - now)
+            if self.rate <= 0:
+                # Leave the tokens to the processes sharing the bucket with a rate
+                return (tokens, updated, blocked_until), delay
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+            if tokens < 0:
+                delay = max(delay, -tokens / self.rate)
+            return (tokens, now, blocked_until), delay
+
+        return self._update(take)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller of the bucket, e.g. after a 429 with ``Retry-After``.
+
+        Args:
+            seconds: Length of the pause
+        """
+        def block(tokens, updated, blocked_until, now):
+            return (tokens, updated, max(blocked_until, now + seconds)), None
+
+        self._update(block)
+
+    def _delay(self) -> float:
+        """
+        Take a token and check that its slot comes before the caller's deadline.
+
+        Raises:
+            DeadlineExceeded: If the wait would outlast the deadline; the
+                caller gives up at once rather than sleep until it passes
+        """
+        delay = self.reserve()
+        left = remaining()
+        if delay > 0 and left is not None and delay >= left:
+            raise DeadlineExceeded(f"Command deadline exceeded waiting {delay:.1f}s for the rate limit")
+        return delay
+
+    def acquire(self) -> None:
+        """Block until the caller may send a request, at most until its deadline."""
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until the caller may send a request, at most until its deadline."""
+        # Imported here so that sync-only commands do not pay for asyncio at startup
+        import asyncio
+
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def endpoint_class(path: Optional[str]) -> str:
+    """
+    Classify an API path for rate limiting.
+
+    Args:
+        path: API path, e.g. "/event/123/statistics"
+
+    Returns:
+        One of "listing", "live", "event", "stats" or "other"
+    """
+    if not path:
+        return "other"
+    if path.startswith("/event/"):
+        return "stats" if path.endswith("/statistics") else "event"
+    if path.endswith("/events/live"):
+        return "live"
+    if "/events/date/" in path:
+        return "listing"
+    return "other"
+
+def parse_limits(spec: str) -> Dict[str, float]:
+    """
+    Parse per-endpoint-class rates such as "stats=2,listing=5".
+
+    Args:
+        spec: Comma-separated ``class=rate`` pairs
+
+    Returns:
+        Dictionary mapping endpoint class to requests per second
+    """
+    limits = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = part.partition("=")
+        try:
+            limits[name.strip()] = float(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit {part!r}")
+    return limits
+
+class EndpointRateLimiter:
+    """Routes each request to the token bucket of its endpoint class."""
+
+    def __init__(
+        self,
+        rate: float = 0,
+        burst: int = 1,
+        limits: Optional[Dict[str, float]] = None,
+        state_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Requests per second of classes without their own limit, 0 for unlimited
+            burst: Number of requests allowed back to back after idling
+            limits: Requests per second per endpoint class
+            state_dir: Directory of the bucket state files shared with other
+                processes (default: buckets are per process)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})
+        self.state_dir = state_dir
+        self._buckets: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> RateLimiter:
+        """Get the bucket of an endpoint class, creating it on first use."""
+        limiter = self._buckets.get(endpoint)
+        if limiter is None:
+            with self._lock:
+                limiter = self._buckets.get(endpoint)
+                if limiter is None:
+                    path = str(Path(self.state_dir) / f"{endpoint}.bucket") if self.state_dir else None
+                    limiter = RateLimiter(self.limits.get(endpoint, self.rate), self.burst, path)
+                    self._buckets[endpoint] = limiter
+        return limiter
+
+    def configure(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Change the rate of every endpoint class without its own limit.
+
+        Args:
+            rate: Requests per second, 0 for unlimited
+            burst: Number of requests allowed back to back after idling
+        """
+        with self._lock:
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+            for endpoint, limiter in self._buckets.items():
+                limiter.configure(self.limits.get(endpoint, rate), burst)
+
+    def reserve(self, path: Optional[str] = None) -> float:
+        """Take a token for a request to ``path``; returns the seconds to wait."""
+        return self.bucket(endpoint_class(path)).reserve()
+
+    def pause(self, path: Optional[str], seconds: float) -> None:
+        """Hold back every request to the endpoint class of ``path``."""
+        self.bucket(endpoint_class(path)).pause(seconds)
+
+    def acquire(self, path: Optional[str] = None) -> None:
+        """Block until a request to ``path`` may be sent."""
+        self.bucket(endpoint_class(path)).acquire()
+
+    async def acquire_async(self, path: Optional[str] = None) -> None:
+        """Wait, without blocking the event loop, until a request to ``path`` may be sent."""
+        await self.bucket(endpoint_class(path)).acquire_async()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header given in seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for network errors and throttled (429 / 503) responses."""
+    if isinstance(error, HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, RequestError)
+
+class wait_retry_after(wait_base):
+    """
+    Wait as long as a throttled response's ``Retry-After`` asks, otherwise
+    back off exponentially with full jitter. Settings are read from config
+    on every call. Gives up with DeadlineExceeded when the wait would
+    outlast the caller's deadline.
+    """
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        base, cap = config.RETRY_BACKOFF, config.RETRY_MAX_WAIT
+        wait = random.uniform(0, min(cap, base * 2 ** (retry_state.attempt_number - 1)))
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(error, HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                # Jitter spreads out the callers released by the same pause
+                wait = min(cap, retry_after + random.uniform(0, base))
+        left = remaining()
+        if left is not None and wait >= left:
+            raise DeadlineExceeded(f"Command deadline exceeded after {retry_state.attempt_number} attempts: {error}")
+        return wait
+
+def retry_policy() -> Dict[str, Any]:
+    """
+    Build the retry arguments shared by the sync and async clients.
+
+    Returns:
+        Keyword arguments for tenacity's ``retry`` / ``AsyncRetrying``
+    """
+    return {
+        "retry": retry_if_exception(is_retryable),
+        "wait": wait_retry_after(),
+        "stop": stop_after_attempt(config.API_RETRIES),
+        "reraise": True,
+    }
+
+# Limiter applied to every request of the host
+rate_limiter = EndpointRateLimiter(
+    config.RATE_LIMIT,
+    config.RATE_BURST,
+    parse_limits(config.RATE_LIMITS),
+    config.RATE_LIMIT_DIR or None,
+)
+
+def honor_throttling(path: str, response: "httpx.Response") -> None:
+    """
+    Pause the endpoint class of ``path`` for the ``Retry-After`` of a
+    throttled response, so that other callers on the host back off too.
+
+    Args:
+        path: API path of the request
+        response: Response received for it
+    """
+    if response.status_code in RETRY_STATUS_CODES:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after:
+            logger.warning(f"Throttled on {path} (status {response.status_code}), pausing {retry_after:.1f}s")
+            rate_limiter.pause(path, min(retry_after, config.RETRY_MAX_WAIT))
@@ -0,0 +1,206 @@
+"""
+Fail-fast guards for upstream calls.
+
+A circuit breaker stops sending requests after consecutive upstream
+failures and lets a single probe through once the reset timeout has passed.
+A deadline bounds the time a whole command may spend on the upstream: it
+shrinks request timeouts and retry waits, and once it has passed requests
+fail at once. Both raise UpstreamUnavailable, which ``@cached`` answers
+with a stale entry when it has one.
+"""
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+import httpx
+from httpx import HTTPStatusError, RequestError
+
+from src.core.config import config
+from src.core.logging import get_logger
+from src.utils.cache import UpstreamUnavailable
+
+# Setup logger
+logger = get_logger("resilience")
+
+T = TypeVar("T")
+
+class CircuitOpen(UpstreamUnavailable):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+class DeadlineExceeded(UpstreamUnavailable):
+    """Raised instead of sending a request once the command's deadline has passed."""
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by the sync and async clients.
+
+    Closed, requests flow and consecutive failures are counted. After
+    ``threshold`` failures it opens and requests fail fast. Once
+    ``reset_timeout`` has passed it is half-open: one probe request is let
+    through, closing the breaker on success and reopening it on failure.
+    A probe that never reports back is replaced after another timeout.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30):
+        """
+        Initialize the breaker.
+
+        Args:
+            threshold: Consecutive failures that open the breaker, 0 to disable it
+            reset_timeout: Seconds before an open breaker lets a probe through
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at: Optional[float] = None
+            self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self) -> None:
+        """
+        Check that a request may be sent.
+
+        Raises:
+            CircuitOpen: If the breaker is open, or half-open with a probe in flight
+        """
+        if self.threshold <= 0 or self._opened_at is None:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            retry_in = self._opened_at + self.reset_timeout - now
+            if retry_in <= 0 and (self._probe_started is None or now - self._probe_started >= self.reset_timeout):
+                self._probe_started = now
+                logger.info("Circuit half-open, probing the upstream")
+                return
+        raise CircuitOpen(f"Upstream unavailable after {self.failures} consecutive failures "
+                          f"(retrying in {max(retry_in, 0):.0f}s)")
+
+    def record_success(self) -> None:
+        """Record a response from the upstream, closing the breaker."""
+        if self.failures or self._opened_at is not None:
+            with self._lock:
+                if self._opened_at is not None:
+                    logger.info("Circuit closed, upstream recovered")
+                self.failures = 0
+                self._opened_at = None
+                self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker at the threshold."""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self.failures += 1
+            if self._opened_at is not None or self.failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit opened after {self.failures} consecutive upstream failures")
+                # A failed probe keeps the breaker open for another timeout
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Run one upstream request under the breaker.
+
+        Network errors, 5xx and 429 responses count as failures; any other
+        response, including 304 and 404, shows the upstream is up.
+        """
+        self.before_call()
+        try:
+            yield
+        except HTTPStatusError as e:
+            status = e.response.status_code
+            if status >= 500 or status == 429:
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except UpstreamUnavailable:
+            raise
+        except RequestError:
+            self.record_failure()
+            raise
+        except Exception:
+            # NotModified or an unparsable body: the upstream did answer
+            self.record_success()
+            raise
+        else:
+            self.record_success()
+
+# Breaker shared by every request of the process
+breaker = CircuitBreaker(config.BREAKER_THRESHOLD, config.BREAKER_RESET)
+
+# time.monotonic() by which the current command must be done, if it has a deadline
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the time the upstream requests made inside the block may take.
+    The deadline replaces any outer one until the block exits.
+
+    Args:
+        seconds: Time budget, None or 0 for no deadline
+    """
+    token = _deadline.set(time.monotonic() + seconds if seconds and seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Return the seconds left until the current deadline, or None without one."""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+def request_timeout() -> Any:
+    """
+    Get the timeout for the next request: the configured one, shortened to the
+    time left before the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+
+    Returns:
+        Timeout in seconds, or httpx's client default without a deadline
+    """
+    left = remaining()
+    if left is None:
+        return httpx.USE_CLIENT_DEFAULT
+    if left <= 0:
+        raise DeadlineExceeded("Command deadline exceeded")
+    return min(config.API_TIMEOUT, left)
+
+def with_current_deadline(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Bind the caller's deadline to a function run in another thread.
+    (Thread pools do not carry context variables over.)
+    """
+    expires = _deadline.get()
+
+    @wraps(func)
+    def run(*args, **kwargs) -> T:
+        token = _deadline.set(expires)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _deadline.reset(token)
+    return run
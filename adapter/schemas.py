@@ -52,6 +52,11 @@ class StatisticItemSchema(BaseModel):
     name: str
     home: Any = None
     away: Any = None
+    # Stable identifier, e.g. "ballPossession"; missing in older payloads
+    key: Optional[str] = None
+    # Numeric values behind the display strings in ``home`` / ``away``
+    homeValue: Optional[float] = None
+    awayValue: Optional[float] = None
     
 class StatisticGroupSchema(BaseModel):
     """Schema for a group of statistic items."""
@@ -60,5 +65,11 @@ class StatisticGroupSchema(BaseModel):
     
 class StatisticsSchema(BaseModel):
     """Schema for a set of statistics."""
-    name: str
-    groups: List[StatisticGroupSchema]
\ No newline at end of file
+    # Current payloads name the set by period ("ALL", "1ST", ...), older ones by name
+    name: Optional[str] = None
+    period: Optional[str] = None
+    groups: List[StatisticGroupSchema]
+
+class EventStatisticsSchema(BaseModel):
+    """Schema for the statistics response of an event."""
+    statistics: List[StatisticsSchema] = []
@@ -4,26 +4,41 @@ SofaScore adapter module.
 Provides functions to fetch events and statistics from the SofaScore API.
 """
 import sys
+import json
+import atexit
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import date
-from typing import List, Dict, Any
+from datetime import date, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 # Ensure that the project root (src/) is on sys.path for local imports
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 import httpx
 from httpx import RequestError, HTTPStatusError
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    wait_fixed,
-    stop_after_attempt,
-)
-from .models import Event, Team  # Use relative import
+from tenacity import retry
+from .models import Event  # Use relative import
+from .parsers import parse_event, parse_events
+from .store import index_events
+from .ratelimit import honor_throttling, rate_limiter, retry_policy
+from .resilience import breaker, request_timeout, with_current_deadline
 
 # Import configuration
 from src.core.config import config
 from src.core.logging import get_logger
+from src.utils.cache import (
+    cache,
+    cached,
+    decode_value,
+    encode_model_list,
+    make_cache_key,
+    NotModified,
+    UpstreamUnavailable,
+    current_revalidation,
+)
+from src.utils.jsonstream import iter_array_items
 
 # Setup logger
 logger = get_logger("adapter")
@@ -32,6 +47,21 @@ logger = get_logger("adapter")
 API_BASE = config.API_BASE
 API_TIMEOUT = config.API_TIMEOUT
 API_RETRIES = config.API_RETRIES
+
+# Cache lifetimes (seconds) shared by the sync and async clients
+EVENTS_DAY_MAX_AGE = 3600
+LIVE_EVENTS_MAX_AGE = 60
+EVENT_MAX_AGE = 600
+EVENT_STATS_MAX_AGE = 300
+# Live listings may be served this long past expiry while refreshing in the background
+LIVE_EVENTS_STALE_WHILE_REVALIDATE = config.CACHE_LIVE_STALE_WHILE_REVALIDATE
+
+# Streamed listings are indexed in batches of this many events
+STREAM_INDEX_BATCH = 500
+
+# Rebuilds cached event listings as Event models
+_decode_events = partial(decode_value, expected_type=List[Event])
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -40,51 +70,178 @@ HEADERS = {
     )
 }
 
-@retry(
-    retry=retry_if_exception_type(RequestError),
-    wait=wait_fixed(1),
-    stop=stop_after_attempt(API_RETRIES)
-)
+# Shared HTTP client; created lazily so connections are pooled and kept alive
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """Return True if the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_options() -> Dict[str, Any]:
+    """
+    Build the pooled HTTP client settings from the application config,
+    shared by the sync and async clients.
+    
+    Returns:
+        Keyword arguments for httpx.Client / httpx.AsyncClient
+    """
+    http2 = config.HTTP2_ENABLED and _http2_available()
+    if config.HTTP2_ENABLED and not http2:
+        logger.debug("HTTP/2 requested but h2 is not installed; falling back to HTTP/1.1")
+    
+    limits = httpx.Limits(
+        max_connections=config.POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=config.POOL_MAX_KEEPALIVE,
+        keepalive_expiry=config.POOL_KEEPALIVE_EXPIRY,
+    )
+    return {
+        "headers": HEADERS,
+        "timeout": API_TIMEOUT,
+        "limits": limits,
+        "http2": http2,
+    }
+
+
+def _build_client() -> httpx.Client:
+    """
+    Build a pooled HTTP client configured from the application config.
+    
+    Returns:
+        New httpx.Client instance
+    """
+    return httpx.Client(**_client_options())
+
+
+def get_client() -> httpx.Client:
+    """
+    Get the shared HTTP client, creating it on first use.
+    
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = _build_client()
+    return _client
+
+
+def set_client(client: Optional[httpx.Client]) -> None:
+    """
+    Replace the shared HTTP client, e.g. to inject a custom transport.
+    The previous client is closed.
+    
+    Args:
+        client: Client to use for all requests, or None to reset to the default
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def close_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+        logger.debug("Closed shared HTTP client")
+
+
+atexit.register(close_client)
+
+@retry(**retry_policy())
 def _get(path: str) -> Dict[str, Any]:
     """
     Internal helper to perform GET requests against SofaScore API.
-    Retries only on network errors (RequestError), not on HTTPStatusError.
+    Retries network errors and throttled (429 / 503) responses, honoring
+    Retry-After; other HTTP errors and the last failure are raised as is.
+    Raises UpstreamUnavailable without a request while the circuit breaker
+    is open or once the command's deadline has passed.
+    Inside a ``@cached`` call with a stale entry, sends conditional headers
+    and raises NotModified when the upstream answers 304.
     """
     url = f"{API_BASE}{path}"
     logger.debug(f"Making GET request to {url}")
     
-    response = httpx.get(url, timeout=API_TIMEOUT, headers=HEADERS)
-    response.raise_for_status()
+    revalidation = current_revalidation()
+    headers = revalidation.request_headers() if revalidation else None
+    rate_limiter.acquire(path)
+    timeout = request_timeout()
+    with breaker.guard():
+        response = get_client().get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and revalidation is not None:
+            raise NotModified(url)
+        honor_throttling(path, response)
+        response.raise_for_status()
     
+    if revalidation is not None:
+        revalidation.capture(
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            len(response.content),
+        )
     return response.json()
 
 
 def _to_event(item: Dict[str, Any]) -> Event:
     """
     Convert API response to Event model.
-    Properly handles nested Team objects.
+    Nested Team objects are validated through the field aliases.
+    """
+    return parse_event(item)
+
+
+def _events_from_payload(data: Dict[str, Any]) -> List[Event]:
     """
-    # Create Team objects directly from the API response
-    home_team = Team.model_validate(item.get("homeTeam", {}))
-    away_team = Team.model_validate(item.get("awayTeam", {}))
+    Convert an event listing payload into Event models.
     
-    return Event.model_validate({
-        "id": item.get("id"),
-        "slug": item.get("slug"),
-        "tournament": item.get("tournament"),
-        "home_team": home_team,  # Pass the Team object, not just the name
-        "away_team": away_team,  # Pass the Team object, not just the name
-        "start_timestamp": item.get("startTimestamp"),
-    })
+    Args:
+        data: Decoded JSON response of a listing endpoint
+        
+    Returns:
+        List of Event objects
+    """
+    raw = data.get("events") or data.get("eventList") or []
+    return parse_events(raw)
+
+
+def _is_not_found(error: Exception) -> bool:
+    """
+    Return True if a listing request failed with a 404, which means nothing is listed.
+    Any other failure must not be cached as an empty listing.
+    """
+    return isinstance(error, HTTPStatusError) and error.response.status_code == 404
+
+
+def _events_day_path(day: date, sport: str) -> str:
+    """Return the API path listing events of a sport on a given day."""
+    return f"/sport/{sport}/events/date/{day.isoformat()}"
 
 
-from src.utils.cache import cached
+def _live_events_path(sport: str) -> str:
+    """Return the API path listing live events of a sport."""
+    return f"/sport/{sport}/events/live"
 
-@cached(max_age=3600)  # Cache for 1 hour
+
+@cached(max_age=EVENTS_DAY_MAX_AGE, fallback=list)  # Cache for 1 hour
 def list_events_for_day(day: date, sport: str = config.DEFAULT_SPORT) -> List[Event]:
     """
     List all events scheduled for a given day.
-    Returns an empty list if the endpoint returns 404 or on other HTTP errors.
+    Returns an empty list if the endpoint returns 404. Other HTTP and network
+    errors are raised as UpstreamUnavailable, so the last cached listing, or
+    else an uncached empty list, is returned and nothing is cached.
     
     Args:
         day: Date to fetch events for
@@ -93,25 +250,203 @@ def list_events_for_day(day: date, sport: str = config.DEFAULT_SPORT) -> List[Ev
     Returns:
         List of Event objects
     """
-    path = f"/sport/{sport}/events/date/{day.isoformat()}"
+    path = _events_day_path(day, sport)
     try:
         data = _get(path)
-    except HTTPStatusError as e:
-        # 404 or other HTTP errors: no events or bad request
-        logger.warning(f"Could not fetch events for {day} (status {e.response.status_code}); returning empty list.")
+    except (HTTPStatusError, RequestError) as e:
+        if not _is_not_found(e):
+            raise UpstreamUnavailable(f"Could not fetch events for {day}: {e}") from e
+        logger.warning(f"No events listed for {day}; returning empty list.")
         return []
-    except RequestError as e:
-        logger.error(f"Network error when fetching events for {day}: {e}.")
+
+    events = _events_from_payload(data)
+    index_events(events, day, sport)
+    return events
+
+
+@retry(**retry_policy())
+def _open_stream(path: str) -> httpx.Response:
+    """
+    Send a GET request whose body is read as it arrives.
+    Same retry policy, rate limit, circuit breaker and deadline as ``_get``;
+    only opening the response is retried. The caller must close it.
+    """
+    url = f"{API_BASE}{path}"
+    logger.debug(f"Making streamed GET request to {url}")
+    rate_limiter.acquire(path)
+    timeout = request_timeout()
+    client = get_client()
+    with breaker.guard():
+        response = client.send(client.build_request("GET", url, timeout=timeout), stream=True)
+        try:
+            honor_throttling(path, response)
+            response.raise_for_status()
+        except HTTPStatusError:
+            response.close()
+            raise
+    return response
+
+
+def _stale_events(key: str, day: date, error: Exception, use_cache: bool) -> List[Event]:
+    """Return the last cached listing of a day that could not be streamed, or an empty list."""
+    stale = cache.get_stale(key, _decode_events) if use_cache else None
+    if stale is None:
+        logger.error(f"Could not stream events for {day}: {error}.")
         return []
+    logger.warning(f"Serving stale events for {day}: {error}")
+    return stale.value
 
-    raw = data.get("events") or data.get("eventList") or []
-    return [_to_event(item) for item in raw]
+
+def iter_events_for_day(day: date, sport: str = config.DEFAULT_SPORT, use_cache: bool = True) -> Iterator[Event]:
+    """
+    Stream the events scheduled for a given day, parsing the response incrementally.
+    
+    Events are yielded as soon as they arrive, so the raw body and its dict
+    tree are never held whole. The listing shares its cache entry with
+    ``list_events_for_day``; to write it, each event is kept only as its
+    serialized JSON until the stream completes, and a listing larger than
+    ``CACHE_STREAM_MAX_BYTES`` is not cached. Pass ``use_cache=False`` to
+    keep memory flat regardless of the day's size.
+    
+    Like ``list_events_for_day``, a 404 yields nothing, and a failure before
+    the first event yields the last cached listing, if any. A failure after
+    it raises UpstreamUnavailable rather than end with a partial listing.
+    
+    Args:
+        day: Date to fetch events for
+        sport: Sport type (default from config)
+        use_cache: Serve a fresh cached listing and cache the streamed one
+        
+    Yields:
+        Event objects, in listing order
+    """
+    key = make_cache_key("list_events_for_day", day, sport)
+    if use_cache:
+        cached_events = cache.get(key, EVENTS_DAY_MAX_AGE, _decode_events)
+        if cached_events is not None:
+            yield from cached_events
+            return
+    
+    try:
+        response = _open_stream(_events_day_path(day, sport))
+    except (UpstreamUnavailable, HTTPStatusError, RequestError) as e:
+        if _is_not_found(e):
+            logger.warning(f"No events listed for {day}.")
+        else:
+            yield from _stale_events(key, day, e, use_cache)
+        return
+    
+    dumped: Optional[List[str]] = [] if use_cache else None
+    dumped_bytes = 0
+    batch: List[Event] = []
+    streamed = 0
+    try:
+        for item in iter_array_items(response.iter_bytes(), ("events", "eventList")):
+            event = parse_event(item)
+            if dumped is not None:
+                data = json.dumps(event.model_dump())
+                dumped_bytes += len(data)
+                dumped.append(data)
+                if dumped_bytes > config.CACHE_STREAM_MAX_BYTES:
+                    logger.debug(f"Events for {day} exceed {config.CACHE_STREAM_MAX_BYTES} bytes; not caching them")
+                    dumped = None
+            batch.append(event)
+            if len(batch) >= STREAM_INDEX_BATCH:
+                index_events(batch, sport=sport)
+                batch = []
+            streamed += 1
+            yield event
+    except (RequestError, json.JSONDecodeError) as e:
+        if isinstance(e, RequestError):
+            breaker.record_failure()
+        if not streamed:
+            yield from _stale_events(key, day, e, use_cache)
+            return
+        raise UpstreamUnavailable(f"Events for {day} broke off after {streamed} events: {e}") from e
+    finally:
+        response.close()
+    
+    # Only a complete listing marks the day as indexed and is cached
+    index_events(batch, day, sport)
+    if dumped is not None:
+        cache.set_encoded(key, encode_model_list(Event, dumped), EVENTS_DAY_MAX_AGE)
+
+
+def _days_in_range(start: date, end: date) -> List[date]:
+    """Return every day from start to end, both inclusive."""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
 
-@cached(max_age=60)  # Cache for 1 minute since this is live data
+def _dedupe_day_buckets(buckets: Iterable[Tuple[date, List[Event]]]) -> Iterator[Tuple[date, List[Event]]]:
+    """
+    Drop events already seen in an earlier day bucket.
+    Listings around midnight can return the same event for two adjacent days;
+    each event is kept in the first day it appears in.
+    """
+    seen = set()
+    for day, events in buckets:
+        unique = [event for event in events if event.id not in seen]
+        seen.update(event.id for event in unique)
+        yield day, unique
+
+
+def iter_events_for_range(
+    start: date,
+    end: date,
+    sport: str = config.DEFAULT_SPORT,
+) -> Iterator[Tuple[date, List[Event]]]:
+    """
+    Fetch the days of a date range concurrently and yield them in day order.
+    Each day is yielded as soon as it and all earlier days are available.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        sport: Sport type (default from config)
+        
+    Yields:
+        Tuples of (day, list of Event objects) with duplicates removed
+    """
+    days = _days_in_range(start, end)
+    if not days:
+        return
+    
+    workers = max(1, min(config.ASYNC_CONCURRENCY, len(days)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = executor.map(with_current_deadline(lambda day: list_events_for_day(day, sport)), days)
+        yield from _dedupe_day_buckets(zip(days, listings))
+
+
+def list_events_for_range(
+    start: date,
+    end: date,
+    sport: str = config.DEFAULT_SPORT,
+) -> Dict[date, List[Event]]:
+    """
+    List all events scheduled between two days, fetching the days concurrently.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        sport: Sport type (default from config)
+        
+    Returns:
+        Dictionary mapping each day, in order, to its de-duplicated events
+    """
+    return dict(iter_events_for_range(start, end, sport))
+
+
+@cached(
+    max_age=LIVE_EVENTS_MAX_AGE,  # Cache for 1 minute since this is live data
+    stale_while_revalidate=LIVE_EVENTS_STALE_WHILE_REVALIDATE,
+    fallback=list,
+)
 def list_live_events(sport: str = config.DEFAULT_SPORT) -> List[Event]:
     """
     Fetch all currently live events for the given sport.
+    Returns an empty list if the endpoint returns 404. Other HTTP and network
+    errors are raised as UpstreamUnavailable, so the last cached listing, or
+    else an uncached empty list, is returned and nothing is cached.
     
     Args:
         sport: Sport type (default from config)
@@ -119,21 +454,26 @@ def list_live_events(sport: str = config.DEFAULT_SPORT) -> List[Event]:
     Returns:
         List of Event objects
     """
-    path = f"/sport/{sport}/events/live"
+    path = _live_events_path(sport)
     try:
         data = _get(path)
     except (HTTPStatusError, RequestError) as e:
-        logger.warning(f"Could not fetch live events (error: {e}); returning empty list.")
+        if not _is_not_found(e):
+            raise UpstreamUnavailable(f"Could not fetch live events: {e}") from e
+        logger.warning("No live events listed; returning empty list.")
         return []
     
-    raw = data.get("events", [])
-    return [_to_event(item) for item in raw]
+    events = _events_from_payload(data)
+    index_events(events, sport=sport)
+    return events
 
 
-@cached(max_age=600)  # Cache for 10 minutes
+@cached(max_age=EVENT_MAX_AGE)  # Cache for 10 minutes
 def fetch_event(event_id: int) -> Dict[str, Any]:
     """
     Fetch detailed data for a single event.
+    A 404 is raised as is; other HTTP and network errors are raised as
+    UpstreamUnavailable, so the last cached payload is returned instead.
     
     Args:
         event_id: ID of the event to fetch
@@ -141,13 +481,20 @@ def fetch_event(event_id: int) -> Dict[str, Any]:
     Returns:
         Dictionary with event data
     """
-    return _get(f"/event/{event_id}")
+    try:
+        return _get(f"/event/{event_id}")
+    except (HTTPStatusError, RequestError) as e:
+        if _is_not_found(e):
+            raise
+        raise UpstreamUnavailable(f"Could not fetch event {event_id}: {e}") from e
 
 
-@cached(max_age=300)  # Cache for 5 minutes
+@cached(max_age=EVENT_STATS_MAX_AGE)  # Cache for 5 minutes
 def fetch_event_stats(event_id: int) -> Dict[str, Any]:
     """
     Fetch statistical data for a single event.
+    A 404 is raised as is; other HTTP and network errors are raised as
+    UpstreamUnavailable, so the last cached payload is returned instead.
     
     Args:
         event_id: ID of the event to fetch statistics for
@@ -155,7 +502,12 @@ def fetch_event_stats(event_id: int) -> Dict[str, Any]:
     Returns:
         Dictionary with statistics data
     """
-    return _get(f"/event/{event_id}/statistics")
+    try:
+        return _get(f"/event/{event_id}/statistics")
+    except (HTTPStatusError, RequestError) as e:
+        if _is_not_found(e):
+            raise
+        raise UpstreamUnavailable(f"Could not fetch statistics for event {event_id}: {e}") from e
 
 
 if __name__ == "__main__":
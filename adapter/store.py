@@ -0,0 +1,306 @@
+"""
+Local event index.
+
+Every listing the adapter fetches is upserted into a SQLite database indexed
+by team, tournament and start time, so questions such as "all matches of
+team X in March" are answered without network calls.
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Event
+from .parsers import parse_events
+from src.core.config import config
+from src.core.logging import get_logger
+
+# Setup logger
+logger = get_logger("store")
+
+def day_bounds(start: Optional[date], end: Optional[date]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert an inclusive range of local days into [start, end) timestamps.
+
+    Args:
+        start: First day, or None for no lower bound
+        end: Last day, or None for no upper bound
+
+    Returns:
+        Tuple of (start timestamp, end timestamp)
+    """
+    start_ts = int(datetime.combine(start, datetime.min.time()).timestamp()) if start else None
+    end_ts = int(datetime.combine(end + timedelta(days=1), datetime.min.time()).timestamp()) if end else None
+    return start_ts, end_ts
+
+class EventStore:
+    """SQLite-backed event index with incremental upserts."""
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store, creating the database on first use.
+
+        Args:
+            path: Database file (default from config)
+        """
+        self.path = Path(path or config.INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self._create_schema(version)
+            self._conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+    def _create_schema(self, version: int) -> None:
+        with self._lock:
+            if version < 1:
+                self._conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS events (
+                        id INTEGER PRIMARY KEY,
+                        start_timestamp INTEGER NOT NULL,
+                        tournament_id INTEGER,
+                        home_team_id INTEGER NOT NULL,
+                        away_team_id INTEGER NOT NULL,
+                        data TEXT NOT NULL,
+                        updated_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS events_start ON events (start_timestamp);
+                    CREATE INDEX IF NOT EXISTS events_home_team ON events (home_team_id, start_timestamp);
+                    CREATE INDEX IF NOT EXISTS events_away_team ON events (away_team_id, start_timestamp);
+                    CREATE INDEX IF NOT EXISTS events_tournament ON events (tournament_id, start_timestamp);
+                    CREATE TABLE IF NOT EXISTS days (
+                        sport TEXT NOT NULL,
+                        day TEXT NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        PRIMARY KEY (sport, day)
+                    );
+                """)
+            if version < 2:
+                self._conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS statistics (
+                        event_id INTEGER PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        fetched_at REAL NOT NULL
+                    );
+                """)
+
+    def upsert(self, events: Iterable[Event], day: Optional[date] = None, sport: str = config.DEFAULT_SPORT) -> int:
+        """
+        Insert or update events, optionally recording a fully fetched day.
+
+        Args:
+            events: Events to store
+            day: Day whose complete listing ``events`` is
+            sport: Sport of the listing
+
+        Returns:
+            Number of upserted events
+        """
+        now = time.time()
+        rows = [
+            (
+                event.id,
+                event.start_timestamp,
+                event.tournament.get("id"),
+                event.home_team.id,
+                event.away_team.id,
+                json.dumps(event.model_dump()),
+                now,
+            )
+            for event in events
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO events "
+                    "(id, start_timestamp, tournament_id, home_team_id, away_team_id, data, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                if day is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO days (sport, day, fetched_at) VALUES (?, ?, ?)",
+                        (sport, day.isoformat(), now),
+                    )
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def _select(self, where: str, params: list, start: Optional[int], end: Optional[int]) -> List[Event]:
+        if start is not None:
+            where += " AND start_timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            where += " AND start_timestamp < ?"
+            params.append(end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM events WHERE {where} ORDER BY start_timestamp, id", params
+            ).fetchall()
+        # Stored rows were validated when they were fetched
+        return parse_events((json.loads(data) for data, in rows), trusted=True)
+
+    def events_for_team(self, team_id: int, start: Optional[int] = None, end: Optional[int] = None) -> List[Event]:
+        """
+        Get a team's home and away events, in start order.
+
+        Args:
+            team_id: Team id
+            start: Earliest start timestamp (inclusive)
+            end: Latest start timestamp (exclusive)
+
+        Returns:
+            List of Event objects
+        """
+        return self._select("(home_team_id = ? OR away_team_id = ?)", [team_id, team_id], start, end)
+
+    def events_for_tournament(self, tournament_id: int, start: Optional[int] = None, end: Optional[int] = None) -> List[Event]:
+        """
+        Get a tournament's events, in start order.
+
+        Args:
+            tournament_id: Tournament id
+            start: Earliest start timestamp (inclusive)
+            end: Latest start timestamp (exclusive)
+
+        Returns:
+            List of Event objects
+        """
+        return self._select("tournament_id = ?", [tournament_id], start, end)
+
+    def events_between(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Event]:
+        """Get all events starting in [start, end), in start order."""
+        return self._select("1", [], start, end)
+
+    def fetched_days(self, start: date, end: date, sport: str = config.DEFAULT_SPORT, complete: bool = False) -> Set[date]:
+        """
+        Get the days between start and end (inclusive) whose listing was stored.
+
+        Args:
+            start: First day
+            end: Last day (inclusive)
+            sport: Sport type
+            complete: Only count listings fetched at least ``BACKFILL_SETTLE_MARGIN``
+                seconds after the day ended, whose statuses and scores are final
+
+        Returns:
+            Set of days
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, fetched_at FROM days WHERE sport = ? AND day BETWEEN ? AND ?",
+                (sport, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        days = set()
+        for day, fetched_at in rows:
+            day = date.fromisoformat(day)
+            if complete and fetched_at < day_bounds(day, day)[1] + config.BACKFILL_SETTLE_MARGIN:
+                continue
+            days.add(day)
+        return days
+
+    def upsert_statistics(self, event_id: int, data: Dict[str, Any]) -> None:
+        """Insert or update the statistics payload of an event."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO statistics (event_id, data, fetched_at) VALUES (?, ?, ?)",
+                (event_id, json.dumps(data), time.time()),
+            )
+
+    def get_statistics(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """Get the stored statistics payload of an event, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM statistics WHERE event_id = ?", (event_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stored_statistics(self, event_ids: Iterable[int]) -> Set[int]:
+        """
+        Get which of the given events have stored statistics.
+
+        Returns:
+            Set of event ids
+        """
+        event_ids = list(event_ids)
+        stored: Set[int] = set()
+        # Stay below SQLite's host parameter limit
+        for i in range(0, len(event_ids), 500):
+            batch = event_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT event_id FROM statistics WHERE event_id IN ({placeholders})", batch
+                ).fetchall()
+            stored.update(event_id for event_id, in rows)
+        return stored
+
+    def count(self) -> int:
+        """Return the number of stored events."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+# Store shared by the adapter, opened on first use
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> Optional[EventStore]:
+    """
+    Get the shared event store, opening it on first use.
+
+    Returns:
+        The EventStore, or None when the index is disabled
+    """
+    global _store
+    if not config.INDEX_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EventStore()
+    return _store
+
+def set_store(store: Optional[EventStore]) -> None:
+    """
+    Replace the shared event store, e.g. with one in a temporary directory.
+    The previous store is closed.
+
+    Args:
+        store: New store, or None to reopen the default on next use
+    """
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    if previous is not None and previous is not store:
+        previous.close()
+
+def index_events(events: List[Event], day: Optional[date] = None, sport: str = config.DEFAULT_SPORT) -> None:
+    """
+    Upsert fetched events into the shared store; failures are logged, not raised.
+
+    Args:
+        events: Events of a listing
+        day: Day the listing covers, if it is a complete day listing
+        sport: Sport of the listing
+    """
+    try:
+        store = get_store()
+        if store is not None:
+            store.upsert(events, day, sport)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Failed to index {len(events)} events: {e}")
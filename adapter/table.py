@@ -0,0 +1,174 @@
+"""
+Columnar event table for analytics over many events.
+
+Events are stored as NumPy columns (ids, start timestamps, team and
+tournament ids) with names dictionary-encoded into one shared string list,
+so filters, group-by counts and time bucketing run vectorized.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Column value for a tournament without an id
+MISSING_ID = -1
+
+def _id_or_missing(value: Optional[int]) -> int:
+    return MISSING_ID if value is None else value
+
+class EventTable:
+    """Immutable column store of events."""
+
+    COLUMNS = (
+        "ids", "start_timestamps", "home_team_ids", "away_team_ids",
+        "tournament_ids", "tournament_codes", "home_name_codes", "away_name_codes",
+    )
+
+    def __init__(self, names: List[str], **columns: np.ndarray):
+        """
+        Initialize the table from prepared columns; use ``from_events`` instead.
+
+        Args:
+            names: String dictionary the ``*_codes`` columns index into
+            **columns: One array per entry of ``COLUMNS``, all the same length
+        """
+        self.names = names
+        for column in self.COLUMNS:
+            setattr(self, column, columns[column])
+
+    @classmethod
+    def from_events(cls, events: Iterable[Any]) -> "EventTable":
+        """
+        Build a table from ``Event`` models (or ``CompactEvent`` tuples).
+
+        Tournaments are coded in order of first appearance.
+
+        Args:
+            events: Events to store
+
+        Returns:
+            EventTable
+        """
+        # Name -> code; insertion order makes the keys the string dictionary
+        codes: Dict[str, int] = {}
+        encode = codes.setdefault
+
+        values: Tuple[List[int], ...] = tuple([] for _ in cls.COLUMNS)
+        ids, starts, home_ids, away_ids, tournament_ids, tournament_codes, home_codes, away_codes = values
+        for event in events:
+            tournament, home, away = event.tournament, event.home_team, event.away_team
+            ids.append(event.id)
+            starts.append(event.start_timestamp)
+            home_ids.append(home.id)
+            away_ids.append(away.id)
+            tournament_ids.append(_id_or_missing(tournament.get("id")))
+            tournament_codes.append(encode(tournament.get("name", "Unknown"), len(codes)))
+            home_codes.append(encode(home.name, len(codes)))
+            away_codes.append(encode(away.name, len(codes)))
+        columns = {column: np.array(column_values, dtype=np.int64) for column, column_values in zip(cls.COLUMNS, values)}
+        return cls(list(codes), **columns)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, rows: np.ndarray) -> "EventTable":
+        """Return a table of the given rows (indices or boolean mask), sharing the name dictionary."""
+        return EventTable(self.names, **{column: getattr(self, column)[rows] for column in self.COLUMNS})
+
+    def mask(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        team_id: Optional[int] = None,
+        tournament_id: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Build a boolean row mask; all given conditions must hold.
+
+        Args:
+            start: Earliest start timestamp (inclusive)
+            end: Latest start timestamp (exclusive)
+            team_id: Team playing at home or away
+            tournament_id: Tournament id
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.start_timestamps >= start
+        if end is not None:
+            mask &= self.start_timestamps < end
+        if team_id is not None:
+            mask &= (self.home_team_ids == team_id) | (self.away_team_ids == team_id)
+        if tournament_id is not None:
+            mask &= self.tournament_ids == tournament_id
+        return mask
+
+    def filter(self, **conditions: Optional[int]) -> "EventTable":
+        """Return the rows matching ``mask(**conditions)``."""
+        return self.take(self.mask(**conditions))
+
+    def _tournament_keys(self) -> np.ndarray:
+        """
+        Grouping key of every row: the tournament id, or for tournaments
+        without one a negative key per name.
+        """
+        return np.where(self.tournament_ids == MISSING_ID, -1 - self.tournament_codes, self.tournament_ids)
+
+    def count_by_tournament(self) -> List[Tuple[str, int]]:
+        """
+        Count events per tournament.
+
+        Tournaments are told apart by id, so two sharing a name are counted
+        separately; names are only used to label the counts.
+
+        Returns:
+            List of (tournament name, event count), largest first
+        """
+        _, first, counts = np.unique(self._tournament_keys(), return_index=True, return_counts=True)
+        # Equal counts keep first-appearance order
+        order = np.lexsort((first, -counts))
+        names = self.tournament_codes[first]
+        return [(self.names[names[i]], int(counts[i])) for i in order.tolist()]
+
+    def group_by_tournament(self) -> Dict[Tuple[int, str], np.ndarray]:
+        """
+        Group row indices by tournament.
+
+        Returns:
+            Mapping of (tournament id, name) to row indices in table order,
+            with tournaments in order of first appearance; tournaments
+            without an id have ``MISSING_ID`` and are grouped by name
+        """
+        if not len(self):
+            return {}
+        keys = self._tournament_keys()
+        order = np.argsort(keys, kind="stable")
+        _, starts = np.unique(keys[order], return_index=True)
+        groups = sorted(np.split(order, starts[1:]), key=lambda rows: rows[0])
+        return {
+            (int(self.tournament_ids[rows[0]]), self.names[self.tournament_codes[rows[0]]]): rows
+            for rows in groups
+        }
+
+    def bucket_counts(self, width: int = 86400, origin: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count events per fixed-width time bucket.
+
+        Args:
+            width: Bucket width in seconds (default: one day)
+            origin: Timestamp the buckets are aligned to, e.g. a UTC offset
+
+        Returns:
+            Tuple of (bucket start timestamps, event counts) for non-empty buckets
+        """
+        buckets = (self.start_timestamps - origin) // width * width + origin
+        return np.unique(buckets, return_counts=True)
+
+    def team_names(self, rows: np.ndarray) -> List[Tuple[str, str]]:
+        """Return the (home, away) team names of the given rows."""
+        names = self.names
+        return [
+            (names[home], names[away])
+            for home, away in zip(self.home_name_codes[rows].tolist(), self.away_name_codes[rows].tolist())
+        ]
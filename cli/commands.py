@@ -1,25 +1,139 @@
 import click
-from datetime import date
+from datetime import date, timedelta
 from src.services.events import EventService
 from src.services.stats import StatsService
+from src.adapter.resilience import deadline as upstream_deadline
+from src.adapter.sofascore import close_client, iter_events_for_day, iter_events_for_range
+from src.core.config import config
+from src.utils.formatters import format_event_display
+from src.utils.output import EVENT_FIELDS, FORMATS, STAT_FIELDS, RowWriter, event_row, stat_rows
+
+format_option = click.option(
+    "--format", "fmt", type=click.Choice(FORMATS), default="text", show_default=True, help="Output format."
+)
 
 @click.group()
-def cli():
+@click.option(
+    "--deadline", type=float, default=config.COMMAND_DEADLINE, show_default=True,
+    help="Seconds a command may spend on the API before answering from the cache (0 for no limit).",
+)
+@click.pass_context
+def cli(ctx, deadline):
     """SofaScore CLI for accessing sports data."""
-    pass
+    ctx.call_on_close(close_client)
+    ctx.with_resource(upstream_deadline(deadline))
 
 @cli.command()
-def live():
+@format_option
+def live(fmt):
     """Display all currently live events."""
     events = EventService.get_live_events()
-    
+
+    if fmt != "text":
+        with RowWriter(fmt, EVENT_FIELDS, click.get_text_stream("stdout")) as writer:
+            writer.write_all(event_row(event) for event in events)
+        return
+
     if not events:
         click.echo("No live events found.")
         return
-    
+
     click.echo(f"Found {len(events)} live events:")
     for event in events:
         click.echo(f"{event.home_team.name} vs {event.away_team.name}")
 
+def _show_day(target_date, fmt):
+    if fmt != "text":
+        # Rows are written while the listing is still being parsed
+        try:
+            with RowWriter(fmt, EVENT_FIELDS, click.get_text_stream("stdout")) as writer:
+                writer.write_all(event_row(event) for event in iter_events_for_day(target_date))
+        except ConnectionError as e:
+            # The listing broke off; the rows written so far are incomplete
+            click.echo(f"Error fetching events for {target_date}: {e}", err=True)
+            click.get_current_context().exit(1)
+        return
+
+    events = EventService.get_events_for_day(target_date)
+    if not events:
+        click.echo(f"No events found for {target_date.isoformat()}.")
+        return
+
+    click.echo(f"Found {len(events)} events for {target_date.isoformat()}:")
+    for event in events:
+        click.echo(format_event_display(event))
+
+@cli.command()
+@click.argument("date_str")
+@format_option
+def day(date_str, fmt):
+    """Display all events for a day (YYYY-MM-DD)."""
+    try:
+        target_date = date.fromisoformat(date_str)
+    except ValueError:
+        raise click.BadParameter(f"{date_str} is not in YYYY-MM-DD format.", param_hint="DATE_STR")
+    _show_day(target_date, fmt)
+
+@cli.command()
+@format_option
+def today(fmt):
+    """Display all events for today."""
+    _show_day(date.today(), fmt)
+
+@cli.command(name="next")
+@click.option("--days", type=int, default=3, show_default=True, help="Number of days to look ahead.")
+@format_option
+def next_days(days, fmt):
+    """Display events for the next few days."""
+    start = date.today()
+    events_by_day = iter_events_for_range(start, start + timedelta(days=days - 1))
+
+    if fmt != "text":
+        # Each day is written and flushed as soon as it and all earlier days are in
+        with RowWriter(fmt, EVENT_FIELDS, click.get_text_stream("stdout")) as writer:
+            for _, events in events_by_day:
+                writer.write_all(event_row(event) for event in events)
+        return
+
+    for target_date, events in events_by_day:
+        click.echo(f"\n{target_date.strftime('%A, %B %d, %Y')}: {len(events)} events scheduled")
+        for event in events:
+            click.echo(f"  {format_event_display(event)}")
+
+@cli.command()
+@click.argument("event_id", type=int)
+@format_option
+def stats(event_id, fmt):
+    """Display statistics for a specific event."""
+    stats_data = StatsService.get_event_statistics(event_id)
+
+    if fmt != "text":
+        if stats_data is None:
+            # The error was reported on stderr
+            click.get_current_context().exit(1)
+        with RowWriter(fmt, STAT_FIELDS, click.get_text_stream("stdout")) as writer:
+            writer.write_all(stat_rows(event_id, stats_data))
+        return
+
+    if not stats_data or 'statistics' not in stats_data:
+        click.echo("No statistics available for this event.")
+        return
+
+    # Display statistics
+    for group in stats_data['statistics']:
+        group_name = group.get('name', 'General')
+        click.echo(f"\n=== {group_name} ===")
+
+        for stat_group in group.get('groups', []):
+            subgroup_name = stat_group.get('groupName', 'Stats')
+            click.echo(f"\n{subgroup_name}:")
+
+            for stat_item in stat_group.get('statisticsItems', []):
+                stat_name = stat_item.get('name', 'Unknown')
+                home_value = stat_item.get('home', 'N/A')
+                away_value = stat_item.get('away', 'N/A')
+
+                click.echo(f"  {stat_name}: {home_value} - {away_value}")
+
 if __name__ == '__main__':
-    cli()
\ No newline at end of file
+    cli()
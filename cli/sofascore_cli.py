@@ -5,6 +5,7 @@ A command-line interface for interacting with the SofaScore API.
 """
 import sys
 import os
+import json
 import argparse
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -13,16 +14,21 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent
 sys.path.append(str(project_root))
 
-# Import the SofaScore adapter
-from src.adapter.sofascore import (
-    list_events_for_day, 
-    list_live_events, 
-    fetch_event, 
-    fetch_event_stats
-)
+# Adapter and service modules pull in httpx, pydantic and numpy; each command
+# imports what it needs so that argument parsing and --help stay fast
+from src.core.config import config
+from src.utils.output import EVENT_FIELDS, FORMATS, STAT_FIELDS, RowWriter, event_row, stat_rows
 
 def cmd_live(args):
     """Display live events."""
+    from src.adapter.resilience import deadline
+    from src.adapter.sofascore import list_live_events
+    
+    if args.format != "text":
+        with RowWriter(args.format, EVENT_FIELDS) as writer:
+            writer.write_all(event_row(event) for event in list_live_events())
+        return
+    
     print("Fetching live events...")
     events = list_live_events()
     
@@ -49,7 +55,9 @@ def cmd_live(args):
                 event_index = int(selection) - 1
                 if 0 <= event_index < len(events):
                     event_id = events[event_index].id
-                    cmd_stats(argparse.Namespace(id=event_id))
+                    # A new time budget, now that the user has made a choice
+                    with deadline(args.deadline):
+                        cmd_stats(argparse.Namespace(id=event_id, format="text"))
                     break
                 else:
                     print("Invalid selection. Please enter a valid event number.")
@@ -57,12 +65,49 @@ def cmd_live(args):
                 print("Please enter a number.")
 
 
+def cmd_watch(args):
+    """Poll live events and print only what changed."""
+    from src.services.watch import NEW, LiveWatcher, format_change
+    
+    watcher = LiveWatcher()
+    if args.format == "text":
+        print(f"Watching live events every {args.interval:g}s (Ctrl+C to stop)...")
+    
+    try:
+        for poll, changes in enumerate(watcher.watch(args.interval, args.count)):
+            if args.format == "jsonl":
+                at = datetime.now().isoformat(timespec="seconds")
+                for change in changes:
+                    print(json.dumps({"at": at, **change.to_dict()}), flush=True)
+            elif poll == 0:
+                print(f"{sum(change.kind == NEW for change in changes)} live events.")
+            else:
+                for change in changes:
+                    print(format_change(change), flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
 def cmd_day(args):
     """Display events for a specific day."""
+    from src.adapter.sofascore import iter_events_for_day, list_events_for_day
+    from src.adapter.table import EventTable
+    
     try:
         target_date = date.fromisoformat(args.date)
     except ValueError:
-        print(f"Invalid date format: {args.date}. Please use YYYY-MM-DD format.")
+        print(f"Invalid date format: {args.date}. Please use YYYY-MM-DD format.", file=sys.stderr)
+        return
+    
+    if args.format != "text":
+        # Rows are written while the listing is still being parsed
+        try:
+            with RowWriter(args.format, EVENT_FIELDS) as writer:
+                writer.write_all(event_row(event) for event in iter_events_for_day(target_date))
+        except ConnectionError as e:
+            # The listing broke off; the rows written so far are incomplete
+            print(f"Error fetching events for {target_date}: {e}", file=sys.stderr)
+            sys.exit(1)
         return
     
     print(f"Fetching events for {target_date.isoformat()}...")
@@ -75,24 +120,24 @@ def cmd_day(args):
     print(f"Found {len(events)} events for {target_date.isoformat()}:\n")
     
     # Group events by tournament
-    events_by_tournament = {}
-    for event in events:
-        tournament_name = event.tournament.get('name', 'Unknown')
-        if tournament_name not in events_by_tournament:
-            events_by_tournament[tournament_name] = []
-        events_by_tournament[tournament_name].append(event)
+    table = EventTable.from_events(events)
     
     # Display events by tournament
-    for tournament, tournament_events in events_by_tournament.items():
-        print(f"\n== {tournament} ({len(tournament_events)} events) ==")
+    for (_, tournament), rows in table.group_by_tournament().items():
+        print(f"\n== {tournament} ({len(rows)} events) ==")
         
-        for i, event in enumerate(tournament_events, 1):
-            start_time = datetime.fromtimestamp(event.start_timestamp).strftime('%H:%M')
-            print(f"{i}. {start_time} - {event.home_team.name} vs {event.away_team.name} (ID: {event.id})")
+        teams = table.team_names(rows)
+        for i, (event_id, timestamp, (home, away)) in enumerate(
+            zip(table.ids[rows].tolist(), table.start_timestamps[rows].tolist(), teams), 1
+        ):
+            start_time = datetime.fromtimestamp(timestamp).strftime('%H:%M')
+            print(f"{i}. {start_time} - {home} vs {away} (ID: {event_id})")
 
 
 def cmd_event(args):
     """Display details for a specific event."""
+    from src.adapter.sofascore import fetch_event
+    
     print(f"Fetching details for event {args.id}...")
     
     try:
@@ -141,6 +186,19 @@ def cmd_event(args):
 
 def cmd_stats(args):
     """Display statistics for a specific event."""
+    from src.adapter.sofascore import fetch_event, fetch_event_stats
+    
+    if args.format != "text":
+        try:
+            stats_data = fetch_event_stats(args.id)
+        except Exception as e:
+            # Keep the error out of the machine-readable output
+            print(f"Error fetching statistics for event {args.id}: {e}", file=sys.stderr)
+            sys.exit(1)
+        with RowWriter(args.format, STAT_FIELDS) as writer:
+            writer.write_all(stat_rows(args.id, stats_data))
+        return
+    
     print(f"Fetching statistics for event {args.id}...")
     
     try:
@@ -184,14 +242,21 @@ def cmd_stats(args):
 
 def cmd_next(args):
     """Display upcoming events for the next few days."""
-    days = args.days
-    print(f"Fetching events for the next {days} days...")
+    from src.adapter.sofascore import iter_events_for_range
     
+    days = args.days
     today = date.today()
-    for i in range(days):
-        target_date = today + timedelta(days=i)
-        events = list_events_for_day(target_date)
-        
+    events_by_day = iter_events_for_range(today, today + timedelta(days=days - 1))
+    
+    if args.format != "text":
+        # Each day is written and flushed as soon as it and all earlier days are in
+        with RowWriter(args.format, EVENT_FIELDS) as writer:
+            for _, events in events_by_day:
+                writer.write_all(event_row(event) for event in events)
+        return
+    
+    print(f"Fetching events for the next {days} days...")
+    for target_date, events in events_by_day:
         date_str = target_date.strftime("%A, %B %d, %Y")
         if not events:
             print(f"\n{date_str}: No events scheduled.")
@@ -209,42 +274,281 @@ def cmd_next(args):
             print(f"  ... and {len(events) - sample_size} more events")
 
 
+def _format_bytes(size: float) -> str:
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def cmd_cache(args):
+    """Inspect or maintain the local response cache."""
+    from src.utils.cache import cache
+    
+    if not cache.enabled:
+        print("Cache is disabled.")
+        return
+    
+    if args.action == "clear":
+        removed = cache.clear()
+        print(f"Removed {removed} cache entries from {cache.cache_dir}.")
+        return
+    
+    if args.action == "prune":
+        result = cache.prune()
+        print(f"Removed {result['expired']} expired and evicted {result['evicted']} entries "
+              f"({_format_bytes(result['bytes_freed'])} freed).")
+        return
+    
+    report = cache.stats()
+    print(f"Cache: {cache.cache_dir} ({report['backend']} backend)\n")
+    print(f"{'Endpoint':<24} {'Entries':>8} {'Expired':>8} {'Size':>10} {'Hits':>8} {'Misses':>8} {'Hit %':>6} "
+          f"{'304s':>6} {'Stale':>6} {'Saved':>10} {'Ratio':>6}")
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["totals"])]
+    for endpoint, values in rows:
+        ratio = values["hit_ratio"]
+        ratio_str = f"{ratio * 100:.0f}%" if ratio is not None else "-"
+        compression = values["compression_ratio"]
+        compression_str = f"{compression:.1f}x" if compression is not None else "-"
+        print(f"{endpoint:<24} {values['entries']:>8} {values['expired']:>8} "
+              f"{_format_bytes(values['bytes']):>10} {values['hits']:>8.0f} {values['misses']:>8.0f} {ratio_str:>6} "
+              f"{values['revalidated']:>6.0f} {values['served_stale']:>6.0f} {_format_bytes(values['bytes_saved']):>10} "
+              f"{compression_str:>6}")
+    
+    totals = report["totals"]
+    timings = []
+    for label, count, seconds in (("compress", "compressed", "compress_time"), ("decompress", "decompressed", "decompress_time")):
+        if totals[count]:
+            timings.append(f"{label} {totals[seconds] / totals[count] * 1000:.2f} ms avg over {totals[count]:.0f}")
+    level = f"zlib level {cache.compress_level} from {_format_bytes(cache.compress_min_bytes)}" if cache.compress_level else "off"
+    print(f"\nCompression: {level}" + (f" ({'; '.join(timings)})" if timings else ""))
+    
+    budget = []
+    if cache.max_bytes:
+        budget.append(f"max {_format_bytes(cache.max_bytes)}")
+    if cache.max_entries:
+        budget.append(f"max {cache.max_entries} entries")
+    print(f"Budget: {', '.join(budget) or 'unlimited'} (eviction: {cache.eviction})")
+
+
+def _print_indexed_events(events, title, start, end):
+    """Print events answered from the local index, with the index coverage of the range."""
+    from src.services.events import EventService
+    
+    if start and end:
+        indexed = len(EventService.get_indexed_days(start, end))
+        print(f"Index covers {indexed} of {(end - start).days + 1} days in range.")
+    
+    if not events:
+        print(f"No indexed events found for {title}. Fetch the days first, e.g. with 'day' or 'next'.")
+        return
+    
+    print(f"Found {len(events)} indexed events for {title}:\n")
+    for i, event in enumerate(events, 1):
+        start_time = datetime.fromtimestamp(event.start_timestamp).strftime('%Y-%m-%d %H:%M')
+        tournament = event.tournament.get('name', 'Unknown')
+        print(f"{i}. {start_time} - {event.home_team.name} vs {event.away_team.name} [{tournament}] (ID: {event.id})")
+
+
+def _iso_date(value):
+    """Parse a --from/--to day, letting argparse report a bad one as a usage error."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r} (use YYYY-MM-DD)")
+
+
+def _date_range(args):
+    return args.start, args.end
+
+
+def cmd_team(args):
+    """Show a team's events from the local index."""
+    from src.services.events import EventService
+    
+    start, end = _date_range(args)
+    events = EventService.get_team_events(args.id, start, end)
+    _print_indexed_events(events, f"team {args.id}", start, end)
+
+
+def cmd_tournament(args):
+    """Show a tournament's events from the local index."""
+    from src.services.events import EventService
+    
+    start, end = _date_range(args)
+    events = EventService.get_tournament_events(args.id, start, end)
+    _print_indexed_events(events, f"tournament {args.id}", start, end)
+
+
+def cmd_aggregate(args):
+    """Aggregate a team's statistics over its indexed matches."""
+    from src.services.stats import StatsService
+    
+    start, end = _date_range(args)
+    result = StatsService.aggregate(args.id, args.last, start, end, args.period.upper(), args.percentiles)
+    percentile_fields = [f"p{q:g}" for q in args.percentiles]
+    
+    if args.format != "text":
+        fields = ["key", "name", "matches", "mean", "median", *percentile_fields, "opponent_mean"]
+        with RowWriter(args.format, fields) as writer:
+            writer.write_all(
+                {**summary._asdict(), **{f"p{q:g}": value for q, value in summary.percentiles.items()}}
+                for summary in result.stats
+            )
+        return
+    
+    if not result.stats:
+        print(f"No statistics found for team {args.id}. Run 'backfill --with-stats' for the range first.")
+        return
+    
+    print(f"Team {args.id}: {len(result.stats)} stats over {len(result.event_ids)} matches ({args.period.upper()})\n")
+    headers = ["Stat", "Matches", "Mean", "Median", *(field.upper() for field in percentile_fields), "Opp. mean"]
+    width = max(len(summary.name) for summary in result.stats)
+    print(f"{headers[0]:<{width}}" + "".join(f"{header:>10}" for header in headers[1:]))
+    for summary in result.stats:
+        values = [summary.mean, summary.median, *summary.percentiles.values(), summary.opponent_mean]
+        print(f"{summary.name:<{width}}{summary.matches:>10}" + "".join(f"{value:>10.2f}" for value in values))
+
+
+def _format_duration(seconds):
+    """Format a duration in seconds as H:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _print_backfill_progress(progress, final=False):
+    eta = progress.eta
+    line = (f"Days {progress.days_done + progress.days_skipped}/{progress.days_total}"
+            f" ({progress.days_skipped} stored, {progress.days_failed} failed)"
+            f" | Events {progress.events}")
+    if progress.stats_total:
+        line += (f" | Stats {progress.stats_done + progress.stats_skipped}/{progress.stats_total}"
+                 f" ({progress.stats_failed} failed)")
+    line += f" | {progress.days_per_second:.2f} days/s, {progress.events_per_second:.0f} events/s"
+    if final:
+        line += f" | took {_format_duration(progress.elapsed)}"
+    elif eta is not None:
+        line += f" | ETA {_format_duration(eta)}"
+    print(f"\r{line}", end="\n" if final else "", flush=True)
+
+
+def cmd_backfill(args):
+    """Load day listings (and statistics) for a date range into the cache and event index."""
+    from src.services.backfill import BackfillService
+    
+    start, end = _date_range(args)
+    if end < start:
+        print("--to must not be before --from.")
+        return
+    
+    print(f"Backfilling {start.isoformat()} to {end.isoformat()}"
+          f"{' with statistics' if args.with_stats else ''}...")
+    last_print = 0.0
+    
+    def on_progress(progress):
+        nonlocal last_print
+        if progress.elapsed - last_print >= 1:
+            last_print = progress.elapsed
+            _print_backfill_progress(progress)
+    
+    try:
+        progress = BackfillService.run(
+            start, end, with_stats=args.with_stats, workers=args.workers, rate=args.rate, on_progress=on_progress
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume.")
+        return
+    _print_backfill_progress(progress, final=True)
+    if progress.days_failed or progress.stats_failed:
+        print("Some items failed; run the same command again to retry them.")
+
+
 def main():
-    parser = argparse.ArgumentParser(description="SofaScore CLI")
+    parser = argparse.ArgumentParser(prog="sofascore", description="SofaScore CLI")
+    parser.add_argument("--deadline", type=float, default=config.COMMAND_DEADLINE,
+                        help="Seconds the live, day, event, stats and next commands may spend on the API "
+                             "before answering from the cache (0 for no limit)")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # Live events command
     live_parser = subparsers.add_parser("live", help="Show live events")
     live_parser.add_argument("--stats", action="store_true", help="Prompt to view statistics for a selected event")
-    live_parser.set_defaults(func=cmd_live)
+    live_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    live_parser.set_defaults(interactive=True, func=cmd_live)
+    
+    # Live watch command
+    watch_parser = subparsers.add_parser("watch", help="Follow live events and print changes")
+    watch_parser.add_argument("--interval", type=float, default=15, help="Seconds between polls")
+    watch_parser.add_argument("--format", choices=["text", "jsonl"], default="text", help="Output format")
+    watch_parser.add_argument("--count", type=int, help="Stop after this many polls")
+    watch_parser.set_defaults(func=cmd_watch)
     
     # Events for a day command
     day_parser = subparsers.add_parser("day", help="Show events for a specific day")
     day_parser.add_argument("date", help="Date in ISO format (YYYY-MM-DD)")
-    day_parser.set_defaults(func=cmd_day)
+    day_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    day_parser.set_defaults(interactive=True, func=cmd_day)
     
     # Today's events shortcut
     today_parser = subparsers.add_parser("today", help="Show events for today")
-    today_parser.set_defaults(func=lambda args: cmd_day(argparse.Namespace(date=date.today().isoformat())))
+    today_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    today_parser.set_defaults(interactive=True, func=lambda args: cmd_day(argparse.Namespace(date=date.today().isoformat(), format=args.format)))
     
     # Tomorrow's events shortcut
     tomorrow_parser = subparsers.add_parser("tomorrow", help="Show events for tomorrow")
-    tomorrow_parser.set_defaults(func=lambda args: cmd_day(argparse.Namespace(date=(date.today() + timedelta(days=1)).isoformat())))
+    tomorrow_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    tomorrow_parser.set_defaults(interactive=True, func=lambda args: cmd_day(argparse.Namespace(date=(date.today() + timedelta(days=1)).isoformat(), format=args.format)))
     
     # Event details command
     event_parser = subparsers.add_parser("event", help="Show details for a specific event")
     event_parser.add_argument("id", type=int, help="Event ID")
-    event_parser.set_defaults(func=cmd_event)
+    event_parser.set_defaults(interactive=True, func=cmd_event)
     
     # Event statistics command
     stats_parser = subparsers.add_parser("stats", help="Show statistics for a specific event")
     stats_parser.add_argument("id", type=int, help="Event ID")
-    stats_parser.set_defaults(func=cmd_stats)
+    stats_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    stats_parser.set_defaults(interactive=True, func=cmd_stats)
     
     # Next days events command
     next_parser = subparsers.add_parser("next", help="Show events for the next few days")
     next_parser.add_argument("--days", type=int, default=3, help="Number of days to look ahead")
-    next_parser.set_defaults(func=cmd_next)
+    next_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    next_parser.set_defaults(interactive=True, func=cmd_next)
+    
+    # Indexed queries, answered without network calls
+    for name, func, label in (("team", cmd_team, "Team"), ("tournament", cmd_tournament, "Tournament")):
+        index_parser = subparsers.add_parser(name, help=f"Show indexed events for a {name}")
+        index_parser.add_argument("id", type=int, help=f"{label} ID")
+        index_parser.add_argument("--from", dest="start", type=_iso_date, help="First day in ISO format (YYYY-MM-DD)")
+        index_parser.add_argument("--to", dest="end", type=_iso_date, help="Last day in ISO format (YYYY-MM-DD)")
+        index_parser.set_defaults(func=func)
+    
+    # Team statistics aggregation command
+    aggregate_parser = subparsers.add_parser("aggregate", help="Aggregate a team's statistics over indexed matches")
+    aggregate_parser.add_argument("id", type=int, help="Team ID")
+    aggregate_parser.add_argument("--last", type=int, help="Only use the team's last N played matches")
+    aggregate_parser.add_argument("--from", dest="start", type=_iso_date, help="First day in ISO format (YYYY-MM-DD)")
+    aggregate_parser.add_argument("--to", dest="end", type=_iso_date, help="Last day in ISO format (YYYY-MM-DD)")
+    aggregate_parser.add_argument("--period", default="ALL", help="Statistics period, e.g. ALL, 1ST or 2ND")
+    aggregate_parser.add_argument("--percentiles", type=float, nargs="+", default=[25, 75], help="Percentiles to show")
+    aggregate_parser.add_argument("--format", choices=FORMATS, default="text", help="Output format")
+    aggregate_parser.set_defaults(func=cmd_aggregate)
+    
+    # Historical backfill command
+    backfill_parser = subparsers.add_parser("backfill", help="Load a date range into the cache and event index")
+    backfill_parser.add_argument("--from", dest="start", required=True, type=_iso_date, help="First day in ISO format (YYYY-MM-DD)")
+    backfill_parser.add_argument("--to", dest="end", required=True, type=_iso_date, help="Last day in ISO format (YYYY-MM-DD)")
+    backfill_parser.add_argument("--with-stats", action="store_true", help="Also fetch statistics of played events")
+    backfill_parser.add_argument("--workers", type=int, help="Number of concurrent requests")
+    backfill_parser.add_argument("--rate", type=float, help="Maximum requests per second, 0 for unlimited")
+    backfill_parser.set_defaults(func=cmd_backfill)
+    
+    # Cache maintenance command
+    cache_parser = subparsers.add_parser("cache", help="Show cache statistics or prune/clear the cache")
+    cache_parser.add_argument("action", choices=["stats", "prune", "clear"], help="Cache action to run")
+    cache_parser.set_defaults(func=cmd_cache)
     
     args = parser.parse_args()
     
@@ -252,7 +556,19 @@ def main():
         parser.print_help()
         return 1
     
-    args.func(args)
+    try:
+        if getattr(args, "interactive", False):
+            # Interactive commands answer in bounded time, from the cache if need be
+            from src.adapter.resilience import deadline
+            with deadline(args.deadline):
+                args.func(args)
+        else:
+            args.func(args)
+    finally:
+        # Only commands that made requests loaded the adapter
+        sofascore = sys.modules.get("src.adapter.sofascore")
+        if sofascore is not None:
+            sofascore.close_client()
     return 0
 
 
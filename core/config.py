@@ -5,11 +5,12 @@ Handles loading environment variables and providing configuration values.
 import os
 from pathlib import Path
 from typing import Dict, Any
-from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
 env_path = Path(__file__).parents[2] / '.env'
 if env_path.exists():
+    # Imported here to keep startup fast when there is no .env file
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path=env_path)
 
 class Config:
@@ -20,6 +21,29 @@ class Config:
     API_TIMEOUT: int = int(os.getenv("SOFASCORE_API_TIMEOUT", "10"))
     API_RETRIES: int = int(os.getenv("SOFASCORE_API_RETRIES", "3"))
     
+    # HTTP Client Configuration
+    HTTP2_ENABLED: bool = os.getenv("SOFASCORE_HTTP2", "True").lower() in ('true', '1', 'yes')
+    POOL_MAX_CONNECTIONS: int = int(os.getenv("SOFASCORE_POOL_MAX_CONNECTIONS", "20"))
+    POOL_MAX_KEEPALIVE: int = int(os.getenv("SOFASCORE_POOL_MAX_KEEPALIVE", "10"))
+    POOL_KEEPALIVE_EXPIRY: float = float(os.getenv("SOFASCORE_POOL_KEEPALIVE_EXPIRY", "30"))
+    ASYNC_CONCURRENCY: int = int(os.getenv("SOFASCORE_ASYNC_CONCURRENCY", "10"))
+    # Requests per second across the host, 0 for unlimited
+    RATE_LIMIT: float = float(os.getenv("SOFASCORE_RATE_LIMIT", "0"))
+    RATE_BURST: int = int(os.getenv("SOFASCORE_RATE_BURST", "5"))
+    # Per endpoint class (listing, live, event, stats, other), e.g. "stats=2,listing=5"
+    RATE_LIMITS: str = os.getenv("SOFASCORE_RATE_LIMITS", "")
+    # Bucket state shared by the processes of the host; empty to limit per process
+    RATE_LIMIT_DIR: str = os.getenv("SOFASCORE_RATE_LIMIT_DIR", str(Path.home() / ".sofascore" / "ratelimit"))
+    # Retries of network errors and 429/503: jittered exponential backoff, in seconds
+    RETRY_BACKOFF: float = float(os.getenv("SOFASCORE_RETRY_BACKOFF", "1"))
+    RETRY_MAX_WAIT: float = float(os.getenv("SOFASCORE_RETRY_MAX_WAIT", "60"))
+    # Consecutive upstream failures that open the circuit breaker (0 disables it),
+    # and seconds before it lets a probe request through
+    BREAKER_THRESHOLD: int = int(os.getenv("SOFASCORE_BREAKER_THRESHOLD", "5"))
+    BREAKER_RESET: float = float(os.getenv("SOFASCORE_BREAKER_RESET", "30"))
+    # Seconds an interactive command may spend on the upstream before serving stale data, 0 for no limit
+    COMMAND_DEADLINE: float = float(os.getenv("SOFASCORE_COMMAND_DEADLINE", "8"))
+    
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("SOFASCORE_LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("SOFASCORE_LOG_FILE", "")
@@ -28,6 +52,30 @@ class Config:
     DEFAULT_SPORT: str = os.getenv("SOFASCORE_DEFAULT_SPORT", "football")
     CACHE_ENABLED: bool = os.getenv("SOFASCORE_CACHE_ENABLED", "True").lower() in ('true', '1', 'yes')
     CACHE_DIR: str = os.getenv("SOFASCORE_CACHE_DIR", str(Path.home() / ".sofascore" / "cache"))
+    CACHE_BACKEND: str = os.getenv("SOFASCORE_CACHE_BACKEND", "file")
+    CACHE_MAX_BYTES: int = int(os.getenv("SOFASCORE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("SOFASCORE_CACHE_MAX_ENTRIES", "0"))
+    CACHE_EVICTION: str = os.getenv("SOFASCORE_CACHE_EVICTION", "lru")
+    CACHE_EXPIRED_GRACE: int = int(os.getenv("SOFASCORE_CACHE_EXPIRED_GRACE", str(24 * 3600)))
+    CACHE_SWEEP_INTERVAL: int = int(os.getenv("SOFASCORE_CACHE_SWEEP_INTERVAL", "600"))
+    CACHE_LIVE_STALE_WHILE_REVALIDATE: int = int(os.getenv("SOFASCORE_CACHE_LIVE_SWR", "60"))
+    CACHE_MEMORY_ENTRIES: int = int(os.getenv("SOFASCORE_CACHE_MEMORY_ENTRIES", "512"))
+    CACHE_MEMORY_BYTES: int = int(os.getenv("SOFASCORE_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+    # zlib level for entries of at least CACHE_COMPRESS_MIN_BYTES; 0 disables compression
+    CACHE_COMPRESS_LEVEL: int = int(os.getenv("SOFASCORE_CACHE_COMPRESS_LEVEL", "6"))
+    CACHE_COMPRESS_MIN_BYTES: int = int(os.getenv("SOFASCORE_CACHE_COMPRESS_MIN_BYTES", "16384"))
+    # Streamed listings larger than this are not cached, keeping streaming memory bounded
+    CACHE_STREAM_MAX_BYTES: int = int(os.getenv("SOFASCORE_CACHE_STREAM_MAX_BYTES", str(16 * 1024 * 1024)))
+    
+    # Historical backfill
+    BACKFILL_WORKERS: int = int(os.getenv("SOFASCORE_BACKFILL_WORKERS", "4"))
+    BACKFILL_RATE: float = float(os.getenv("SOFASCORE_BACKFILL_RATE", "5"))
+    # A day's stored listing is final once fetched this many seconds after the day ended
+    BACKFILL_SETTLE_MARGIN: int = int(os.getenv("SOFASCORE_BACKFILL_SETTLE_MARGIN", str(6 * 3600)))
+    
+    # Local event index
+    INDEX_ENABLED: bool = os.getenv("SOFASCORE_INDEX_ENABLED", "True").lower() in ('true', '1', 'yes')
+    INDEX_PATH: str = os.getenv("SOFASCORE_INDEX_PATH", str(Path.home() / ".sofascore" / "events.sqlite3"))
     
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
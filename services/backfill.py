@@ -0,0 +1,179 @@
+"""
+Resumable historical backfill of day listings and event statistics.
+
+The local event store doubles as the checkpoint: a day counts as done once
+its full listing is stored, and an event once its statistics are, so an
+interrupted run resumes where it stopped.
+"""
+import time
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from httpx import HTTPError
+from tenacity import RetryError
+
+from src.adapter.models import Event
+from src.adapter.ratelimit import rate_limiter
+from src.adapter.sofascore import _days_in_range, fetch_event_stats, list_events_for_day
+from src.adapter.store import EventStore, day_bounds, get_store
+from src.core.config import config
+from src.core.logging import get_logger
+
+# Setup logger
+logger = get_logger("backfill")
+
+class BackfillProgress:
+    """Counters and throughput of a backfill run."""
+
+    def __init__(self, days_total: int):
+        self.days_total = days_total
+        self.days_done = 0
+        self.days_skipped = 0
+        self.days_failed = 0
+        self.events = 0
+        self.stats_total = 0
+        self.stats_done = 0
+        self.stats_skipped = 0
+        self.stats_failed = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def days_per_second(self) -> float:
+        return self.days_done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds left, or None before anything was fetched."""
+        days_processed = self.days_done + self.days_failed
+        stats_processed = self.stats_done + self.stats_failed
+        processed = days_processed + stats_processed
+        if not processed:
+            return None
+        days_left = self.days_total - self.days_skipped - days_processed
+        # Days not fetched yet will add statistics requests at the rate seen so far
+        stats_per_day = (self.stats_total - self.stats_skipped) / days_processed if days_processed else 0.0
+        stats_left = self.stats_total - self.stats_skipped - stats_processed + days_left * stats_per_day
+        return (days_left + stats_left) * self.elapsed / processed
+
+class BackfillService:
+    """Service loading historical data into the local cache and event store."""
+
+    @staticmethod
+    def _fetch_day(store: EventStore, day: date, sport: str) -> List[Event]:
+        if day in store.fetched_days(day, day, sport, complete=True):
+            return list_events_for_day(day, sport)
+        # Bypass the cache, which may hold a listing from before the day was
+        # complete; a failed fetch raises instead of returning an old listing
+        events = list_events_for_day.refresh(day, sport)
+        if day not in store.fetched_days(day, day, sport, complete=True):
+            # Revalidated from the cache, so the adapter did not index it
+            store.upsert(events, day, sport)
+        return events
+
+    @staticmethod
+    def _fetch_stats(store: EventStore, event_id: int) -> None:
+        store.upsert_statistics(event_id, fetch_event_stats(event_id))
+
+    @staticmethod
+    def run(
+        start: date,
+        end: date,
+        with_stats: bool = False,
+        workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        sport: str = config.DEFAULT_SPORT,
+        on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+    ) -> BackfillProgress:
+        """
+        Fetch every day listing (and optionally event statistics) between two days.
+
+        Days whose stored listing was fetched after the day had ended (see
+        ``EventStore.fetched_days``) and events with stored statistics are
+        skipped; every other day is refetched.
+
+        Args:
+            start: First day
+            end: Last day (inclusive)
+            with_stats: Also fetch statistics of finished events
+            workers: Number of concurrent requests (default from config)
+            rate: Requests per second for the run, 0 for unlimited (default from config)
+            sport: Sport type (default from config)
+            on_progress: Called with the progress after every finished item
+
+        Returns:
+            Final progress counters
+        """
+        store = get_store()
+        if store is None:
+            raise ValueError("Backfill needs the local event index; set SOFASCORE_INDEX_ENABLED")
+
+        days = _days_in_range(start, end)
+        done = store.fetched_days(start, end, sport, complete=True)
+        progress = BackfillProgress(len(days))
+        progress.days_skipped = len(done)
+
+        def report() -> None:
+            if on_progress is not None:
+                on_progress(progress)
+
+        previous_rate = rate_limiter.rate
+        rate_limiter.configure(config.BACKFILL_RATE if rate is None else rate)
+        executor = ThreadPoolExecutor(max_workers=workers or config.BACKFILL_WORKERS)
+        pending: Dict[Future, tuple] = {}
+
+        def submit_stats(events: List[Event]) -> None:
+            # Statistics of matches not finished yet are partial and would never be refetched
+            ended = [event.id for event in events if event.status is not None and event.status.type == "finished"]
+            stored = store.stored_statistics(ended)
+            progress.stats_total += len(ended)
+            progress.stats_skipped += len(stored)
+            for event_id in ended:
+                if event_id not in stored:
+                    pending[executor.submit(BackfillService._fetch_stats, store, event_id)] = ("stats", event_id)
+
+        try:
+            for day in days:
+                if day not in done:
+                    pending[executor.submit(BackfillService._fetch_day, store, day, sport)] = ("day", day)
+            if with_stats and done:
+                for day in sorted(done):
+                    submit_stats(store.events_between(*day_bounds(day, day)))
+            report()
+
+            while pending:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    kind, item = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except (HTTPError, RetryError, OSError, sqlite3.Error) as e:
+                        logger.warning(f"Backfill of {kind} {item} failed: {e}")
+                        if kind == "day":
+                            progress.days_failed += 1
+                        else:
+                            progress.stats_failed += 1
+                        continue
+                    if kind == "day":
+                        progress.days_done += 1
+                        progress.events += len(result)
+                        if with_stats:
+                            submit_stats(result)
+                    else:
+                        progress.stats_done += 1
+                report()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            rate_limiter.configure(previous_rate)
+        return progress
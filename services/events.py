@@ -1,7 +1,10 @@
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 from src.adapter.models import Event
-from src.adapter.sofascore import list_events_for_day, list_live_events, fetch_event
+from src.adapter.compact import CompactEvent, InternPool
+from src.adapter.sofascore import list_events_for_day, list_events_for_range, list_live_events, fetch_event
+from src.adapter.async_client import fetch_events_bulk
+from src.adapter.store import day_bounds, get_store
 
 class EventService:
     """Service for working with sports events."""
@@ -14,4 +17,43 @@ class EventService:
     @staticmethod
     def get_events_for_day(day: date) -> List[Event]:
         """Get all events for a specific day."""
-        return list_events_for_day(day)
\ No newline at end of file
+        return list_events_for_day(day)
+    
+    @staticmethod
+    def get_events_for_range(
+        start: date, end: date, compact: bool = False
+    ) -> Dict[date, Union[List[Event], List[CompactEvent]]]:
+        """
+        Get all events between two days (inclusive), grouped by day.
+        
+        With ``compact``, events are returned as CompactEvent tuples sharing
+        one team and tournament object per id, for loading long ranges.
+        """
+        buckets = list_events_for_range(start, end)
+        if not compact:
+            return buckets
+        pool = InternPool()
+        return {day: pool.compact_events(events) for day, events in buckets.items()}
+    
+    @staticmethod
+    def get_event_details(event_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get details for many events, fetched concurrently."""
+        return fetch_events_bulk(event_ids)
+    
+    @staticmethod
+    def get_team_events(team_id: int, start: Optional[date] = None, end: Optional[date] = None) -> List[Event]:
+        """Get a team's indexed events between two days (inclusive), without network calls."""
+        store = get_store()
+        return store.events_for_team(team_id, *day_bounds(start, end)) if store else []
+    
+    @staticmethod
+    def get_tournament_events(tournament_id: int, start: Optional[date] = None, end: Optional[date] = None) -> List[Event]:
+        """Get a tournament's indexed events between two days (inclusive), without network calls."""
+        store = get_store()
+        return store.events_for_tournament(tournament_id, *day_bounds(start, end)) if store else []
+    
+    @staticmethod
+    def get_indexed_days(start: date, end: date) -> Set[date]:
+        """Get the days between start and end (inclusive) whose full listing is indexed."""
+        store = get_store()
+        return store.fetched_days(start, end) if store else set()
@@ -1,5 +1,239 @@
-from typing import Dict, Any, Optional
+import re
+import sys
+import sqlite3
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from pydantic import ValidationError
+
+from src.adapter.models import Event
+from src.adapter.schemas import EventStatisticsSchema
 from src.adapter.sofascore import fetch_event_stats
+from src.adapter.async_client import fetch_events_stats_bulk
+from src.adapter.store import day_bounds, get_store
+from src.core.logging import get_logger
+
+# Setup logger
+logger = get_logger("stats")
+
+# Period of the whole-match statistics set
+ALL_PERIODS = "ALL"
+
+# Leading number of display values such as "54%", "7 (3)" or "412/500 (82%)"
+_LEADING_NUMBER = re.compile(r"\s*(-?\d+(?:\.\d+)?)")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+# Status type of events whose statistics are final
+_FINISHED = "finished"
+
+# Normalized records of finished events, memoized across aggregate queries
+NORMALIZED_MEMO_SIZE = 4096
+_normalized_memo: "OrderedDict[int, List[StatRecord]]" = OrderedDict()
+_normalized_lock = threading.Lock()
+
+class StatRecord(NamedTuple):
+    """One statistic of one period, with numeric home and away values."""
+    period: str
+    key: str
+    name: str
+    group: str
+    # NaN where the value is missing or not numeric
+    home: float
+    away: float
+
+class StatsMatrix(NamedTuple):
+    """Dense statistics of many events: one row per event, one column per stat key."""
+    event_ids: np.ndarray
+    keys: List[str]
+    home: np.ndarray
+    away: np.ndarray
+
+    def column(self, key: str, side: str = "home") -> np.ndarray:
+        """Get one stat's values for every event (NaN where an event lacks it)."""
+        return getattr(self, side)[:, self.keys.index(key)]
+
+class StatSummary(NamedTuple):
+    """Distribution of one stat of a team over several matches."""
+    key: str
+    name: str
+    # Matches with a numeric value for the stat
+    matches: int
+    mean: float
+    median: float
+    # Percentile -> value
+    percentiles: Dict[float, float]
+    # Mean of the opponents' values in the same matches
+    opponent_mean: float
+
+class TeamAggregate(NamedTuple):
+    """Statistics of a team aggregated over the matches in ``event_ids``."""
+    team_id: int
+    event_ids: List[int]
+    stats: List[StatSummary]
+
+def stat_key(name: str) -> str:
+    """
+    Derive a stat key from a display name, in the upstream camelCase style.
+
+    Args:
+        name: Display name, e.g. "Ball possession"
+
+    Returns:
+        Key, e.g. "ballPossession"
+    """
+    words = _WORD.findall(name)
+    if not words:
+        return name
+    return words[0].lower() + "".join(word[:1].upper() + word[1:].lower() for word in words[1:])
+
+def parse_stat_value(value: Any) -> float:
+    """
+    Convert a statistic value to a float.
+
+    Strings yield their leading number: "54%" -> 54.0, "7 (3)" -> 7.0.
+
+    Args:
+        value: Raw value from the payload
+
+    Returns:
+        The number, or NaN if there is none
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        match = _LEADING_NUMBER.match(value)
+        if match:
+            return float(match.group(1))
+    return float("nan")
+
+def normalize_statistics(payload: Optional[Dict[str, Any]]) -> List[StatRecord]:
+    """
+    Flatten a ``fetch_event_stats`` payload into typed records.
+
+    Keys come from the payload where present and are derived from the display
+    name otherwise, so the same stat gets the same key in old and new payloads.
+    Numeric ``homeValue`` / ``awayValue`` fields are preferred over parsing
+    the display strings.
+
+    Args:
+        payload: Raw statistics payload (None or empty for no statistics)
+
+    Returns:
+        List of StatRecord, in payload order
+    """
+    if not payload:
+        return []
+    try:
+        schema = EventStatisticsSchema.model_validate(payload)
+    except ValidationError as e:
+        logger.warning(f"Unexpected statistics payload: {e}")
+        return []
+
+    records = []
+    for statistics in schema.statistics:
+        period = (statistics.period or statistics.name or ALL_PERIODS).upper()
+        for group in statistics.groups:
+            for item in group.statisticsItems:
+                records.append(StatRecord(
+                    period,
+                    item.key or stat_key(item.name),
+                    item.name,
+                    group.groupName,
+                    item.homeValue if item.homeValue is not None else parse_stat_value(item.home),
+                    item.awayValue if item.awayValue is not None else parse_stat_value(item.away),
+                ))
+    return records
+
+def stats_matrix(
+    event_ids: Sequence[int],
+    records: Sequence[Sequence[StatRecord]],
+    period: str = ALL_PERIODS,
+    keys: Optional[Sequence[str]] = None,
+) -> StatsMatrix:
+    """
+    Build a dense matrix from the normalized statistics of many events.
+
+    All values are scattered into the matrix with a single fancy-indexed
+    assignment per side.
+
+    Args:
+        event_ids: Event ids, one per matrix row
+        records: Normalized records of each event, aligned with ``event_ids``
+        period: Period to take the values from
+        keys: Columns to include (default: every key found, in order of first appearance)
+
+    Returns:
+        StatsMatrix; stats an event lacks are NaN
+    """
+    columns: Dict[str, int] = {key: i for i, key in enumerate(keys)} if keys is not None else {}
+    fixed = keys is not None
+    rows, cols, home, away = [], [], [], []
+    for row, event_records in enumerate(records):
+        for record in event_records:
+            if record.period != period:
+                continue
+            col = columns.get(record.key) if fixed else columns.setdefault(record.key, len(columns))
+            if col is None:
+                continue
+            rows.append(row)
+            cols.append(col)
+            home.append(record.home)
+            away.append(record.away)
+
+    shape = (len(event_ids), len(columns))
+    home_matrix = np.full(shape, np.nan)
+    away_matrix = np.full(shape, np.nan)
+    index = (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp))
+    home_matrix[index] = home
+    away_matrix[index] = away
+    return StatsMatrix(np.array(event_ids, dtype=np.int64), list(columns), home_matrix, away_matrix)
+
+def _normalized_statistics(events: Sequence[Event]) -> Dict[int, List[StatRecord]]:
+    """
+    Get normalized records of finished events, cache-first.
+
+    Records are served from the in-process memo, then from statistics stored
+    in the event index, then fetched concurrently through the shared cache.
+    Fetched payloads are stored in the index for later runs. Events that are
+    not finished are left out, so partial statistics are never stored or memoized.
+
+    Returns:
+        Records per event id; events without statistics are left out
+    """
+    event_ids = [event.id for event in events if event.status is not None and event.status.type == _FINISHED]
+    with _normalized_lock:
+        result = {event_id: _normalized_memo[event_id] for event_id in event_ids if event_id in _normalized_memo}
+    payloads: Dict[int, Dict[str, Any]] = {}
+    store = get_store()
+    missing = [event_id for event_id in event_ids if event_id not in result]
+    if store is not None and missing:
+        for event_id in missing:
+            payload = store.get_statistics(event_id)
+            if payload is not None:
+                payloads[event_id] = payload
+        missing = [event_id for event_id in missing if event_id not in payloads]
+    if missing:
+        fetched = {event_id: payload for event_id, payload in fetch_events_stats_bulk(missing).items() if payload}
+        if store is not None:
+            try:
+                for event_id, payload in fetched.items():
+                    store.upsert_statistics(event_id, payload)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Failed to store statistics: {e}")
+        payloads.update(fetched)
+
+    with _normalized_lock:
+        for event_id, payload in payloads.items():
+            result[event_id] = _normalized_memo[event_id] = normalize_statistics(payload)
+        for event_id in result:
+            _normalized_memo.move_to_end(event_id)
+        while len(_normalized_memo) > NORMALIZED_MEMO_SIZE:
+            _normalized_memo.popitem(last=False)
+    return result
 
 class StatsService:
     """Service for working with sports statistics."""
@@ -10,5 +244,98 @@ class StatsService:
         try:
             return fetch_event_stats(event_id)
         except Exception as e:
-            print(f"Error fetching statistics for event {event_id}: {e}")
-            return None
\ No newline at end of file
+            print(f"Error fetching statistics for event {event_id}: {e}", file=sys.stderr)
+            return None
+    
+    @staticmethod
+    def get_events_statistics(event_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get statistics for many events, fetched concurrently."""
+        return fetch_events_stats_bulk(event_ids)
+    
+    @staticmethod
+    def get_normalized_statistics(event_id: int) -> List[StatRecord]:
+        """Get the statistics of an event as typed records."""
+        return normalize_statistics(StatsService.get_event_statistics(event_id))
+    
+    @staticmethod
+    def get_statistics_matrix(
+        event_ids: Iterable[int], period: str = ALL_PERIODS, keys: Optional[Sequence[str]] = None
+    ) -> StatsMatrix:
+        """Get the statistics of many events, fetched concurrently, as a dense matrix."""
+        event_ids = list(event_ids)
+        payloads = fetch_events_stats_bulk(event_ids)
+        return stats_matrix(event_ids, [normalize_statistics(payloads.get(event_id)) for event_id in event_ids], period, keys)
+    
+    @staticmethod
+    def aggregate(
+        team_id: int,
+        last_n: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = ALL_PERIODS,
+        percentiles: Sequence[float] = (25, 75),
+    ) -> TeamAggregate:
+        """
+        Aggregate a team's statistics over its finished matches.
+        
+        Matches are taken from the local event index, so the range must have
+        been fetched or backfilled. Each stat is reduced over all matches at
+        once, taking the team's side of every match.
+        
+        Args:
+            team_id: Team id
+            last_n: Only use the team's last N finished matches with statistics in the range
+            start: First day (default: no lower bound)
+            end: Last day, inclusive (default: no upper bound)
+            period: Period of the statistics, e.g. "ALL" or "1ST"
+            percentiles: Percentiles to compute, between 0 and 100
+            
+        Returns:
+            TeamAggregate with one StatSummary per stat found, in payload order
+        """
+        store = get_store()
+        events = store.events_for_team(team_id, *day_bounds(start, end)) if store else []
+        events = [event for event in events if event.status is not None and event.status.type == _FINISHED]
+        if last_n is None:
+            records = _normalized_statistics(events)
+            events = [event for event in events if event.id in records]
+        else:
+            # Reach further back for matches without statistics
+            records, selected = {}, []
+            while events and len(selected) < last_n:
+                batch = events[-(last_n - len(selected)):]
+                events = events[:-len(batch)]
+                records.update(_normalized_statistics(batch))
+                selected = [event for event in batch if event.id in records] + selected
+            events = selected
+        matrix = stats_matrix([event.id for event in events], [records[event.id] for event in events], period)
+        
+        is_home = np.array([event.home_team.id == team_id for event in events], dtype=bool)[:, None]
+        team = np.where(is_home, matrix.home, matrix.away)
+        opponent = np.where(is_home, matrix.away, matrix.home)
+        with warnings.catch_warnings():
+            # Stats without a single numeric value reduce to NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            counts = np.count_nonzero(~np.isnan(team), axis=0)
+            means = np.nanmean(team, axis=0)
+            medians = np.nanmedian(team, axis=0)
+            quantiles = np.nanpercentile(team, list(percentiles), axis=0) if len(events) else np.empty((len(percentiles), 0))
+            opponent_means = np.nanmean(opponent, axis=0)
+        
+        names = {}
+        for event_records in records.values():
+            for record in event_records:
+                names.setdefault(record.key, record.name)
+        stats = [
+            StatSummary(
+                key,
+                names[key],
+                int(counts[i]),
+                float(means[i]),
+                float(medians[i]),
+                {q: float(quantiles[j, i]) for j, q in enumerate(percentiles)},
+                float(opponent_means[i]),
+            )
+            for i, key in enumerate(matrix.keys)
+        ]
+        return TeamAggregate(team_id, [event.id for event in events], stats)
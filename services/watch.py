@@ -0,0 +1,184 @@
+"""
+Live watch mode.
+Polls live events and reports only what changed since the previous poll.
+"""
+import time
+from datetime import datetime
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from src.adapter.models import Event
+from src.adapter.sofascore import list_live_events
+from src.core.config import config
+from src.core.logging import get_logger
+
+# Setup logger
+logger = get_logger("watch")
+
+# Change kinds
+NEW = "new"
+SCORE = "score"
+STATUS = "status"
+FINISHED = "finished"
+
+class Change(NamedTuple):
+    """One change of a live event between two polls."""
+    kind: str
+    event: Event
+    # The event as seen in the previous poll; None for new events
+    previous: Optional[Event] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the change as a flat JSON-ready record."""
+        event = self.event
+        record = {
+            "type": self.kind,
+            "event_id": event.id,
+            "tournament": event.tournament.get("name"),
+            "home": event.home_team.name,
+            "away": event.away_team.name,
+            "home_score": event.home_score,
+            "away_score": event.away_score,
+            "status": _status_text(event),
+        }
+        if self.previous is not None and self.kind in (SCORE, STATUS):
+            record["previous"] = {
+                "home_score": self.previous.home_score,
+                "away_score": self.previous.away_score,
+                "status": _status_text(self.previous),
+            }
+        return record
+
+def _is_finished(event: Event) -> bool:
+    return event.status is not None and event.status.type == "finished"
+
+def _status_text(event: Event) -> Optional[str]:
+    if event.status is None:
+        return None
+    return event.status.description or event.status.type
+
+def diff_snapshots(
+    previous: Dict[int, Event],
+    current: Iterable[Event],
+    finished: AbstractSet[int] = frozenset(),
+) -> List[Change]:
+    """
+    Compare two live snapshots in a single pass over each.
+
+    Events missing from the current snapshot, or whose status turned to
+    "finished", are reported as finished. Events already reported as
+    finished are ignored, as the live listing keeps them for a while.
+
+    Args:
+        previous: Previous snapshot keyed by event id
+        current: Events of the current poll
+        finished: Ids of the events already reported as finished
+
+    Returns:
+        List of changes; unchanged events produce nothing
+    """
+    changes = []
+    seen = set()
+    for event in current:
+        if event.id in finished:
+            continue
+        seen.add(event.id)
+        before = previous.get(event.id)
+        if before is None:
+            changes.append(Change(NEW, event))
+            continue
+        if _is_finished(event) and not _is_finished(before):
+            changes.append(Change(FINISHED, event, before))
+            continue
+        if (event.home_score, event.away_score) != (before.home_score, before.away_score):
+            changes.append(Change(SCORE, event, before))
+        if _status_text(event) != _status_text(before):
+            changes.append(Change(STATUS, event, before))
+    for event_id, before in previous.items():
+        if event_id not in seen:
+            changes.append(Change(FINISHED, before, before))
+    return changes
+
+class LiveWatcher:
+    """Keeps the last live snapshot and yields the changes of each poll."""
+
+    def __init__(self, sport: str = config.DEFAULT_SPORT, fetch: Optional[Callable[[str], List[Event]]] = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            sport: Sport type (default from config)
+            fetch: Function returning the current live events; defaults to a
+                cache-bypassing ``list_live_events`` that revalidates upstream
+                and raises when the upstream is unavailable
+        """
+        self.sport = sport
+        self.fetch = fetch or list_live_events.refresh
+        self.snapshot: Dict[int, Event] = {}
+        # Finished events still in the live listing, never reported again
+        self.finished: Set[int] = set()
+
+    def poll(self) -> List[Change]:
+        """
+        Fetch the live events once and diff them against the previous poll.
+        A failed fetch raises and leaves the snapshot as it was.
+
+        Returns:
+            List of changes
+        """
+        events = self.fetch(self.sport)
+        changes = diff_snapshots(self.snapshot, events, self.finished)
+        self.finished.update(change.event.id for change in changes if change.kind == FINISHED)
+        # Events first seen finished are reported as new once
+        self.finished.update(event.id for event in events if _is_finished(event))
+        # The listing drops finished events after a while; so does the set
+        self.finished &= {event.id for event in events}
+        self.snapshot = {event.id: event for event in events if event.id not in self.finished}
+        return changes
+
+    def watch(self, interval: float, polls: Optional[int] = None) -> Iterator[List[Change]]:
+        """
+        Poll on a fixed interval, yielding the changes of every poll.
+
+        Args:
+            interval: Seconds between the start of two polls
+            polls: Stop after this many polls (default: run until interrupted)
+
+        Yields:
+            List of changes per poll (possibly empty)
+        """
+        count = 0
+        while polls is None or count < polls:
+            started = time.monotonic()
+            try:
+                changes = self.poll()
+            except Exception as e:
+                # Keep watching through transient upstream failures; the
+                # next poll is diffed against the last successful one
+                logger.warning(f"Live poll failed: {e}")
+                changes = []
+            yield changes
+            count += 1
+            if polls is None or count < polls:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+def format_change(change: Change, at: Optional[datetime] = None) -> str:
+    """
+    Format a change as one line of human-readable text.
+
+    Args:
+        change: Change to format
+        at: Time of the poll (default: now)
+
+    Returns:
+        Text line
+    """
+    event = change.event
+    stamp = (at or datetime.now()).strftime("%H:%M:%S")
+    score = f"{event.home_score if event.home_score is not None else '-'}-{event.away_score if event.away_score is not None else '-'}"
+    line = f"{stamp} [{change.kind}] {event.home_team.name} {score} {event.away_team.name}"
+    status = _status_text(event)
+    if change.kind == STATUS and change.previous is not None:
+        line += f" ({_status_text(change.previous) or '?'} -> {status or '?'})"
+    elif status:
+        line += f" ({status})"
+    return f"{line} - {event.tournament.get('name', 'Unknown')}"
@@ -12,10 +12,14 @@ setup(
         "pydantic>=2.0.0",
         "python-dotenv>=1.0.0",
         "matplotlib>=3.7.0",
+        "numpy>=1.24.0",
     ],
+    extras_require={
+        "http2": ["h2>=4.0.0"],
+    },
     entry_points={
         "console_scripts": [
-            "sofascore=cli.commands:cli",
+            "sofascore=cli.sofascore_cli:main",
         ],
     },
     python_requires=">=3.8",
@@ -0,0 +1,50 @@
+import pytest
+from pathlib import Path
+from src.adapter.store import EventStore, set_store
+
+@pytest.fixture(autouse=True)
+def event_store(tmp_path):
+    """Keep the local event index of each test in a temporary directory."""
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    set_store(store)
+    yield store
+    set_store(None)
+
+@pytest.fixture(autouse=True)
+def rate_limit_state(tmp_path, monkeypatch):
+    """Keep the rate limit buckets shared between processes out of the home directory."""
+    from src.adapter.ratelimit import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "state_dir", str(tmp_path / "ratelimit"))
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+
+@pytest.fixture(autouse=True)
+def circuit_breaker():
+    """Start each test with a closed circuit breaker."""
+    from src.adapter.resilience import breaker
+
+    breaker.reset()
+    yield breaker
+    breaker.reset()
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "api"
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    """Serve the recorded API fixtures locally and point the adapter and a fresh cache at them."""
+    from src.adapter import async_client, sofascore
+    from src.tools.replay import ReplayServer
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+
+    test_cache = Cache(cache_dir=str(tmp_path / "cache"), enabled=True)
+    for module in (cache_module, sofascore):
+        monkeypatch.setattr(module, "cache", test_cache)
+    with ReplayServer(FIXTURES_DIR) as server:
+        monkeypatch.setattr(sofascore, "API_BASE", server.url)
+        monkeypatch.setattr(async_client, "API_BASE", server.url)
+        sofascore.close_client()
+        try:
+            yield server
+        finally:
+            sofascore.close_client()
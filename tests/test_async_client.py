@@ -0,0 +1,31 @@
+import asyncio
+import httpx
+from src.adapter.async_client import AsyncSofaScoreClient
+
+def test_bulk_fetch_is_bounded():
+    """Test that bulk fetching never exceeds the concurrency limit."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        event_id = int(request.url.path.split("/event/")[1].split("/")[0])
+        if event_id == 13:
+            return httpx.Response(404, json={})
+        return httpx.Response(200, json={"statistics": [], "id": event_id})
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as http:
+            client = AsyncSofaScoreClient(concurrency=3, client=http, use_cache=False)
+            return await client.fetch_events_stats(range(10, 20))
+
+    results = asyncio.run(run())
+    assert peak <= 3
+    assert list(results) == list(range(10, 20))
+    assert results[13] is None
+    assert results[12]["id"] == 12
@@ -0,0 +1,133 @@
+from datetime import date, datetime
+
+def test_rate_limiter_spaces_requests():
+    """Test that the token bucket allows a burst, then spaces requests at the rate."""
+    from src.adapter.ratelimit import RateLimiter
+    
+    limiter = RateLimiter(rate=50, burst=2)
+    assert limiter.reserve() == 0 and limiter.reserve() == 0
+    assert 0.015 < limiter.reserve() <= 0.02
+    assert 0.035 < limiter.reserve() <= 0.04
+    
+    limiter.configure(0)
+    assert limiter.reserve() == 0
+
+def test_backfill_resumes_and_skips_stored(monkeypatch, event_store):
+    """Test that a backfill stores days and statistics and skips them when rerun."""
+    import httpx
+    from src.adapter import sofascore
+    from src.services.backfill import BackfillService
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+    
+    monkeypatch.setattr(cache_module, "cache", Cache(enabled=False))
+    requests = []
+    
+    def handler(request):
+        path = request.url.path
+        requests.append(path)
+        if "/statistics" in path:
+            event_id = int(path.split("/event/")[1].split("/")[0])
+            if event_id == 3:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"statistics": [{"period": "ALL", "id": event_id}]})
+        day = date.fromisoformat(path.rsplit("/", 1)[1])
+        event_id = day.day
+        return httpx.Response(200, json={"events": [{
+            "id": event_id,
+            "slug": "a-b",
+            "tournament": {"id": 17, "name": "Premier League"},
+            "homeTeam": {"id": 1, "name": "A"},
+            "awayTeam": {"id": 2, "name": "B"},
+            "startTimestamp": int(datetime(2024, 3, event_id, 12).timestamp()),
+            "status": {"code": 100, "type": "inprogress" if event_id == 2 else "finished"},
+        }]})
+    
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    updates = []
+    try:
+        progress = BackfillService.run(
+            date(2024, 3, 1), date(2024, 3, 3), with_stats=True, workers=2, rate=0, on_progress=updates.append
+        )
+        assert (progress.days_done, progress.events) == (3, 3)
+        # The match still in progress has no statistics fetched
+        assert (progress.stats_total, progress.stats_done, progress.stats_failed) == (2, 1, 1)
+        assert progress.eta == 0
+        assert event_store.get_statistics(1) == {"statistics": [{"period": "ALL", "id": 1}]}
+        assert updates
+        
+        requests.clear()
+        progress = BackfillService.run(date(2024, 3, 1), date(2024, 3, 3), with_stats=True, rate=0)
+        # Only the statistics that failed are retried
+        assert requests == ["/api/v1/event/3/statistics"]
+        assert (progress.days_skipped, progress.stats_skipped, progress.stats_failed) == (3, 1, 1)
+    finally:
+        sofascore.close_client()
+
+def test_backfill_retries_failed_day(monkeypatch, event_store, tmp_path):
+    """Test that a day whose listing failed is fetched again on the next run."""
+    import httpx
+    from src.adapter import sofascore
+    from src.services.backfill import BackfillService
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+
+    cache = Cache(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache_module, "cache", cache)
+    monkeypatch.setattr(sofascore, "cache", cache)
+    statuses = [500, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"events": []})
+
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    try:
+        day = date(2024, 3, 5)
+        assert BackfillService.run(day, day, rate=0).days_failed == 1
+        assert BackfillService.run(day, day, rate=0).days_done == 1
+        assert statuses == []
+    finally:
+        sofascore.close_client()
+
+def test_backfill_refetches_day_indexed_while_in_progress(monkeypatch, event_store):
+    """Test that a listing indexed before the day ended is refetched for final statuses."""
+    import httpx
+    from src.adapter import sofascore, store as store_module
+    from src.adapter.parsers import parse_events
+    from src.services.backfill import BackfillService
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+
+    monkeypatch.setattr(cache_module, "cache", Cache(enabled=False))
+    day = date(2024, 3, 5)
+    event = {
+        "id": 5,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": "A"},
+        "awayTeam": {"id": 2, "name": "B"},
+        "startTimestamp": int(datetime(2024, 3, 5, 20).timestamp()),
+        "status": {"code": 6, "type": "inprogress"},
+    }
+    # Indexed by a `today` command during the match
+    with monkeypatch.context() as m:
+        m.setattr(store_module.time, "time", lambda: datetime(2024, 3, 5, 21).timestamp())
+        event_store.upsert(parse_events([event]), day)
+    assert event_store.fetched_days(day, day) == {day}
+    assert event_store.fetched_days(day, day, complete=True) == set()
+
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"events": [dict(event, status={"code": 100, "type": "finished"})]})
+
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    try:
+        progress = BackfillService.run(day, day, rate=0)
+        assert (progress.days_skipped, progress.days_done) == (0, 1)
+        assert requests == ["/api/v1/sport/football/events/date/2024-03-05"]
+        assert event_store.fetched_days(day, day, complete=True) == {day}
+        assert BackfillService.run(day, day, rate=0).days_skipped == 1
+    finally:
+        sofascore.close_client()
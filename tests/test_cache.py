@@ -0,0 +1,301 @@
+import pytest
+import time
+from src.utils.cache import Cache, MemoryCache
+
+def test_memory_tier_serves_hits_without_disk(tmp_path):
+    """Test that reads are served from memory before touching the filesystem."""
+    cache = Cache(cache_dir=str(tmp_path), enabled=True, memory=MemoryCache(max_entries=10, max_bytes=0))
+    assert cache.set("key", {"value": 1}, max_age=60)
+    
+    # Remove the file behind the cache's back: the memory tier still answers
+    cache.backend._get_cache_path("key").unlink()
+    assert cache.get("key", max_age=60) == {"value": 1}
+    
+    # A fresh cache on the same directory falls through to disk and promotes
+    cache.set("other", {"value": 2})
+    fresh = Cache(cache_dir=str(tmp_path), enabled=True, memory=MemoryCache(max_entries=10, max_bytes=0))
+    assert fresh.get("other", max_age=60) == {"value": 2}
+    assert len(fresh.memory) == 1
+
+def test_memory_tier_lru_eviction_and_ttl():
+    """Test LRU eviction by entry count and bytes, and per-entry expiry."""
+    memory = MemoryCache(max_entries=2, max_bytes=100)
+    memory.set("a", 1, size=10)
+    memory.set("b", 2, size=10)
+    assert memory.get("a", max_age=60) is not None  # a becomes most recent
+    memory.set("c", 3, size=10)
+    assert memory.get("b", max_age=60) is None
+    assert memory.get("a", max_age=60).value == 1
+    
+    memory.set("big", 4, size=95)
+    assert len(memory) == 1
+    assert memory.total_bytes == 95
+    
+    memory.set("short", 5, size=1, ttl=0.01)
+    time.sleep(0.02)
+    assert memory.get("short", max_age=60) is None
+    memory.set("old", 6, size=1, stored_at=time.time() - 120)
+    assert memory.get("old", max_age=60) is None
+
+def test_sqlite_backend_batches_and_migrates(tmp_path):
+    """Test the SQLite backend: batched access, stored expiry and migration."""
+    legacy = Cache(cache_dir=str(tmp_path), enabled=True, backend="file")
+    legacy.set("old-key", {"legacy": True})
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    
+    cache = Cache(cache_dir=str(tmp_path), enabled=True, backend="sqlite", memory=MemoryCache(max_entries=0, max_bytes=0))
+    assert list(tmp_path.glob("*.json")) == []
+    assert cache.get("old-key", max_age=60) == {"legacy": True}
+    
+    assert cache.set_many({"a": [1], "b": {"x": 2}}, max_age=60)
+    cache.memory.clear()
+    assert cache.get_many(["a", "b", "missing"], max_age=60) == {"a": [1], "b": {"x": 2}}
+    
+    # Expiry lives in the database, independent of the caller's max_age
+    cache.set("short", 1, max_age=0)
+    cache.memory.clear()
+    time.sleep(0.01)
+    assert cache.get("short", max_age=60) is None
+
+def test_prune_expired_and_evict_to_budget(tmp_path, monkeypatch):
+    """Test expiry sweep, LRU eviction to the entry budget and per-endpoint stats."""
+    from src.core.config import config
+    monkeypatch.setattr(config, "CACHE_EXPIRED_GRACE", 0)
+    monkeypatch.setattr(config, "CACHE_SWEEP_INTERVAL", 0)
+    
+    for backend in ("file", "sqlite"):
+        cache = Cache(cache_dir=str(tmp_path / backend), enabled=True, backend=backend, max_entries=2, max_bytes=0)
+        cache.set("fetch_event:1", {"id": 1}, max_age=60)
+        cache.set("fetch_event:2", {"id": 2}, max_age=60)
+        cache.set("fetch_event_stats:1", {"id": 1}, max_age=60)
+        cache.set("list_live_events:football", [], max_age=-1)
+        cache.memory.clear()
+        time.sleep(0.01)
+        assert cache.get("fetch_event:1", max_age=60) == {"id": 1}
+        assert cache.get("fetch_event:3", max_age=60) is None
+        
+        result = cache.prune()
+        assert result["expired"] == 1
+        assert result["evicted"] == 1
+        assert cache.get("fetch_event:2", max_age=60) is None
+        
+        report = cache.stats()
+        assert report["endpoints"]["fetch_event"]["entries"] == 1
+        assert report["endpoints"]["fetch_event"]["hits"] == 1
+        assert report["endpoints"]["fetch_event"]["misses"] == 2
+        assert report["totals"]["entries"] == 2
+        
+        assert cache.clear() == 2
+
+def test_conditional_revalidation(tmp_path, monkeypatch):
+    """Test that expired entries are revalidated with ETag and renewed on 304."""
+    import httpx
+    from src.adapter import sofascore
+    from src.utils import cache as cache_module
+    
+    test_cache = Cache(cache_dir=str(tmp_path), enabled=True)
+    monkeypatch.setattr(cache_module, "cache", test_cache)
+    
+    requests = []
+    
+    def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"event": {"id": 5}}, headers={"ETag": '"v1"'})
+    
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    try:
+        @cache_module.cached(max_age=0)
+        def fetch_event(event_id):
+            return sofascore._get(f"/event/{event_id}")
+        
+        assert fetch_event(5) == {"event": {"id": 5}}
+        time.sleep(0.01)
+        assert fetch_event(5) == {"event": {"id": 5}}
+    finally:
+        sofascore.close_client()
+    
+    assert requests == [None, '"v1"']
+    totals = test_cache.stats()["totals"]
+    assert totals["revalidated"] == 1
+    assert totals["bytes_saved"] == len(b'{"event":{"id":5}}')
+
+def test_single_flight_and_stale_while_revalidate(tmp_path, monkeypatch):
+    """Test that concurrent misses share one call and stale values are served while refreshing."""
+    import threading
+    from src.utils import cache as cache_module
+    
+    monkeypatch.setattr(cache_module, "cache", Cache(cache_dir=str(tmp_path), enabled=True))
+    calls = []
+    release = threading.Event()
+    
+    @cache_module.cached(max_age=60)
+    def slow(x):
+        calls.append(x)
+        release.wait(5)
+        return {"x": x}
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(1))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == [{"x": 1}] * 5
+    
+    version = iter(range(1, 100))
+    refreshed = threading.Event()
+    
+    @cache_module.cached(max_age=0, stale_while_revalidate=60)
+    def live():
+        value = next(version)
+        if value > 1:
+            refreshed.set()
+        return value
+    
+    assert live() == 1
+    time.sleep(0.01)
+    assert live() == 1  # Stale value returned immediately
+    assert refreshed.wait(5)
+    time.sleep(0.05)
+    assert live() == 2
+
+def test_model_results_round_trip(tmp_path, monkeypatch):
+    """Test that List[Event] results are stored and rebuilt as models."""
+    import httpx
+    from datetime import date
+    from src.adapter import sofascore
+    from src.adapter.models import Event, Team
+    from src.utils import cache as cache_module
+    
+    test_cache = Cache(cache_dir=str(tmp_path), enabled=True)
+    monkeypatch.setattr(cache_module, "cache", test_cache)
+    payload = {"events": [{
+        "id": 7,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": "A"},
+        "awayTeam": {"id": 2, "name": "B", "slug": "b"},
+        "startTimestamp": 1700000000,
+    }]}
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=payload))))
+    try:
+        fetched = sofascore.list_events_for_day(date(2024, 1, 1))
+    finally:
+        sofascore.close_client()
+    
+    test_cache.memory.clear()
+    cached = sofascore.list_events_for_day(date(2024, 1, 1))
+    assert isinstance(cached[0], Event)
+    assert isinstance(cached[0].away_team, Team)
+    assert cached == fetched
+    
+    with pytest.raises(ValueError):
+        cache_module.decode_value(cache_module.encode_value(fetched), Team)
+    assert cache_module.decode_value({"plain": 1}) == {"plain": 1}
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_large_entries_are_compressed(tmp_path, backend):
+    """Test compressed round trips, legacy uncompressed entries and ratio stats."""
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    (legacy / f"{__import__('hashlib').md5(b'old').hexdigest()}.json").write_text('{"legacy": true}')
+    
+    cache = Cache(cache_dir=str(legacy), enabled=True, backend=backend, compress_level=6, compress_min_bytes=1024)
+    assert cache.get("old", max_age=10 ** 10) == {"legacy": True}
+    
+    big = {"events": [{"id": i, "name": "Premier League"} for i in range(500)]}
+    assert cache.set("big", big) and cache.set("small", {"id": 1})
+    cache.memory.clear()
+    assert cache.get("big") == big
+    assert cache.get_stale("big").value == big
+    assert cache.get("small") == {"id": 1}
+    
+    report = cache.stats()
+    assert report["totals"]["compressed"] == 1
+    assert report["totals"]["decompressed"] == 2
+    assert report["totals"]["compression_ratio"] > 2
+    assert report["totals"]["raw_bytes"] > report["totals"]["bytes"]
+
+def test_cache_directory_is_created_on_first_use(tmp_path):
+    """Test that a cache nobody reads or writes leaves no directory behind."""
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=str(cache_dir), enabled=True, backend="sqlite")
+    assert not cache_dir.exists()
+    
+    assert cache.set("key", {"value": 1})
+    assert cache_dir.is_dir() and cache.backend.name == "sqlite"
+
+def test_legacy_entries_expire_and_sweeps_run_in_background(tmp_path, monkeypatch):
+    """Test that headerless files are expired regardless of reads, and pruned off the write path."""
+    import hashlib
+    import threading
+    from src.core.config import config
+
+    (tmp_path / f"{hashlib.md5(b'old').hexdigest()}.json").write_text('{"legacy": true}')
+    cache = Cache(cache_dir=str(tmp_path), enabled=True, backend="file", memory=MemoryCache(max_entries=0, max_bytes=0))
+    assert cache.get("old", max_age=3600) is None
+    assert cache.get_stale("old").value == {"legacy": True}
+    assert cache.get("old", max_age=3600) is None
+
+    monkeypatch.setattr(config, "CACHE_SWEEP_INTERVAL", 1)
+    monkeypatch.setattr(config, "CACHE_EXPIRED_GRACE", 0)
+    sweeps = []
+    prune = cache.prune
+    monkeypatch.setattr(cache, "prune", lambda now=None: sweeps.append(threading.current_thread().name) or prune(now))
+    assert cache.set("new", 1, max_age=60)
+    with cache._sweep_lock:
+        # Held by the sweep until it is done
+        assert sweeps == ["cache-sweep"]
+    assert cache.get_stale("old") is None and cache.get("new", max_age=60) == 1
+
+def test_file_writes_never_leave_partial_files(tmp_path, monkeypatch):
+    """Test that a failed entry or bookkeeping write keeps the previous file and no temporary one."""
+    import os
+    from src.utils.cache import FileCacheBackend
+
+    (tmp_path / "meta").mkdir()
+    backend = FileCacheBackend(tmp_path / "meta")
+    backend.set_meta("last_sweep", 1.0)
+    cache = Cache(cache_dir=str(tmp_path / "entries"), enabled=True, backend="file", memory=MemoryCache(max_entries=0, max_bytes=0))
+    assert cache.set("key", {"value": 1}, max_age=60)
+    with cache._sweep_lock:
+        pass
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        backend.set_meta("last_sweep", 2.0)
+    assert not cache.set("key", {"value": 2}, max_age=60)
+    monkeypatch.undo()
+    assert backend.get_meta("last_sweep") == 1.0
+    assert cache.get("key", max_age=60) == {"value": 1}
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+def test_miss_after_flight_reuses_its_result(tmp_path, monkeypatch):
+    """Test that a caller missing just before the previous call stored its result does not call again."""
+    from src.utils import cache as cache_module
+
+    test_cache = Cache(cache_dir=str(tmp_path), enabled=True)
+    monkeypatch.setattr(cache_module, "cache", test_cache)
+    calls = []
+
+    @cache_module.cached(max_age=60)
+    def fetch(x):
+        calls.append(x)
+        return {"x": x}
+
+    assert fetch(1) == {"x": 1}
+    # The caller's own lookup misses, as if it ran just before the result was stored
+    get = test_cache.get
+    monkeypatch.setattr(test_cache, "get", lambda key, max_age=3600, decode=None, count=True: (
+        get(key, max_age, decode, count) if not count else None
+    ))
+    assert fetch(1) == {"x": 1}
+    assert calls == [1]
@@ -0,0 +1,74 @@
+import subprocess
+import sys
+from pathlib import Path
+
+def test_help_skips_heavy_imports(tmp_path):
+    """Test that parsing arguments loads neither the adapter nor its dependencies."""
+    root = Path(__file__).absolute().parents[2]
+    script = (
+        "import sys\n"
+        "from src.cli.sofascore_cli import main\n"
+        "sys.argv = ['sofascore', '--help']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('httpx', 'pydantic', 'numpy', 'tenacity', 'src.adapter.sofascore') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True,
+        env={"SOFASCORE_CACHE_DIR": str(tmp_path / "cache"), "PATH": ""},
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+    assert not (tmp_path / "cache").exists()
+
+def test_cli_runs_offline_against_replay(tmp_path):
+    """Test that the CLI fetches from the replay server, then answers from its cache."""
+    import json
+    from src.tools.replay import ReplayServer
+    from tests.conftest import FIXTURES_DIR
+
+    root = Path(__file__).absolute().parents[2]
+    with ReplayServer(FIXTURES_DIR) as server:
+        env = {
+            "PATH": "",
+            "SOFASCORE_API_BASE": server.url,
+            "SOFASCORE_CACHE_DIR": str(tmp_path / "cache"),
+            "SOFASCORE_INDEX_PATH": str(tmp_path / "events.sqlite3"),
+            "SOFASCORE_RATE_LIMIT_DIR": "",
+            # Logs go to stdout; keep it to the rows
+            "SOFASCORE_LOG_LEVEL": "WARNING",
+        }
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-m", "src", "day", "2024-01-01", "--format", "jsonl"],
+                cwd=root, capture_output=True, text=True, check=True, env=env,
+            )
+            rows = [json.loads(line) for line in result.stdout.splitlines()]
+            assert [row["id"] for row in rows] == [11352352, 11352353, 11368740]
+        assert server.requests == [("/sport/football/events/date/2024-01-01", 200)]
+
+        # Errors go to stderr, keeping stdout to the rows
+        result = subprocess.run(
+            [sys.executable, "-m", "src", "stats", "11368740", "--format", "csv"],
+            cwd=root, capture_output=True, text=True, env=env,
+        )
+        assert (result.returncode, result.stdout) == (1, "")
+        assert "Error fetching statistics for event 11368740" in result.stderr
+
+def test_bad_dates_are_usage_errors(tmp_path):
+    """Test that a malformed --from/--to is reported on stderr instead of a traceback."""
+    root = Path(__file__).absolute().parents[2]
+    env = {
+        "PATH": "",
+        "SOFASCORE_CACHE_DIR": str(tmp_path / "cache"),
+        "SOFASCORE_INDEX_PATH": str(tmp_path / "events.sqlite3"),
+        "SOFASCORE_RATE_LIMIT_DIR": "",
+    }
+    for args in (["backfill", "--from", "2024-13-01", "--to", "2024-03-02"], ["team", "42", "--to", "March"]):
+        result = subprocess.run(
+            [sys.executable, "-m", "src", *args], cwd=root, capture_output=True, text=True, env=env,
+        )
+        assert result.returncode == 2
+        assert "invalid date" in result.stderr and "Traceback" not in result.stderr
+        assert result.stdout == ""
@@ -0,0 +1,109 @@
+import json
+import pytest
+from src.utils.jsonstream import iter_array_items
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_iter_array_items_across_chunk_boundaries(size):
+    """Test that items are decoded regardless of where chunks split the document."""
+    document = json.dumps({
+        "meta": {"count": 12345, "note": "événements [not, the, array]"},
+        "total": 1.5e3,
+        "events": [{"id": i, "name": f"Équipe {i}", "tags": [True, None]} for i in range(5)],
+        "hasNextPage": False,
+    }, ensure_ascii=False)
+    items = list(iter_array_items(chunked(document, size)))
+    assert items == json.loads(document)["events"]
+
+def test_iter_array_items_edge_cases():
+    """Test empty arrays, missing keys, alternative keys and invalid input."""
+    assert list(iter_array_items([b'{"events": []}'])) == []
+    assert list(iter_array_items([b'{}'])) == []
+    assert list(iter_array_items([b'{"other": 1}'])) == []
+    assert list(iter_array_items([b'{"eventList": [1, 2]}'], ("events", "eventList"))) == [1, 2]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array_items([b'{"events": [{"id": 1} {"id": 2}]}']))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array_items([b'{"events": [{"id": 1}']))
+
+def test_iter_events_for_day_streams_and_caches(tmp_path, monkeypatch):
+    """Test that a streamed listing is cached for list_events_for_day."""
+    import httpx
+    from datetime import date
+    from src.adapter import sofascore
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+    
+    test_cache = Cache(cache_dir=str(tmp_path), enabled=True)
+    monkeypatch.setattr(cache_module, "cache", test_cache)
+    monkeypatch.setattr(sofascore, "cache", test_cache)
+    payload = {"events": [{
+        "id": event_id,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": "A"},
+        "awayTeam": {"id": 2, "name": "B"},
+        "startTimestamp": 1700000000 + event_id,
+    } for event_id in range(3)]}
+    requests = []
+    
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json=payload)
+    
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    try:
+        streamed = list(sofascore.iter_events_for_day(date(2024, 1, 1)))
+        assert [event.id for event in streamed] == [0, 1, 2]
+        
+        test_cache.memory.clear()
+        assert sofascore.list_events_for_day(date(2024, 1, 1)) == streamed
+        assert list(sofascore.iter_events_for_day(date(2024, 1, 1))) == streamed
+        assert len(requests) == 1
+    finally:
+        sofascore.close_client()
+
+def test_iter_events_for_day_retries_and_never_caches_partial_listings(tmp_path, monkeypatch):
+    """Test that opening the stream is retried, a broken stream raises and oversized listings are not cached."""
+    import httpx
+    from datetime import date
+    from src.adapter import sofascore
+    from src.core.config import config
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache, UpstreamUnavailable
+
+    test_cache = Cache(cache_dir=str(tmp_path), enabled=True)
+    monkeypatch.setattr(cache_module, "cache", test_cache)
+    monkeypatch.setattr(sofascore, "cache", test_cache)
+    monkeypatch.setattr(config, "RETRY_BACKOFF", 0.01)
+    body = json.dumps({"events": [{
+        "id": event_id,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": "A"},
+        "awayTeam": {"id": 2, "name": "B"},
+        "startTimestamp": 1700000000 + event_id,
+    } for event_id in range(3)]}).encode()
+    def dropped():
+        # The connection drops after the first event
+        yield body[:body.index(b"}, {") + 3]
+        raise httpx.ReadError("connection reset")
+
+    responses = [httpx.Response(503), httpx.Response(200, content=dropped()), httpx.Response(200, content=body)]
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(lambda request: responses.pop(0))))
+    day = date(2024, 1, 1)
+    try:
+        streamed = []
+        with pytest.raises(UpstreamUnavailable):
+            for event in sofascore.iter_events_for_day(day):
+                streamed.append(event.id)
+        assert streamed == [0] and len(responses) == 1
+
+        monkeypatch.setattr(config, "CACHE_STREAM_MAX_BYTES", len(body) // 2)
+        assert [event.id for event in sofascore.iter_events_for_day(day)] == [0, 1, 2]
+        assert test_cache.get_stale(sofascore.make_cache_key("list_events_for_day", day, "football")) is None
+    finally:
+        sofascore.close_client()
@@ -87,4 +87,62 @@ def test_event_model():
             "home_team": home_team,
             "away_team": away_team,
             "start_timestamp": 1650000000
-        })
\ No newline at end of file
+        })
+def test_parse_events_batch_and_trusted():
+    """Test batch parsing of raw API items and the trusted construct path."""
+    from src.adapter.parsers import parse_events
+    
+    raw = [{
+        "id": 1001,
+        "slug": "home-vs-away",
+        "tournament": {"id": 5, "name": "Test Tournament"},
+        "homeTeam": {"id": 1, "name": "Home Team", "shortName": "Home"},
+        "awayTeam": {"id": 2, "name": "Away Team", "slug": "away"},
+        "startTimestamp": 1650000000,
+        "status": {"type": "finished"},
+    }]
+    events = parse_events(raw)
+    assert events[0].home_team == Team(id=1, name="Home Team")
+    assert events[0].away_team.slug == "away"
+    assert events[0].start_timestamp == 1650000000
+    
+    trusted = parse_events([event.model_dump() for event in events], trusted=True)
+    assert trusted == events
+    assert isinstance(trusted[0].home_team, Team)
+    
+    with pytest.raises(Exception):
+        parse_events([{**raw[0], "homeTeam": {"name": "Missing ID"}}])
+
+def test_intern_pool_shares_teams_and_tournaments():
+    """Test that events share one team and tournament object per id."""
+    from src.adapter.compact import InternPool
+    
+    def event(event_id, home, away):
+        return Event.model_validate({
+            "id": event_id,
+            "slug": f"{home}-{away}",
+            "tournament": {"id": 17, "name": "Premier League", "category": {"name": "England"}},
+            "homeTeam": {"id": home, "name": f"Team {home}"},
+            "awayTeam": {"id": away, "name": f"Team {away}"},
+            "startTimestamp": 1650000000 + event_id,
+            "status": {"code": 100, "type": "finished", "description": "Ended"},
+            "homeScore": {"current": event_id},
+        })
+    
+    pool = InternPool()
+    original = event(2, 20, 10)
+    first, second = pool.intern_event(event(1, 10, 20)), pool.intern_event(original)
+    assert first.home_team is second.away_team
+    assert first.tournament is second.tournament
+    # Interning copies: the parsed event may be shared by the cache
+    assert original.away_team is not first.home_team and second == original
+    
+    compact = pool.compact_events([event(3, 10, 30), event(4, 30, 10)])
+    assert compact[0].home_team is compact[1].away_team
+    assert compact[0].tournament is compact[1].tournament
+    assert compact[0].tournament.get("name") == "Premier League"
+    assert compact[0].tournament.get("category") == "England"
+    assert compact[0].tournament.get("missing", "Unknown") == "Unknown"
+    assert compact[1].home_team.name == "Team 30"
+    assert compact[0].status is compact[1].status and compact[0].status.description == "Ended"
+    assert (compact[1].home_score, compact[1].away_score) == (4, None)
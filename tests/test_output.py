@@ -0,0 +1,72 @@
+import io
+import json
+
+from src.adapter.models import Event
+from src.utils.output import EVENT_FIELDS, STAT_FIELDS, RowWriter, event_row, stat_rows
+
+def make_event(event_id, home="Arsenal, FC"):
+    return Event.model_validate({
+        "id": event_id,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": home},
+        "awayTeam": {"id": 2, "name": "Chelsea"},
+        "startTimestamp": 1700000000,
+        "status": {"code": 100, "type": "finished", "description": "Ended"},
+        "homeScore": {"current": 2},
+        "awayScore": {"current": 1},
+    })
+
+def test_jsonl_rows():
+    """Test that every event becomes one JSON object per line."""
+    stream = io.StringIO()
+    with RowWriter("jsonl", EVENT_FIELDS, stream) as writer:
+        writer.write_all(event_row(make_event(i)) for i in (1, 2))
+
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [row["id"] for row in rows] == [1, 2]
+    assert rows[0]["home_team"] == "Arsenal, FC"
+    assert (rows[0]["home_score"], rows[0]["away_score"], rows[0]["status"]) == (2, 1, "Ended")
+
+def test_csv_and_tsv_rows():
+    """Test header rows, quoting and empty values in delimited output."""
+    stream = io.StringIO()
+    with RowWriter("csv", ("id", "home_team", "home_score"), stream) as writer:
+        writer.write({"id": 1, "home_team": "Arsenal, FC", "home_score": None})
+    assert stream.getvalue() == 'id,home_team,home_score\n1,"Arsenal, FC",\n'
+
+    stream = io.StringIO()
+    with RowWriter("tsv", STAT_FIELDS, stream) as writer:
+        writer.write_all(stat_rows(7, {"statistics": [{"period": "ALL", "groups": [
+            {"groupName": "Expected", "statisticsItems": [{"name": "xG", "home": "1.2", "away": "0.4"}]},
+        ]}]}))
+    assert stream.getvalue().splitlines() == ["\t".join(STAT_FIELDS), "7\tALL\tExpected\txG\t1.2\t0.4"]
+
+def test_rows_are_flushed_in_batches():
+    """Test that output is flushed while rows are still being produced."""
+    class Stream(io.StringIO):
+        flushes = 0
+        def flush(self):
+            self.flushes += 1
+
+    stream = Stream()
+    writer = RowWriter("jsonl", EVENT_FIELDS, stream, flush_every=2)
+    for i in range(5):
+        writer.write(event_row(make_event(i)))
+    assert stream.flushes == 2
+
+def test_closed_pipe_exits_quietly():
+    """Test that a consumer closing the pipe ends the output without an error."""
+    import os
+    import pytest
+
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    stream = os.fdopen(write_fd, "w")
+    try:
+        with pytest.raises(SystemExit) as exit_info:
+            with RowWriter("jsonl", EVENT_FIELDS, stream, flush_every=1) as writer:
+                writer.write_all(event_row(make_event(i)) for i in range(10))
+        assert exit_info.value.code == 0 and writer.rows == 1
+    finally:
+        stream.close()
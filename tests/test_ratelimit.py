@@ -0,0 +1,110 @@
+import time
+import multiprocessing
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from src.adapter.ratelimit import EndpointRateLimiter, RateLimiter, endpoint_class, parse_limits, parse_retry_after
+
+def _reserve(path, queue):
+    queue.put(RateLimiter(rate=0.1, burst=1, path=path).reserve())
+
+def test_endpoint_classes_have_their_own_buckets():
+    """Test that each endpoint class is limited at its own rate."""
+    assert endpoint_class("/event/1/statistics") == "stats"
+    assert endpoint_class("/event/1") == "event"
+    assert endpoint_class("/sport/football/events/live") == "live"
+    assert endpoint_class("/sport/football/events/date/2024-01-01") == "listing"
+    assert parse_limits("stats=2, listing=5,bad=x") == {"stats": 2.0, "listing": 5.0}
+
+    limiter = EndpointRateLimiter(rate=0, burst=1, limits={"stats": 10})
+    assert limiter.reserve("/event/1/statistics") == 0
+    assert 0.09 < limiter.reserve("/event/2/statistics") <= 0.1
+    # Other classes are unaffected, and follow configure() unless they have their own limit
+    assert limiter.reserve("/event/1") == 0
+    limiter.configure(100)
+    assert limiter.bucket("event").rate == 100 and limiter.bucket("stats").rate == 10
+
+def test_bucket_is_shared_between_processes(tmp_path):
+    """Test that limiters using the same state file draw from one bucket."""
+    path = str(tmp_path / "stats.bucket")
+    first = RateLimiter(rate=0.1, burst=1, path=path)
+    assert first.reserve() == 0
+
+    queue = multiprocessing.get_context("spawn").Queue()
+    process = multiprocessing.get_context("spawn").Process(target=_reserve, args=(path, queue))
+    process.start()
+    delay = queue.get(timeout=30)
+    process.join()
+    # The token taken here left the other process waiting for the next one
+    assert 5 < delay <= 10
+
+def test_pause_holds_back_the_bucket(tmp_path):
+    """Test that a pause delays callers even without a rate."""
+    limiter = RateLimiter(rate=0)
+    limiter.pause(0.5)
+    assert 0.4 < limiter.reserve() <= 0.5
+
+    shared = RateLimiter(rate=1000, burst=5, path=str(tmp_path / "b"))
+    shared.pause(1)
+    assert 0.9 < RateLimiter(rate=1000, burst=5, path=str(tmp_path / "b")).reserve() <= 1
+
+    # Pauses are shared by unlimited buckets too, which leave the tokens alone
+    unlimited = RateLimiter(rate=0, path=str(tmp_path / "c"))
+    RateLimiter(rate=0, path=str(tmp_path / "c")).pause(1)
+    assert 0.9 < unlimited.reserve() <= 1
+
+def test_acquire_gives_up_at_the_deadline():
+    """Test that waiting for the rate limit never outlasts the caller's deadline."""
+    from src.adapter.resilience import DeadlineExceeded, deadline
+
+    limiter = RateLimiter(rate=0)
+    limiter.pause(5)
+    started = time.monotonic()
+    with deadline(1), pytest.raises(DeadlineExceeded):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.5
+
+def test_parse_retry_after():
+    """Test Retry-After in seconds and as an HTTP date."""
+    assert parse_retry_after("3") == 3.0
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+def test_throttled_requests_are_retried(monkeypatch):
+    """Test that 429 and 503 responses are retried after Retry-After, and other errors are not."""
+    from src.adapter import sofascore
+    from src.adapter.ratelimit import rate_limiter
+    from src.core.config import config
+
+    monkeypatch.setattr(config, "RETRY_BACKOFF", 0.01)
+    responses = {
+        "/event/1": [httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200, json={"event": {"id": 1}})],
+        "/event/2": [httpx.Response(503) for _ in range(config.API_RETRIES)],
+        "/event/3": [httpx.Response(404), httpx.Response(200, json={})],
+    }
+    seen = []
+
+    def handler(request):
+        path = request.url.path.replace("/api/v1", "")
+        seen.append(path)
+        return responses[path].pop(0)
+
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    try:
+        started = time.monotonic()
+        assert sofascore._get("/event/1") == {"event": {"id": 1}}
+        assert time.monotonic() - started >= 0.2
+        # The pause also applied to the bucket of the endpoint class
+        assert rate_limiter.bucket("event")._blocked_until > 0
+
+        with pytest.raises(httpx.HTTPStatusError):
+            sofascore._get("/event/2")
+        with pytest.raises(httpx.HTTPStatusError):
+            sofascore._get("/event/3")
+    finally:
+        sofascore.close_client()
+    assert seen.count("/event/2") == config.API_RETRIES
+    assert seen.count("/event/3") == 1
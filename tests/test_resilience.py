@@ -0,0 +1,77 @@
+import time
+from datetime import date
+
+import httpx
+import pytest
+
+from src.adapter import sofascore
+from src.adapter.resilience import CircuitOpen, breaker, deadline, remaining
+from src.core.config import config
+from src.utils import cache as cache_module
+from src.utils.cache import Cache
+
+def use_handler(handler):
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+
+def test_breaker_fails_fast_and_probes(monkeypatch):
+    """Test that the breaker opens after consecutive failures and closes after a successful probe."""
+    monkeypatch.setattr(breaker, "threshold", 2)
+    monkeypatch.setattr(breaker, "reset_timeout", 0.2)
+    status = [500]
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(status[0], json={})
+
+    use_handler(handler)
+    try:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                sofascore._get("/event/1")
+        with pytest.raises(CircuitOpen):
+            sofascore._get("/event/1")
+        assert len(seen) == 2 and breaker.state == "open"
+
+        time.sleep(0.25)
+        status[0] = 200
+        assert breaker.state == "half-open"
+        assert sofascore._get("/event/1") == {}
+        assert breaker.state == "closed"
+    finally:
+        sofascore.close_client()
+
+def test_deadline_serves_stale_cache(monkeypatch, tmp_path):
+    """Test that a command out of time answers from expired cache entries, or the fallback."""
+    monkeypatch.setattr(cache_module, "cache", Cache(cache_dir=str(tmp_path / "cache"), enabled=True))
+    monkeypatch.setattr(config, "RETRY_BACKOFF", 5)
+    payload = {"statistics": [{"period": "ALL", "groups": []}]}
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if len(seen) == 1:
+            return httpx.Response(200, json=payload)
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    use_handler(handler)
+    try:
+        assert sofascore.fetch_event_stats(5) == payload
+        # Let the entry expire, then find the upstream unresponsive
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 3600)
+        started = time.monotonic()
+        with deadline(0.5):
+            assert remaining() <= 0.5
+            assert sofascore.fetch_event_stats(5) == payload
+        assert time.monotonic() - started < 0.5
+        assert remaining() is None
+
+        # Nothing cached: listings fall back to an empty list without a request
+        requests = len(seen)
+        with deadline(0.001):
+            time.sleep(0.01)
+            assert sofascore.list_events_for_day(date(2024, 1, 1)) == []
+        assert len(seen) == requests
+    finally:
+        sofascore.close_client()
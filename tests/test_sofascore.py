@@ -1,22 +1,133 @@
+import httpx
 import pytest
 from datetime import date
-from src.adapter.sofascore import list_live_events, list_events_for_day
+from src.adapter.sofascore import fetch_event, fetch_event_stats, iter_events_for_day, list_live_events, list_events_for_day
 
-def test_list_live_events():
+def test_list_live_events(replay):
     """Test listing live events."""
     events = list_live_events()
-    # Basic validation - events should be a list
-    assert isinstance(events, list)
-    
-    # If there are events, check their structure
-    if events:
-        event = events[0]
-        assert hasattr(event, 'id')
-        assert hasattr(event, 'home_team')
-        assert hasattr(event, 'away_team')
-
-def test_list_events_for_day():
-    """Test listing events for a specific day."""
-    today = date.today()
-    events = list_events_for_day(today)
-    assert isinstance(events, list)
\ No newline at end of file
+    assert [event.id for event in events] == [11352400]
+    event = events[0]
+    assert (event.home_team.name, event.away_team.name) == ("Manchester City", "Arsenal")
+    assert event.status.type == "inprogress"
+
+def test_list_events_for_day(replay):
+    """Test listing events for a specific day, then serving it from the cache."""
+    day = date(2024, 1, 1)
+    events = list_events_for_day(day)
+    assert [event.id for event in events] == [11352352, 11352353, 11368740]
+    assert (events[0].home_score, events[0].away_score) == (2, 1)
+    assert [event.id for event in iter_events_for_day(day)] == [event.id for event in events]
+    assert len(replay.requests) == 1
+    # Days without a fixture are answered with a 404
+    assert list_events_for_day(date(2024, 1, 2)) == []
+
+def test_fetch_event_and_stats(replay):
+    """Test fetching an event and its statistics, and a recorded 404."""
+    assert fetch_event(11352352)["event"]["homeTeam"]["name"] == "Arsenal"
+    periods = [period["period"] for period in fetch_event_stats(11352352)["statistics"]]
+    assert periods == ["ALL", "1ST", "2ND"]
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch_event_stats(11368740)
+    assert replay.requests[-1] == ("/event/11368740/statistics", 404)
+
+def test_failed_event_fetches_serve_stale(replay, monkeypatch):
+    """Test that upstream errors on event endpoints serve the last payload and raise without one."""
+    import time
+    from src.utils.cache import UpstreamUnavailable
+
+    stats = fetch_event_stats(11352352)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3601)
+    replay.error_rate = 1.0
+    assert fetch_event_stats(11352352) == stats
+    with pytest.raises(UpstreamUnavailable):
+        fetch_event(11352352)
+
+def test_replay_faults_are_retried(replay, monkeypatch):
+    """Test that injected 429s and errors are retried until the upstream answers."""
+    from src.core.config import config
+
+    monkeypatch.setattr(config, "RETRY_BACKOFF", 0.01)
+    replay.throttle_rate, replay.retry_after = 1.0, 0.05
+    assert list_live_events() == []
+    assert [status for _, status in replay.requests] == [429] * config.API_RETRIES
+
+    replay.requests.clear()
+    replay.throttle_rate, replay.error_rate, replay.error_status = 0.0, 0.5, 503
+    replay._random.seed(3)
+    events = list_events_for_day(date(2024, 1, 1))
+    statuses = [status for _, status in replay.requests]
+    assert statuses == [503, 200] and len(events) == 3
+
+def test_shared_client_is_reused():
+    """Test that all fetch functions share one pooled HTTP client."""
+    import httpx
+    from src.adapter import sofascore
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"event": {"id": 1}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), headers=sofascore.HEADERS)
+    sofascore.set_client(client)
+    try:
+        assert sofascore.get_client() is client
+        sofascore._get("/event/1")
+        sofascore._get("/event/1/statistics")
+        assert sofascore.get_client() is client
+        assert len(seen) == 2
+    finally:
+        sofascore.close_client()
+    assert client.is_closed
+
+
+def test_list_events_for_range_dedupes_in_day_order(monkeypatch):
+    """Test that range listings keep day order and drop midnight duplicates."""
+    from datetime import timedelta
+    from src.adapter import sofascore
+    from src.adapter.models import Event
+
+    def make_event(event_id):
+        return Event.model_validate({
+            "id": event_id,
+            "slug": f"event-{event_id}",
+            "tournament": {"id": 1, "name": "Test"},
+            "home_team": {"id": 1, "name": "Home"},
+            "away_team": {"id": 2, "name": "Away"},
+            "start_timestamp": 1650000000 + event_id,
+        })
+
+    start = date(2024, 3, 1)
+    listings = {
+        start: [make_event(1), make_event(2)],
+        start + timedelta(days=1): [make_event(2), make_event(3)],
+        start + timedelta(days=2): [],
+    }
+    monkeypatch.setattr(sofascore, "list_events_for_day", lambda day, sport: listings[day])
+
+    result = sofascore.list_events_for_range(start, start + timedelta(days=2))
+    assert list(result) == sorted(listings)
+    assert [[e.id for e in events] for events in result.values()] == [[1, 2], [3], []]
+
+def test_failed_listings_are_not_cached(replay, monkeypatch):
+    """Test that upstream errors serve the last listing, or an empty one, without caching it."""
+    import time
+    from src.utils.cache import UpstreamUnavailable
+
+    day = date(2024, 1, 1)
+    ids = [event.id for event in list_events_for_day(day)]
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3601)
+    replay.error_rate = 1.0
+    assert [event.id for event in list_events_for_day(day)] == ids
+    assert list_live_events() == []
+    # Refreshing callers, such as the live watcher, see the failure
+    with pytest.raises(UpstreamUnavailable):
+        list_live_events.refresh()
+
+    replay.error_rate = 0.0
+    assert [event.id for event in list_live_events()] == [11352400]
+    assert [status for _, status in replay.requests] == [200, 500, 500, 500, 200]
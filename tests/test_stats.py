@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+from src.services.stats import normalize_statistics, parse_stat_value, stat_key, stats_matrix
+
+def make_payload(possession, shots, corners=None):
+    items = [
+        {"name": "Ball possession", "home": f"{possession}%", "away": f"{100 - possession}%",
+         "key": "ballPossession", "homeValue": possession, "awayValue": 100 - possession},
+        {"name": "Total shots", "home": f"{shots} ({shots // 2})", "away": "3 (1)"},
+    ]
+    if corners is not None:
+        items.append({"name": "Corner kicks", "home": corners, "away": "-"})
+    return {"statistics": [
+        {"period": "ALL", "groups": [{"groupName": "Match overview", "statisticsItems": items}]},
+        {"period": "1ST", "groups": [{"groupName": "Match overview", "statisticsItems": items[:1]}]},
+    ]}
+
+def test_parse_stat_value():
+    """Test that display strings yield their leading number."""
+    assert parse_stat_value("54%") == 54.0
+    assert parse_stat_value("7 (3)") == 7.0
+    assert parse_stat_value("412/500 (82%)") == 412.0
+    assert parse_stat_value(1.25) == 1.25
+    assert math.isnan(parse_stat_value("-"))
+    assert math.isnan(parse_stat_value(None))
+    assert stat_key("Shots on target") == "shotsOnTarget"
+
+def test_normalize_statistics():
+    """Test that payloads flatten into typed records per period."""
+    records = normalize_statistics(make_payload(54, 10, corners=4))
+    assert [(r.period, r.key, r.home, r.away) for r in records[:2]] == [
+        ("ALL", "ballPossession", 54.0, 46.0),
+        ("ALL", "totalShots", 10.0, 3.0),
+    ]
+    assert records[2].key == "cornerKicks" and math.isnan(records[2].away)
+    assert records[3].period == "1ST"
+    assert normalize_statistics(None) == []
+    assert normalize_statistics({"statistics": [{"period": "ALL"}]}) == []
+
+def test_stats_matrix():
+    """Test that many events become one dense matrix with NaN for missing stats."""
+    records = [normalize_statistics(make_payload(54, 10)), normalize_statistics(make_payload(40, 6, corners=2)), []]
+    matrix = stats_matrix([1, 2, 3], records)
+
+    assert matrix.keys == ["ballPossession", "totalShots", "cornerKicks"]
+    assert matrix.home.shape == (3, 3)
+    np.testing.assert_array_equal(matrix.column("ballPossession")[:2], [54, 40])
+    assert np.isnan(matrix.home[0, 2]) and np.isnan(matrix.home[2]).all()
+
+    first_half = stats_matrix([1, 2], records[:2], period="1ST", keys=["totalShots", "ballPossession"])
+    assert np.isnan(first_half.home[:, 0]).all()
+    np.testing.assert_array_equal(first_half.column("ballPossession", "away"), [46, 60])
+
+def test_aggregate_team_statistics(monkeypatch, event_store):
+    """Test that a team's side of each match is aggregated, cache-first and memoized."""
+    from src.adapter.models import Event
+    from src.services import stats
+
+    monkeypatch.setattr(stats, "_normalized_memo", stats.OrderedDict())
+    events = [
+        Event.model_validate({
+            "id": event_id,
+            "slug": "a-b",
+            "tournament": {"id": 17, "name": "Premier League"},
+            "homeTeam": {"id": home, "name": "A"},
+            "awayTeam": {"id": away, "name": "B"},
+            "startTimestamp": 1700000000 + event_id * 86400,
+            "status": {"code": 100, "type": status},
+        })
+        for event_id, home, away, status in [
+            (1, 5, 6, "finished"), (2, 6, 5, "finished"), (3, 5, 7, "finished"), (4, 5, 8, "finished"),
+            # Partial statistics of a match in progress are never fetched
+            (5, 5, 9, "inprogress"), (6, 5, 6, "postponed"),
+        ]
+    ]
+    event_store.upsert(events)
+    # Possession (home-away): 60-40, 30-70, 50-50 and no statistics for event 4
+    event_store.upsert_statistics(1, make_payload(60, 10))
+    fetched = []
+
+    def fetch_bulk(event_ids):
+        fetched.append(sorted(event_ids))
+        return {2: make_payload(30, 4, corners=5), 3: make_payload(50, 8), 4: None}
+
+    monkeypatch.setattr(stats, "fetch_events_stats_bulk", fetch_bulk)
+    result = stats.StatsService.aggregate(5, percentiles=(50,))
+    assert fetched == [[2, 3, 4]]
+    assert result.event_ids == [1, 2, 3]
+    possession = result.stats[0]
+    assert (possession.key, possession.matches, possession.mean, possession.median) == ("ballPossession", 3, 60.0, 60.0)
+    assert possession.percentiles == {50: 60.0} and possession.opponent_mean == 40.0
+    # Team 5 was away in event 2, whose away corners are not numeric
+    corners = result.stats[2]
+    assert (corners.key, corners.matches, corners.opponent_mean) == ("cornerKicks", 0, 5.0)
+
+    # Repeat queries are served from the memo and the stored statistics
+    assert stats.StatsService.aggregate(5, last_n=2).event_ids == [2, 3]
+    assert fetched == [[2, 3, 4], [4]]
+    assert event_store.stored_statistics([2, 3, 4]) == {2, 3}
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from src.adapter.models import Event
+from src.adapter.store import EventStore
+
+def make_event(event_id, tournament_id, home, away, start):
+    return Event.model_validate({
+        "id": event_id,
+        "slug": f"{home}-{away}",
+        "tournament": {"id": tournament_id, "name": f"Tournament {tournament_id}"},
+        "homeTeam": {"id": home, "name": f"Team {home}"},
+        "awayTeam": {"id": away, "name": f"Team {away}"},
+        "startTimestamp": start,
+    })
+
+def test_store_queries_and_upserts(tmp_path):
+    """Test indexed queries by team, tournament and time, and incremental upserts."""
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    day = date(2024, 3, 1)
+    store.upsert([
+        make_event(1, 17, 10, 20, 1000),
+        make_event(2, 17, 30, 10, 3000),
+        make_event(3, 8, 20, 30, 2000),
+    ], day)
+    
+    assert [e.id for e in store.events_for_team(10)] == [1, 2]
+    assert [e.id for e in store.events_for_team(20, start=1500)] == [3]
+    assert [e.id for e in store.events_for_tournament(17, end=3000)] == [1]
+    assert [e.id for e in store.events_between(1000, 2500)] == [1, 3]
+    assert store.events_for_team(10)[0] == make_event(1, 17, 10, 20, 1000)
+    assert store.fetched_days(day, date(2024, 3, 31)) == {day}
+    
+    # Rescheduled events replace their previous row
+    store.upsert([make_event(2, 17, 30, 10, 500)])
+    assert [e.id for e in store.events_for_team(10)] == [2, 1]
+    assert store.count() == 3
+
+def test_adapter_feeds_index(monkeypatch, event_store):
+    """Test that fetched listings are indexed and answered by EventService."""
+    import httpx
+    from src.adapter import sofascore
+    from src.services.events import EventService
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+    
+    monkeypatch.setattr(cache_module, "cache", Cache(enabled=False))
+    start = int(datetime(2024, 3, 5, 18).timestamp())
+    payload = {"events": [
+        {**make_event(7, 17, 1, 2, start).model_dump(by_alias=True), "status": {"type": "notstarted"}},
+    ]}
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=payload))))
+    try:
+        sofascore.list_events_for_day(date(2024, 3, 5))
+    finally:
+        sofascore.close_client()
+    
+    assert [e.id for e in EventService.get_team_events(2, date(2024, 3, 1), date(2024, 3, 31))] == [7]
+    assert EventService.get_team_events(2, date(2024, 3, 6)) == []
+    assert [e.id for e in EventService.get_tournament_events(17)] == [7]
+    assert EventService.get_indexed_days(date(2024, 3, 1), date(2024, 3, 31)) == {date(2024, 3, 5)}
@@ -0,0 +1,62 @@
+import numpy as np
+from src.adapter.models import Event
+from src.adapter.table import EventTable, MISSING_ID
+
+def make_event(event_id, tournament, home, away, start):
+    return Event.model_validate({
+        "id": event_id,
+        "slug": f"{home}-{away}",
+        "tournament": tournament,
+        "homeTeam": {"id": home, "name": f"Team {home}"},
+        "awayTeam": {"id": away, "name": f"Team {away}"},
+        "startTimestamp": start,
+    })
+
+def test_event_table_group_filter_and_buckets():
+    """Test vectorized counting, grouping, filtering and time bucketing."""
+    league = {"id": 17, "name": "Premier League"}
+    cup = {"name": "Cup"}
+    events = [
+        make_event(1, league, 1, 2, 86400 * 10 + 100),
+        make_event(2, cup, 3, 1, 86400 * 10 + 200),
+        make_event(3, league, 2, 3, 86400 * 11),
+        make_event(4, league, 4, 1, 86400 * 12),
+    ]
+    table = EventTable.from_events(events)
+    
+    assert len(table) == 4
+    assert table.count_by_tournament() == [("Premier League", 3), ("Cup", 1)]
+    groups = table.group_by_tournament()
+    assert list(groups) == [(17, "Premier League"), (MISSING_ID, "Cup")]
+    assert table.ids[groups[17, "Premier League"]].tolist() == [1, 3, 4]
+    assert table.team_names(groups[MISSING_ID, "Cup"]) == [("Team 3", "Team 1")]
+    assert table.tournament_ids.tolist() == [17, MISSING_ID, 17, 17]
+    
+    team = table.filter(team_id=1)
+    assert team.ids.tolist() == [1, 2, 4]
+    assert team.filter(tournament_id=17, end=86400 * 12).ids.tolist() == [1]
+    
+    starts, counts = table.bucket_counts()
+    assert starts.tolist() == [86400 * 10, 86400 * 11, 86400 * 12]
+    assert counts.tolist() == [2, 1, 1]
+    
+    empty = EventTable.from_events([])
+    assert len(empty) == 0 and empty.count_by_tournament() == [] and empty.group_by_tournament() == {}
+    assert isinstance(empty.ids, np.ndarray)
+
+def test_tournaments_are_grouped_by_id():
+    """Test that tournaments sharing a name stay apart, and those without an id are told apart by name."""
+    events = [
+        make_event(1, {"id": 17, "name": "Premier League"}, 1, 2, 0),
+        make_event(2, {"id": 18, "name": "Premier League"}, 3, 4, 0),
+        make_event(3, {"name": "Friendly"}, 5, 6, 0),
+        make_event(4, {"name": "Cup"}, 7, 8, 0),
+        make_event(5, {"id": 18, "name": "Premier League"}, 9, 10, 0),
+    ]
+    table = EventTable.from_events(events)
+    assert table.count_by_tournament() == [
+        ("Premier League", 2), ("Premier League", 1), ("Friendly", 1), ("Cup", 1),
+    ]
+    groups = table.group_by_tournament()
+    assert list(groups) == [(17, "Premier League"), (18, "Premier League"), (MISSING_ID, "Friendly"), (MISSING_ID, "Cup")]
+    assert table.ids[groups[18, "Premier League"]].tolist() == [2, 5]
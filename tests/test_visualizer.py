@@ -0,0 +1,31 @@
+import json
+from datetime import date
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+def test_render_batch_writes_charts_and_manifest(tmp_path):
+    """Test that batch rendering saves every chart and records it in the manifest."""
+    from src.tools.visualizer import render_batch, select_statistics
+    
+    stats = select_statistics({"statistics": [{"period": "ALL", "groups": [{"groupName": "Match overview", "statisticsItems": [
+        {"name": "Ball possession", "key": "ballPossession", "home": "55%", "away": "45%"},
+        {"name": "Expected goals", "key": "expectedGoals", "home": "1.2", "away": "0.4"},
+        {"name": "Corner kicks", "key": "cornerKicks", "home": "5", "away": "-"},
+    ]}]}]})
+    assert stats == {"Ball possession": (55.0, 45.0)}
+    
+    manifest = render_batch(
+        {date(2024, 3, 1): [("Premier League", 10), ("LaLiga", 8)]},
+        {7: ("Arsenal", "Chelsea", stats)},
+        tmp_path,
+        workers=2,
+    )
+    
+    assert (manifest["charts"], manifest["failed"]) == (2, 0)
+    assert [(entry["type"], entry.get("day", entry.get("event_id"))) for entry in manifest["entries"]] == [
+        ("tournament", "2024-03-01"), ("stats", 7),
+    ]
+    assert all((tmp_path / entry["path"]).stat().st_size > 0 for entry in manifest["entries"])
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
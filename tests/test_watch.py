@@ -0,0 +1,77 @@
+from src.adapter.models import Event
+from src.services.watch import LiveWatcher, diff_snapshots, format_change
+
+def make_event(event_id, home_score, away_score, status="1st half", status_type="inprogress"):
+    return Event.model_validate({
+        "id": event_id,
+        "slug": "a-b",
+        "tournament": {"id": 17, "name": "Premier League"},
+        "homeTeam": {"id": 1, "name": "A"},
+        "awayTeam": {"id": 2, "name": "B"},
+        "startTimestamp": 1700000000,
+        "status": {"code": 6, "type": status_type, "description": status},
+        "homeScore": {"current": home_score, "period1": home_score},
+        "awayScore": {"current": away_score},
+    })
+
+def test_event_parses_status_and_scores():
+    """Test that live fields are read from the raw API shapes."""
+    event = make_event(1, 2, 0)
+    assert (event.home_score, event.away_score) == (2, 0)
+    assert event.status.type == "inprogress"
+
+def test_diff_reports_only_changes():
+    """Test new, score, status and finished changes between polls."""
+    polls = [
+        [make_event(1, 0, 0), make_event(2, 1, 1)],
+        [make_event(1, 1, 0), make_event(2, 1, 1, "Halftime"), make_event(3, 0, 0)],
+        [make_event(1, 1, 0, "Ended", "finished"), make_event(3, 0, 0)],
+        [make_event(3, 0, 0)],
+    ]
+    watcher = LiveWatcher(fetch=lambda sport: polls.pop(0))
+    
+    assert [(c.kind, c.event.id) for c in watcher.poll()] == [("new", 1), ("new", 2)]
+    changes = watcher.poll()
+    assert [(c.kind, c.event.id) for c in changes] == [("score", 1), ("status", 2), ("new", 3)]
+    assert changes[0].to_dict()["previous"] == {"home_score": 0, "away_score": 0, "status": "1st half"}
+    assert "(1st half -> Halftime)" in format_change(changes[1])
+    assert [(c.kind, c.event.id) for c in watcher.poll()] == [("finished", 1), ("finished", 2)]
+    assert watcher.poll() == []
+    
+    assert diff_snapshots({}, []) == []
+
+def test_finished_events_are_reported_once_and_failed_polls_skipped():
+    """Test that finished events left in the listing and failed polls produce no changes."""
+    from src.utils.cache import UpstreamUnavailable
+
+    def unavailable():
+        raise UpstreamUnavailable("down")
+
+    polls = [
+        lambda: [make_event(1, 0, 0), make_event(2, 3, 0, "Ended", "finished")],
+        lambda: [make_event(1, 1, 0, "Ended", "finished"), make_event(2, 3, 0, "Ended", "finished")],
+        unavailable,
+        lambda: [make_event(1, 1, 0, "Ended", "finished"), make_event(4, 0, 0)],
+        lambda: [make_event(4, 0, 0)],
+    ]
+    watcher = LiveWatcher(fetch=lambda sport: polls.pop(0)())
+    changes = [[(c.kind, c.event.id) for c in poll] for poll in watcher.watch(0, polls=5)]
+    assert changes == [[("new", 1), ("new", 2)], [("finished", 1)], [], [("new", 4)], []]
+
+def test_finished_ids_are_forgotten_once_out_of_the_listing():
+    """Test that the finished set only keeps events still in the live listing."""
+    polls = [
+        [make_event(1, 0, 0), make_event(2, 1, 0, "Ended", "finished")],
+        [make_event(1, 2, 0, "Ended", "finished"), make_event(2, 1, 0, "Ended", "finished")],
+        [make_event(1, 2, 0, "Ended", "finished")],
+        [],
+    ]
+    watcher = LiveWatcher(fetch=lambda sport: polls.pop(0))
+    watcher.poll()
+    assert watcher.finished == {2}
+    watcher.poll()
+    assert watcher.finished == {1, 2}
+    assert watcher.poll() == []
+    assert watcher.finished == {1}
+    assert watcher.poll() == []
+    assert watcher.finished == set()
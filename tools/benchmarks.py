@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+SofaScore micro-benchmarks.
+Measure hot paths of the adapter on synthetic data, without network access.
+"""
+import gc
+import os
+import sys
+import time
+import argparse
+import json
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Ensure project root is on sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.adapter.compact import InternPool
+from src.adapter.models import Event, Team
+from src.adapter.parsers import parse_events
+from src.adapter.table import EventTable
+
+def make_raw_events(count: int, day: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build a listing of raw API event items shaped like a busy football day.
+    Each day pairs the same pool of ``2 * count`` teams differently.
+
+    Args:
+        count: Number of events
+        day: Day offset, for multi-day datasets
+
+    Returns:
+        List of raw event dictionaries
+    """
+    events = []
+    teams = 2 * count
+    for i in range(count):
+        tournament_id = i % 150
+        home, away = (2 * i + 37 * day) % teams, (2 * i + 1 + 37 * day) % teams
+        events.append({
+            "id": 10_000_000 + day * count + i,
+            "slug": f"team-{home}-team-{away}",
+            "customId": f"x{i}",
+            "tournament": {
+                "id": tournament_id,
+                "name": f"Tournament {tournament_id}",
+                "slug": f"tournament-{tournament_id}",
+                "category": {"id": tournament_id % 40, "name": f"Country {tournament_id % 40}"},
+            },
+            "homeTeam": {"id": home, "name": f"Team {home}", "slug": f"team-{home}", "shortName": f"T{home}"},
+            "awayTeam": {"id": away, "name": f"Team {away}", "slug": f"team-{away}"},
+            "homeScore": {"current": i % 4, "period1": i % 2},
+            "awayScore": {"current": i % 3, "period1": 0},
+            "status": {"code": 100, "type": "finished", "description": "Ended"},
+            "startTimestamp": 1_700_000_000 + 86_400 * day + 60 * i,
+        })
+    return events
+
+def _parse_per_item(items: List[Dict[str, Any]]) -> List[Event]:
+    """The previous parser: three model_validate calls per event."""
+    events = []
+    for item in items:
+        home_team = Team.model_validate(item.get("homeTeam", {}))
+        away_team = Team.model_validate(item.get("awayTeam", {}))
+        events.append(Event.model_validate({
+            "id": item.get("id"),
+            "slug": item.get("slug"),
+            "tournament": item.get("tournament"),
+            "home_team": home_team,
+            "away_team": away_team,
+            "start_timestamp": item.get("startTimestamp"),
+            "status": item.get("status"),
+            "home_score": item.get("homeScore"),
+            "away_score": item.get("awayScore"),
+        }))
+    return events
+
+def _best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def bench_parse(args) -> None:
+    """Compare per-item, batch and trusted event parsing."""
+    raw = make_raw_events(args.events)
+    dumped = [event.model_dump() for event in parse_events(raw)]
+    assert _parse_per_item(raw) == parse_events(raw) == parse_events(dumped, trusted=True)
+
+    cases = [
+        ("per-item validate", lambda: _parse_per_item(raw)),
+        ("batch TypeAdapter", lambda: parse_events(raw)),
+        ("trusted construct", lambda: parse_events(dumped, trusted=True)),
+    ]
+    print(f"Parsing {args.events} events (best of {args.repeat})\n")
+    print(f"{'Parser':<20} {'Time':>10} {'Events/sec':>12}")
+    for name, func in cases:
+        seconds = _best_time(func, args.repeat)
+        print(f"{name:<20} {seconds * 1000:>8.1f}ms {args.events / seconds:>12,.0f}")
+
+def _retained_bytes(build: Callable[[], Any]) -> int:
+    """Return the memory still allocated by the result of ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+def bench_memory(args) -> None:
+    """Compare the retained size of a multi-week load per representation."""
+    def load(convert: Callable[[InternPool, List[Event]], Any]) -> List[Any]:
+        pool = InternPool()
+        return [convert(pool, parse_events(make_raw_events(args.events, day))) for day in range(args.days)]
+
+    cases = [
+        ("Event models", lambda pool, events: events),
+        ("interned Event", lambda pool, events: [pool.intern_event(event) for event in events]),
+        ("CompactEvent", lambda pool, events: pool.compact_events(events)),
+    ]
+    print(f"Retained memory for {args.days} days x {args.events} events\n")
+    print(f"{'Representation':<16} {'Total':>10} {'Per event':>10} {'Saved':>7}")
+    baseline = None
+    for name, convert in cases:
+        retained = _retained_bytes(lambda: load(convert))
+        baseline = baseline or retained
+        print(f"{name:<16} {retained / 2 ** 20:>8.1f}MB {retained / (args.days * args.events):>9.0f}B "
+              f"{(1 - retained / baseline) * 100:>6.0f}%")
+
+def _count_with_dict(events: List[Any]) -> List[Any]:
+    """The previous grouping: a dict loop over event objects."""
+    tournaments: Dict[str, int] = {}
+    for event in events:
+        name = event.tournament.get('name', 'Unknown')
+        tournaments[name] = tournaments.get(name, 0) + 1
+    return sorted(tournaments.items(), key=lambda x: x[1], reverse=True)
+
+def bench_table(args) -> None:
+    """Compare per-tournament counting over a season with and without EventTable."""
+    pool = InternPool()
+    events = [
+        event
+        for day in range(args.days)
+        for event in pool.compact_events(parse_events(make_raw_events(args.events, day)))
+    ]
+    table = EventTable.from_events(events)
+    assert dict(table.count_by_tournament()) == dict(_count_with_dict(events))
+
+    week = 7 * 86400
+    team_id = events[0].home_team.id
+    cases = [
+        ("dict loop count", lambda: _count_with_dict(events)),
+        ("build EventTable", lambda: EventTable.from_events(events)),
+        ("table count", table.count_by_tournament),
+        ("table group", table.group_by_tournament),
+        ("table weekly buckets", lambda: table.bucket_counts(week)),
+        ("table team filter", lambda: table.filter(team_id=team_id)),
+    ]
+    print(f"Season of {len(events)} events (best of {args.repeat})\n")
+    print(f"{'Operation':<22} {'Time':>10}")
+    for name, func in cases:
+        print(f"{name:<22} {_best_time(func, args.repeat) * 1000:>8.2f}ms")
+
+def _peak_bytes(run: Callable[[], Any]) -> int:
+    """Return the peak memory allocated while ``run`` executes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_stream(args) -> None:
+    """Compare peak memory of list vs streamed day listings over a mocked HTTP client."""
+    import httpx
+    from src.adapter import sofascore
+    from src.utils import cache as cache_module
+
+    body = json.dumps({"events": make_raw_events(args.events)}).encode()
+    from src.core.config import config
+
+    # Measure parsing alone, without cache or index writes
+    cache_module.cache.enabled = False
+    config.INDEX_ENABLED = False
+    chunk = 64 * 1024
+
+    def handler(request):
+        # Deliver the body in network-sized chunks, like a real response
+        return httpx.Response(200, content=(body[i:i + chunk] for i in range(0, len(body), chunk)))
+
+    sofascore.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    day = date(2024, 1, 1)
+
+    def consume_list() -> None:
+        for event in sofascore.list_events_for_day(day):
+            pass
+
+    def consume_stream() -> None:
+        for event in sofascore.iter_events_for_day(day, use_cache=False):
+            pass
+
+    def consume_cached_stream() -> None:
+        # The default path: every run misses and writes the streamed listing
+        stream_cache.clear()
+        for event in sofascore.iter_events_for_day(day):
+            pass
+
+    cases = [
+        ("list_events_for_day", consume_list),
+        ("iter_events_for_day", consume_stream),
+        ("iter_events (cached)", consume_cached_stream),
+    ]
+    tmp = tempfile.TemporaryDirectory()
+    stream_cache = cache_module.Cache(cache_dir=tmp.name)
+    sofascore.cache = stream_cache
+    try:
+        print(f"Peak memory for a {args.events}-event day ({len(body) / 2 ** 20:.1f}MB body)\n")
+        print(f"{'Function':<22} {'Peak':>10} {'Time':>10}")
+        for name, run in cases:
+            peak = _peak_bytes(run)
+            seconds = _best_time(run, args.repeat)
+            print(f"{name:<22} {peak / 2 ** 20:>8.1f}MB {seconds * 1000:>8.1f}ms")
+    finally:
+        sofascore.close_client()
+        tmp.cleanup()
+
+def _import_times(stderr: str) -> Dict[str, int]:
+    """Parse ``-X importtime`` output into cumulative microseconds per top-level import."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Nested imports are indented below the import that triggered them
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+def bench_startup(args) -> None:
+    """Time CLI startup for --help and a cached "today" against their targets."""
+    from src.adapter.sofascore import EVENTS_DAY_MAX_AGE
+    from src.core.config import config
+    from src.utils.cache import Cache, make_cache_key
+
+    # The CLI runs as "python -m src" from the directory holding the package
+    root = Path(__file__).absolute().parents[2]
+    cases = [
+        ("--help", ["--help"], args.help_target),
+        ("today (cached)", ["today"], args.today_target),
+    ]
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SOFASCORE_CACHE_DIR=tmp, SOFASCORE_INDEX_PATH=str(Path(tmp) / "events.sqlite3"))
+        key = make_cache_key("list_events_for_day", date.today(), config.DEFAULT_SPORT)
+        Cache(cache_dir=tmp).set(key, parse_events(make_raw_events(args.events)), EVENTS_DAY_MAX_AGE)
+
+        def run(argv: List[str], *options: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                [sys.executable, *options, "-m", "src", *argv],
+                cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+            )
+
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter = time.perf_counter() - started
+        print(f"CLI startup (best of {args.repeat}; bare interpreter {interpreter * 1000:.0f}ms)\n")
+        print(f"{'Command':<16} {'Wall':>8} {'Imports':>9} {'Target':>8}  Slowest imports")
+        for name, argv, target in cases:
+            wall = _best_time(lambda: run(argv), args.repeat)
+            imports = _import_times(run(argv, "-X", "importtime").stderr)
+            slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:3]
+            ok = wall * 1000 <= target
+            failed = failed or not ok
+            print(f"{name:<16} {wall * 1000:>6.0f}ms {sum(imports.values()) / 1000:>7.0f}ms {target:>6.0f}ms"
+                  f"  {'ok  ' if ok else 'SLOW'} {', '.join(f'{module} {us / 1000:.0f}ms' for module, us in slowest)}")
+    if failed:
+        sys.exit(1)
+
+def bench_replay(args) -> None:
+    """Time day listings and their statistics end to end against the replay server, cold and cached."""
+    from collections import Counter
+    from src.adapter import async_client, sofascore
+    from src.core.config import config
+    from src.tools.replay import ReplayServer
+    from src.utils import cache as cache_module
+    from src.utils.cache import Cache
+
+    config.INDEX_ENABLED = False
+    server = ReplayServer(
+        args.fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    days = sorted(date.fromisoformat(path.rsplit("/", 1)[1]) for path in server.fixtures if "/events/date/" in path)
+
+    def run() -> None:
+        events = [event for day in days for event in sofascore.list_events_for_day(day)]
+        async_client.fetch_events_stats_bulk(event.id for event in events)
+
+    with tempfile.TemporaryDirectory() as tmp, server:
+        replay_cache = Cache(cache_dir=tmp, enabled=True)
+        for module in (cache_module, sofascore, async_client):
+            module.cache = replay_cache
+        sofascore.API_BASE = async_client.API_BASE = server.url
+        print(f"Replaying {len(days)} days from {args.fixtures} (latency {args.latency * 1000:.0f}ms "
+              f"+/- {args.jitter * 1000:.0f}ms, errors {args.error_rate:.0%}, 429s {args.throttle_rate:.0%})\n")
+        print(f"{'Run':<8} {'Time':>10} {'Requests':>9}  Statuses")
+        try:
+            for name in ("cold", "cached"):
+                served = len(server.requests)
+                started = time.perf_counter()
+                run()
+                seconds = time.perf_counter() - started
+                statuses = Counter(status for _, status in server.requests[served:])
+                print(f"{name:<8} {seconds * 1000:>8.1f}ms {len(server.requests) - served:>9}  "
+                      f"{', '.join(f'{status}: {count}' for status, count in sorted(statuses.items())) or '-'}")
+        finally:
+            sofascore.close_client()
+
+def main():
+    parser = argparse.ArgumentParser(description="SofaScore micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="command", help="Benchmark to run")
+
+    parse_parser = subparsers.add_parser("parse", help="Event listing parsing throughput")
+    parse_parser.add_argument("--events", type=int, default=5000, help="Number of events in the listing")
+    parse_parser.add_argument("--repeat", type=int, default=5, help="Number of runs; the fastest is reported")
+    parse_parser.set_defaults(func=bench_parse)
+
+    memory_parser = subparsers.add_parser("memory", help="Memory retained by a multi-week event load")
+    memory_parser.add_argument("--days", type=int, default=28, help="Number of days loaded")
+    memory_parser.add_argument("--events", type=int, default=1500, help="Number of events per day")
+    memory_parser.set_defaults(func=bench_memory)
+
+    table_parser = subparsers.add_parser("table", help="Columnar analytics over a season of events")
+    table_parser.add_argument("--days", type=int, default=300, help="Number of days in the season")
+    table_parser.add_argument("--events", type=int, default=500, help="Number of events per day")
+    table_parser.add_argument("--repeat", type=int, default=5, help="Number of runs; the fastest is reported")
+    table_parser.set_defaults(func=bench_table)
+
+    stream_parser = subparsers.add_parser("stream", help="Peak memory of streamed vs list day listings")
+    stream_parser.add_argument("--events", type=int, default=20000, help="Number of events in the day")
+    stream_parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs; the fastest is reported")
+    stream_parser.set_defaults(func=bench_stream)
+
+    startup_parser = subparsers.add_parser("startup", help="CLI startup time, via -X importtime")
+    startup_parser.add_argument("--events", type=int, default=300, help="Number of events in the cached day")
+    startup_parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs; the fastest is reported")
+    startup_parser.add_argument("--help-target", type=float, default=100, help="Target for --help in milliseconds")
+    startup_parser.add_argument("--today-target", type=float, default=400, help="Target for a cached today in milliseconds")
+    startup_parser.set_defaults(func=bench_startup)
+
+    replay_parser = subparsers.add_parser("replay", help="End-to-end fetches against recorded fixtures")
+    replay_parser.add_argument("--fixtures", type=Path, default=Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "api",
+                               help="Fixture directory recorded with tools/replay.py")
+    replay_parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    replay_parser.add_argument("--jitter", type=float, default=0.02, help="Maximum deviation from --latency in seconds")
+    replay_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500")
+    replay_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    replay_parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After of injected 429s in seconds")
+    replay_parser.add_argument("--seed", type=int, default=0, help="Seed for reproducible faults and jitter")
+    replay_parser.set_defaults(func=bench_replay)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
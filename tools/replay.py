@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Record and replay SofaScore API responses.
+
+``record`` captures real responses of the adapter's endpoints into fixture
+files, one JSON file per API path. ``serve`` replays them from a local
+HTTP server with configurable latency, jitter, errors and 429s; point
+SOFASCORE_API_BASE at it to run the adapter, cache and CLI offline.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Ensure project root is on sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.core.logging import get_logger
+
+# Setup logger
+logger = get_logger("replay")
+
+# Response headers kept in fixtures; the rest vary between requests
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+# Path prefix of the upstream API, kept by the replay server so that only the host changes
+API_PATH = "/api/v1"
+
+class Fixture(NamedTuple):
+    """A recorded response to one API path."""
+    path: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+def fixture_file(fixtures_dir: Path, path: str) -> Path:
+    """
+    Get the file a path's fixture is stored in.
+
+    Args:
+        fixtures_dir: Fixture directory
+        path: API path, e.g. "/event/123/statistics"
+
+    Returns:
+        Path such as ``fixtures_dir / "event__123__statistics.json"``
+    """
+    return Path(fixtures_dir) / (path.strip("/").replace("/", "__") + ".json")
+
+def save_fixture(fixtures_dir: Path, fixture: Fixture) -> Path:
+    """
+    Write a fixture; JSON bodies are stored parsed, so fixtures diff and edit well.
+
+    Returns:
+        Path of the written file
+    """
+    try:
+        body = json.loads(fixture.body)
+    except ValueError:
+        body = fixture.body.decode("utf-8", "replace")
+    target = fixture_file(fixtures_dir, fixture.path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump({"path": fixture.path, "status": fixture.status, "headers": fixture.headers, "body": body}, f, indent=1)
+        f.write("\n")
+    return target
+
+def load_fixtures(fixtures_dir: Path) -> Dict[str, Fixture]:
+    """
+    Load every fixture of a directory.
+
+    Args:
+        fixtures_dir: Fixture directory
+
+    Returns:
+        Dictionary mapping API path to Fixture
+    """
+    fixtures = {}
+    for file in sorted(Path(fixtures_dir).glob("*.json")):
+        with open(file, encoding="utf-8") as f:
+            data = json.load(f)
+        body = data["body"]
+        raw = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        fixtures[data["path"]] = Fixture(data["path"], data.get("status", 200), data.get("headers", {}), raw)
+    return fixtures
+
+def record(paths: Iterable[str], fixtures_dir: Path) -> List[Fixture]:
+    """
+    Fetch API paths from the upstream and store their responses as fixtures.
+    Error responses (e.g. 404) are recorded too, so they replay faithfully.
+
+    Args:
+        paths: API paths to record
+        fixtures_dir: Directory to write the fixtures to
+
+    Returns:
+        The recorded fixtures
+    """
+    from src.adapter.sofascore import API_BASE, get_client
+
+    recorded = []
+    for path in dict.fromkeys(paths):
+        response = get_client().get(f"{API_BASE}{path}")
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        fixture = Fixture(path, response.status_code, headers, response.content)
+        logger.info(f"Recorded {path} ({response.status_code}) to {save_fixture(fixtures_dir, fixture)}")
+        recorded.append(fixture)
+    return recorded
+
+class ReplayServer:
+    """
+    Local stand-in for the SofaScore API serving recorded fixtures.
+
+    Runs a threaded stdlib HTTP server in a background thread. Each request
+    is delayed by ``latency`` plus up to ``jitter`` seconds either way, then
+    fails with ``error_status`` at ``error_rate`` or with a 429 carrying
+    ``Retry-After`` at ``throttle_rate``. Conditional requests matching a
+    fixture's ETag get a 304; unknown paths get a 404.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            fixtures_dir: Directory of recorded fixtures
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+            latency: Seconds added to every response
+            jitter: Maximum random deviation from ``latency``, in seconds
+            error_rate: Share of requests failing with ``error_status``
+            error_status: Status of injected errors
+            throttle_rate: Share of requests answered with 429
+            retry_after: Retry-After of injected 429s, in seconds
+            seed: Seed of the fault and jitter draws, for reproducible runs
+        """
+        self.fixtures = load_fixtures(fixtures_dir)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # (path, status) of every request served
+        self.requests: List[Tuple[str, int]] = []
+
+    @property
+    def url(self) -> str:
+        """API base URL to use as SOFASCORE_API_BASE."""
+        return f"http://{self.host}:{self.port}{API_PATH}"
+
+    def respond(self, path: str, if_none_match: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Build the response to a request, applying latency and injected faults.
+
+        Args:
+            path: Request path, with or without the API prefix
+            if_none_match: If-None-Match request header
+
+        Returns:
+            Tuple of (status, headers, body)
+        """
+        if path.startswith(API_PATH):
+            path = path[len(API_PATH):]
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter)) if self.jitter else self.latency
+            draw = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+
+        fixture = self.fixtures.get(path)
+        if draw < self.throttle_rate:
+            status, headers, body = 429, {"Retry-After": f"{self.retry_after:g}"}, b'{"error": {"code": 429}}'
+        elif draw < self.throttle_rate + self.error_rate:
+            status, headers, body = self.error_status, {}, b'{"error": {"code": %d}}' % self.error_status
+        elif fixture is None:
+            status, headers, body = 404, {}, b'{"error": {"code": 404, "message": "Not Found"}}'
+        elif if_none_match and fixture.headers.get("ETag") == if_none_match:
+            status, headers, body = 304, {"ETag": fixture.headers["ETag"]}, b""
+        else:
+            status, headers, body = fixture.status, dict(fixture.headers), fixture.body
+        headers.setdefault("Content-Type", "application/json")
+        with self._lock:
+            self.requests.append((path, status))
+        return status, headers, body
+
+    def start(self) -> "ReplayServer":
+        """Start serving in a background thread; ``port`` is set to the bound port."""
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, headers, body = replay.respond(self.path.split("?", 1)[0], self.headers.get("If-None-Match"))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Replaying {len(self.fixtures)} fixtures at {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+def cmd_record(args) -> None:
+    """Record the listings, events and statistics given on the command line."""
+    from src.adapter.sofascore import _events_day_path, _live_events_path, close_client
+    from src.core.config import config
+
+    sport = args.sport or config.DEFAULT_SPORT
+    paths = [_events_day_path(date.fromisoformat(day), sport) for day in args.day]
+    if args.live:
+        paths.append(_live_events_path(sport))
+    try:
+        listings = record(paths, args.output)
+        event_ids = list(args.event)
+        if args.with_stats:
+            # Events of the recorded listings, up to --limit
+            for fixture in listings:
+                if fixture.status == 200:
+                    event_ids.extend(event["id"] for event in json.loads(fixture.body).get("events", []))
+            event_ids = list(dict.fromkeys(event_ids))[:max(args.limit, len(args.event))]
+        paths = [f"/event/{event_id}" for event_id in args.event]
+        paths += [f"/event/{event_id}/statistics" for event_id in event_ids]
+        recorded = listings + record(paths, args.output)
+    finally:
+        close_client()
+    print(f"Recorded {len(recorded)} responses to {args.output}")
+
+def cmd_serve(args) -> None:
+    """Serve fixtures until interrupted."""
+    server = ReplayServer(
+        args.fixtures,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    with server:
+        print(f"Serving {len(server.fixtures)} fixtures; use SOFASCORE_API_BASE={server.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay SofaScore API responses")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    record_parser = subparsers.add_parser("record", help="Record upstream responses into fixture files")
+    record_parser.add_argument("--output", type=Path, required=True, help="Fixture directory")
+    record_parser.add_argument("--day", action="append", default=[], help="Day listing to record (YYYY-MM-DD); repeatable")
+    record_parser.add_argument("--live", action="store_true", help="Record the live events listing")
+    record_parser.add_argument("--event", type=int, action="append", default=[], help="Event (and its statistics) to record; repeatable")
+    record_parser.add_argument("--with-stats", action="store_true", help="Also record statistics of events in the recorded listings")
+    record_parser.add_argument("--limit", type=int, default=20, help="Maximum number of events to record statistics for")
+    record_parser.add_argument("--sport", help="Sport of the listings (default from config)")
+    record_parser.set_defaults(func=cmd_record)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve fixtures as a stand-in for the API")
+    serve_parser.add_argument("fixtures", type=Path, help="Fixture directory")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve_parser.add_argument("--jitter", type=float, default=0.0, help="Maximum deviation from --latency in seconds")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with --error-status")
+    serve_parser.add_argument("--error-status", type=int, default=500, help="Status of injected errors")
+    serve_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    serve_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of injected 429s in seconds")
+    serve_parser.add_argument("--seed", type=int, help="Seed for reproducible faults and jitter")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
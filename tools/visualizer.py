@@ -2,180 +2,376 @@
 """
 SofaScore Data Visualizer.
 Visualize sports data from SofaScore API.
+
+Charts are drawn on Figures with an explicit Agg canvas, so rendering is
+headless whatever the default matplotlib backend is. Batch mode fetches all
+data up front and renders the charts in a process pool.
 """
 import sys
 import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import date, datetime, timedelta
-import matplotlib.pyplot as plt
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # Ensure project root is on sys.path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from src.adapter.async_client import fetch_events_bulk, fetch_events_stats_bulk
+from src.adapter.sofascore import fetch_event
+from src.adapter.table import EventTable
 from src.services.events import EventService
-from src.services.stats import StatsService
+from src.services.stats import ALL_PERIODS, StatsService, normalize_statistics
+
+# Stat keys shown by visualize_event_statistics; upstream keys total shots
+# as "totalShotsOnGoal", older payloads only have the "Total shots" name
+VISUALIZED_STATS = {
+    "ballPossession", "totalShotsOnGoal", "totalShots", "shotsOnGoal",
+    "cornerKicks", "fouls", "yellowCards",
+}
+
+# Figure reused by every chart a batch worker renders
+_figure: Optional[Figure] = None
+
+def _get_figure(width: float, height: float, reuse: bool) -> Figure:
+    global _figure
+    if not reuse:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+    else:
+        if _figure is None:
+            _figure = Figure()
+            FigureCanvasAgg(_figure)
+        figure = _figure
+        figure.clear()
+    figure.set_size_inches(width, height)
+    return figure
+
+def _top_tournaments(counts: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """Keep the 9 largest tournaments and group the rest as "Others"."""
+    if len(counts) <= 10:
+        return counts
+    return counts[:9] + [('Others', sum(count for _, count in counts[9:]))]
+
+def select_statistics(stats_data: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    """
+    Pick the whole-match statistics to chart from a statistics payload.
+
+    Args:
+        stats_data: Raw statistics payload
+
+    Returns:
+        Dictionary mapping stat name to (home, away) values
+    """
+    selected = {}
+    for record in normalize_statistics(stats_data):
+        if record.period != ALL_PERIODS or record.key not in VISUALIZED_STATS:
+            continue
+        # Skip values that are not numeric
+        if not (np.isnan(record.home) or np.isnan(record.away)):
+            selected[record.name] = (record.home, record.away)
+    return selected
+
+def render_tournament_chart(counts: List[Tuple[str, int]], label: str, output_path: str, reuse: bool = False) -> str:
+    """
+    Draw a pie chart of events per tournament and save it.
+
+    Args:
+        counts: (tournament, event count) pairs, largest first
+        label: Day or range shown in the title
+        output_path: PNG file to write
+        reuse: Draw on the process's shared figure instead of a new one
 
-def visualize_events_by_tournament(day: date = None):
-    """Create a pie chart of events by tournament for a specific day."""
+    Returns:
+        The output path
+    """
+    sorted_tournaments = _top_tournaments(counts)
+    labels = [t[0] for t in sorted_tournaments]
+    sizes = [t[1] for t in sorted_tournaments]
+
+    figure = _get_figure(10, 7, reuse)
+    ax = figure.add_subplot()
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.set_title(f'Events by Tournament - {label}')
+    figure.savefig(output_path)
+    return output_path
+
+def render_stats_chart(
+    stats: Dict[str, Tuple[float, float]], home_team: str, away_team: str, output_path: str, reuse: bool = False
+) -> str:
+    """
+    Draw a grouped bar chart of home and away statistics and save it.
+
+    Args:
+        stats: Stat name -> (home, away) values
+        home_team: Home team name
+        away_team: Away team name
+        output_path: PNG file to write
+        reuse: Draw on the process's shared figure instead of a new one
+
+    Returns:
+        The output path
+    """
+    labels = list(stats.keys())
+    home_values = [stats[label][0] for label in labels]
+    away_values = [stats[label][1] for label in labels]
+
+    x = np.arange(len(labels))  # the label locations
+    width = 0.35  # the width of the bars
+
+    figure = _get_figure(12, 8, reuse)
+    ax = figure.add_subplot()
+    rects1 = ax.bar(x - width/2, home_values, width, label=home_team)
+    rects2 = ax.bar(x + width/2, away_values, width, label=away_team)
+
+    # Add some text for labels, title and custom x-axis tick labels, etc.
+    ax.set_ylabel('Values')
+    ax.set_title(f'Match Statistics: {home_team} vs {away_team}')
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels)
+    ax.legend()
+
+    # Attach a text label above each bar
+    for rects in (rects1, rects2):
+        ax.bar_label(rects, padding=3)
+
+    figure.tight_layout()
+    figure.savefig(output_path)
+    return output_path
+
+def visualize_events_by_tournament(day: date = None, end: date = None):
+    """Create a pie chart of events by tournament for a day or a range of days."""
     if day is None:
         day = date.today()
-    
-    events = EventService.get_events_for_day(day)
-    
+
+    if end is not None and end > day:
+        events_by_day = EventService.get_events_for_range(day, end)
+        events = [event for day_events in events_by_day.values() for event in day_events]
+        label = f"{day.isoformat()}_{end.isoformat()}"
+    else:
+        events = EventService.get_events_for_day(day)
+        label = day.isoformat()
+
     if not events:
-        print(f"No events found for {day.isoformat()}.")
+        print(f"No events found for {label}.")
         return
-    
-    # Group events by tournament
-    tournaments = {}
-    for event in events:
-        tournament_name = event.tournament.get('name', 'Unknown')
-        tournaments[tournament_name] = tournaments.get(tournament_name, 0) + 1
-    
-    # Sort by event count
-    sorted_tournaments = sorted(tournaments.items(), key=lambda x: x[1], reverse=True)
-    
-    # Take top 10 tournaments and group the rest
-    if len(sorted_tournaments) > 10:
-        top_tournaments = sorted_tournaments[:9]
-        others_count = sum(count for _, count in sorted_tournaments[9:])
-        top_tournaments.append(('Others', others_count))
-        sorted_tournaments = top_tournaments
-    
-    # Prepare data for visualization
-    labels = [t[0] for t in sorted_tournaments]
-    sizes = [t[1] for t in sorted_tournaments]
-    
-    # Create pie chart
-    plt.figure(figsize=(10, 7))
-    plt.pie(sizes, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
-    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-    plt.title(f'Events by Tournament - {day.isoformat()}')
-    
+
     # Save the chart
     output_dir = Path('output')
     output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / f'events_by_tournament_{day.isoformat()}.png'
-    plt.savefig(output_path)
-    
+    output_path = output_dir / f'events_by_tournament_{label}.png'
+    render_tournament_chart(EventTable.from_events(events).count_by_tournament(), label, str(output_path))
+
     print(f"Chart saved to {output_path}")
-    plt.close()
 
 def visualize_event_statistics(event_id: int):
     """Create a bar chart for selected statistics of an event."""
     stats_data = StatsService.get_event_statistics(event_id)
-    
+
     if not stats_data or 'statistics' not in stats_data:
         print("No statistics available for this event.")
         return
-    
+
     # Find the event data to get team names
     try:
-        event_data = fetch_event(event_id)
-        if event_data and 'event' in event_data:
-            event = event_data['event']
-            home_team = event.get('homeTeam', {}).get('name', 'Home')
-            away_team = event.get('awayTeam', {}).get('name', 'Away')
-        else:
-            home_team, away_team = 'Home', 'Away'
-    except:
+        home_team, away_team = _team_names(fetch_event(event_id))
+    except Exception:
         home_team, away_team = 'Home', 'Away'
-    
+
     # Find the statistics we want to visualize (e.g., shots, possession, etc.)
-    stats_to_visualize = {}
-    
-    for group in stats_data['statistics']:
-        for stat_group in group.get('groups', []):
-            for stat_item in stat_group.get('statisticsItems', []):
-                stat_name = stat_item.get('name')
-                
-                # Filter for numeric statistics that we can visualize
-                if stat_name in ['Ball Possession', 'Total Shots', 'Shots on Goal', 
-                               'Corner Kicks', 'Fouls', 'Yellow Cards']:
-                    home_value = stat_item.get('home', '0')
-                    away_value = stat_item.get('away', '0')
-                    
-                    # Clean up percentage signs and convert to float
-                    if isinstance(home_value, str) and '%' in home_value:
-                        home_value = float(home_value.strip('%'))
-                    if isinstance(away_value, str) and '%' in away_value:
-                        away_value = float(away_value.strip('%'))
-                    
-                    try:
-                        stats_to_visualize[stat_name] = {
-                            'home': float(home_value),
-                            'away': float(away_value)
-                        }
-                    except (ValueError, TypeError):
-                        pass  # Skip if conversion fails
-    
+    stats_to_visualize = select_statistics(stats_data)
+
     if not stats_to_visualize:
         print("No suitable statistics found for visualization.")
         return
-    
-    # Prepare data for the bar chart
-    labels = list(stats_to_visualize.keys())
-    home_values = [stats_to_visualize[label]['home'] for label in labels]
-    away_values = [stats_to_visualize[label]['away'] for label in labels]
-    
-    x = np.arange(len(labels))  # the label locations
-    width = 0.35  # the width of the bars
-    
-    fig, ax = plt.subplots(figsize=(12, 8))
-    rects1 = ax.bar(x - width/2, home_values, width, label=home_team)
-    rects2 = ax.bar(x + width/2, away_values, width, label=away_team)
-    
-    # Add some text for labels, title and custom x-axis tick labels, etc.
-    ax.set_ylabel('Values')
-    ax.set_title(f'Match Statistics: {home_team} vs {away_team}')
-    ax.set_xticks(x)
-    ax.set_xticklabels(labels)
-    ax.legend()
-    
-    # Attach a text label above each bar
-    def autolabel(rects):
-        for rect in rects:
-            height = rect.get_height()
-            ax.annotate(f'{height}',
-                        xy=(rect.get_x() + rect.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom')
-    
-    autolabel(rects1)
-    autolabel(rects2)
-    
-    fig.tight_layout()
-    
+
     # Save the chart
     output_dir = Path('output')
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / f'event_stats_{event_id}.png'
-    plt.savefig(output_path)
-    
+    render_stats_chart(stats_to_visualize, home_team, away_team, str(output_path))
+
     print(f"Chart saved to {output_path}")
-    plt.close()
 
-if __name__ == "__main__":
-    # Example usage
-    if len(sys.argv) > 1:
-        if sys.argv[1] == 'tournament':
+def _team_names(event_data: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    event = (event_data or {}).get('event', {})
+    return event.get('homeTeam', {}).get('name', 'Home'), event.get('awayTeam', {}).get('name', 'Away')
+
+def _render_task(task: Tuple[str, str, tuple]) -> Dict[str, Any]:
+    """Render one batch chart in a pool worker; failures are reported, not raised."""
+    kind, path, args = task
+    entry: Dict[str, Any] = {"type": kind, "path": path}
+    try:
+        if kind == "tournament":
+            render_tournament_chart(*args, path, reuse=True)
+        else:
+            render_stats_chart(*args, path, reuse=True)
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+def render_batch(
+    day_counts: Dict[date, List[Tuple[str, int]]],
+    event_stats: Dict[int, Tuple[str, str, Dict[str, Tuple[float, float]]]],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Render daily tournament charts and event statistics charts in a process pool.
+
+    All data is prepared by the caller; workers only draw and save. Each
+    worker reuses one figure for all the charts it renders.
+
+    Args:
+        day_counts: Day -> (tournament, event count) pairs, largest first
+        event_stats: Event id -> (home team, away team, stat name -> (home, away))
+        output_dir: Directory for the charts and ``manifest.json``
+        workers: Number of processes (default: CPU count)
+
+    Returns:
+        The manifest written to ``output_dir / "manifest.json"``
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = []
+    keys = []
+    for day, counts in day_counts.items():
+        tasks.append(("tournament", str(output_dir / f'events_by_tournament_{day.isoformat()}.png'), (counts, day.isoformat())))
+        keys.append(("day", day.isoformat()))
+    for event_id, (home_team, away_team, stats) in event_stats.items():
+        tasks.append(("stats", str(output_dir / f'event_stats_{event_id}.png'), (stats, home_team, away_team)))
+        keys.append(("event_id", event_id))
+
+    started = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Chunks keep the per-chart inter-process overhead low
+        entries = list(executor.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    elapsed = time.perf_counter() - started
+
+    for entry, (key, value) in zip(entries, keys):
+        # Paths are relative to the manifest
+        entry["path"] = Path(entry["path"]).name
+        entry[key] = value
+    rendered = sum("error" not in entry for entry in entries)
+    manifest = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "charts": rendered,
+        "failed": len(entries) - rendered,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "charts_per_second": round(rendered / elapsed, 2) if elapsed else None,
+        "entries": entries,
+    }
+    with open(output_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def _read_ids(path: str) -> List[int]:
+    """Read event ids, one per line; blank lines and # comments are ignored."""
+    with open(path) as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [int(line) for line in lines if line]
+
+def batch_statistics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    event_ids: Sequence[int] = (),
+    output_dir: Path = Path('output'),
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch everything up front, then render all charts of a date range and/or event list.
+
+    For a date range, one tournament chart is drawn per day and one statistics
+    chart per event that has started. Listings and statistics are fetched in
+    bulk, concurrently and through the cache.
+
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive, default: start)
+        event_ids: Further events to chart
+        output_dir: Directory for the charts and manifest
+        workers: Number of render processes (default: CPU count)
+
+    Returns:
+        The manifest
+    """
+    day_counts: Dict[date, List[Tuple[str, int]]] = {}
+    names: Dict[int, Tuple[str, str]] = {}
+    if start is not None:
+        now = time.time()
+        for day, events in EventService.get_events_for_range(start, end or start).items():
+            if events:
+                day_counts[day] = EventTable.from_events(events).count_by_tournament()
+            for event in events:
+                if event.start_timestamp < now:
+                    names[event.id] = (event.home_team.name, event.away_team.name)
+
+    extra_ids = [event_id for event_id in dict.fromkeys(event_ids) if event_id not in names]
+    for event_id, event_data in fetch_events_bulk(extra_ids).items():
+        names[event_id] = _team_names(event_data)
+
+    event_stats = {}
+    for event_id, stats_data in fetch_events_stats_bulk(list(names)).items():
+        stats = select_statistics(stats_data) if stats_data else {}
+        if stats:
+            event_stats[event_id] = (*names[event_id], stats)
+    return render_batch(day_counts, event_stats, output_dir, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="SofaScore data visualizer")
+    subparsers = parser.add_subparsers(dest="command")
+
+    tournament_parser = subparsers.add_parser("tournament", help="Pie chart of events by tournament")
+    tournament_parser.add_argument("start", nargs="?", help="Day in ISO format (default: today)")
+    tournament_parser.add_argument("end", nargs="?", help="Last day of a range in ISO format")
+
+    stats_parser = subparsers.add_parser("stats", help="Bar charts of event statistics")
+    stats_parser.add_argument("id", nargs="?", type=int, help="Event ID")
+    stats_parser.add_argument("--range", nargs=2, metavar=("FROM", "TO"), help="Batch: every event and day in a date range")
+    stats_parser.add_argument("--ids-file", help="Batch: file with one event ID per line")
+    stats_parser.add_argument("--workers", type=int, help="Batch: number of render processes")
+    stats_parser.add_argument("--output-dir", default="output", help="Batch: directory for charts and manifest.json")
+
+    args = parser.parse_args()
+    if args.command == "tournament":
+        try:
+            target_date = date.fromisoformat(args.start) if args.start else date.today()
+        except ValueError:
+            print("Invalid date format. Using today's date.")
             target_date = date.today()
-            if len(sys.argv) > 2:
-                try:
-                    target_date = date.fromisoformat(sys.argv[2])
-                except ValueError:
-                    print(f"Invalid date format. Using today's date.")
-            visualize_events_by_tournament(target_date)
-        
-        elif sys.argv[1] == 'stats' and len(sys.argv) > 2:
-            try:
-                event_id = int(sys.argv[2])
-                visualize_event_statistics(event_id)
-            except ValueError:
-                print("Please provide a valid event ID.")
+        try:
+            end_date = date.fromisoformat(args.end) if args.end else None
+        except ValueError:
+            print("Invalid end date format. Showing a single day.")
+            end_date = None
+        visualize_events_by_tournament(target_date, end_date)
+
+    elif args.command == "stats" and (args.range or args.ids_file):
+        start, end = (date.fromisoformat(day) for day in args.range) if args.range else (None, None)
+        event_ids = _read_ids(args.ids_file) if args.ids_file else []
+        if args.id is not None:
+            event_ids.append(args.id)
+        manifest = batch_statistics(start, end, event_ids, Path(args.output_dir), args.workers)
+        print(f"Rendered {manifest['charts']} charts ({manifest['failed']} failed) in {manifest['seconds']:.2f}s"
+              f" with {manifest['workers']} workers: {manifest['charts_per_second'] or 0:.1f} charts/s")
+        print(f"Manifest saved to {Path(args.output_dir) / 'manifest.json'}")
+
+    elif args.command == "stats" and args.id is not None:
+        visualize_event_statistics(args.id)
+
     else:
         print("Usage:")
-        print("  python visualizer.py tournament [YYYY-MM-DD]")
-        print("  python visualizer.py stats EVENT_ID")
\ No newline at end of file
+        print("  python visualizer.py tournament [YYYY-MM-DD [YYYY-MM-DD]]")
+        print("  python visualizer.py stats EVENT_ID")
+        print("  python visualizer.py stats --range YYYY-MM-DD YYYY-MM-DD [--ids-file FILE] [--workers N]")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,26 @@
 """
 Cache utility for SofaScore CLI.
-Provides a simple file-based cache to reduce API calls.
+Provides a persistent cache (one JSON file per key, or a single SQLite
+store), fronted by a bounded in-memory LRU tier, to reduce API calls.
+Large entries are stored zlib-compressed.
 """
 import os
 import json
+import zlib
+import atexit
 import time
+import sqlite3
 import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Dict, Any, Optional
-from functools import wraps
+from typing import Dict, Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+from functools import lru_cache, partial, wraps
+
+from pydantic import BaseModel
 
 from src.core.config import config
 from src.core.logging import get_logger
@@ -16,24 +28,373 @@ from src.core.logging import get_logger
 # Setup logger
 logger = get_logger("cache")
 
-class Cache:
-    """Simple file-based cache implementation."""
+# Stored values produced from pydantic models are tagged with the model name
+MODEL_TAG = "__model__"
+
+def _model_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+@lru_cache(maxsize=None)
+def _model_layout(cls: type) -> Tuple[int, Tuple[Tuple[str, type], ...]]:
+    """Return a model's field count and its (field name, model class) nested model fields."""
+    nested = []
+    for name, field in cls.model_fields.items():
+        annotation = field.annotation
+        if get_origin(annotation) is Union:
+            candidates = [arg for arg in get_args(annotation) if arg is not type(None)]
+            annotation = candidates[0] if len(candidates) == 1 else None
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested.append((name, annotation))
+    return len(cls.model_fields), tuple(nested)
+
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+
+def construct_model(cls: type, data: Dict[str, Any]) -> BaseModel:
+    """
+    Rebuild a model from data it produced with ``model_dump()``, without
+    validation. Only use this for trusted data such as the cache's own.
+    
+    Args:
+        cls: Pydantic model class
+        data: Dumped field values, keyed by field name
+        
+    Returns:
+        Model instance
+    """
+    field_count, nested = _model_layout(cls)
+    values = dict(data)
+    for name, model in nested:
+        value = values.get(name)
+        if isinstance(value, dict):
+            values[name] = construct_model(model, value)
+    if len(values) != field_count:
+        # Partial data needs model_construct to fill in defaults
+        return cls.model_construct(**values)
+    
+    # Full dumps bypass model_construct's per-field default handling, which
+    # is slower than validating
+    instance = _new_object(cls)
+    _set_attribute(instance, "__dict__", values)
+    _set_attribute(instance, "__pydantic_fields_set__", set(values))
+    _set_attribute(instance, "__pydantic_extra__", None)
+    _set_attribute(instance, "__pydantic_private__", None)
+    return instance
+
+def _model_of(tp: Any) -> Tuple[Optional[type], bool]:
+    """Return (model class, is_list) for ``Model`` or ``List[Model]`` annotations."""
+    is_list = get_origin(tp) in (list, List)
+    if is_list:
+        args = get_args(tp)
+        tp = args[0] if args else None
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        return tp, is_list
+    return None, False
+
+def encode_value(value: Any) -> Any:
+    """
+    Convert a value into its JSON-serializable stored form.
+    Models and lists of models are dumped and tagged with their model name.
     
-    def __init__(self, cache_dir: Optional[str] = None, enabled: bool = None):
+    Args:
+        value: Value to store
+        
+    Returns:
+        JSON-serializable value
+    """
+    if isinstance(value, BaseModel):
+        return {MODEL_TAG: _model_name(type(value)), "item": value.model_dump()}
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        cls = type(value[0])
+        if all(type(item) is cls for item in value):
+            return {MODEL_TAG: _model_name(cls), "items": [item.model_dump() for item in value]}
+    return value
+
+def encode_model_list(cls: type, dumped_items: List[str]) -> bytes:
+    """
+    Build the serialized stored form of a list of models from items that
+    were serialized one by one (``json.dumps(item.model_dump())``).
+    Streaming counterpart of ``json.dumps(encode_value(items))``.
+    
+    Args:
+        cls: Model class of the items
+        dumped_items: JSON of each dumped item
+        
+    Returns:
+        JSON bytes decodable with ``decode_value``
+    """
+    if not dumped_items:
+        return b"[]"
+    head = json.dumps({MODEL_TAG: _model_name(cls)})[:-1]
+    return f'{head}, "items": [{", ".join(dumped_items)}]}}'.encode()
+
+def decode_value(data: Any, expected_type: Any = None) -> Any:
+    """
+    Rebuild a value from its stored form.
+    
+    Tagged model data is rebuilt through the trusted ``construct_model``
+    path when it matches ``expected_type`` (``Model`` or ``List[Model]``).
+    
+    Args:
+        data: Stored form produced by ``encode_value``
+        expected_type: Type the caller expects, usually a return annotation
+        
+    Returns:
+        The rebuilt value
+        
+    Raises:
+        ValueError: If the stored data does not match the expected model type
+    """
+    model, is_list = _model_of(expected_type)
+    if model is None:
+        return data
+    
+    if isinstance(data, dict) and MODEL_TAG in data:
+        if data[MODEL_TAG] != _model_name(model):
+            raise ValueError(f"Cached {data[MODEL_TAG]} does not match expected {_model_name(model)}")
+        if is_list and "items" in data:
+            return [construct_model(model, item) for item in data["items"]]
+        if not is_list and "item" in data:
+            return construct_model(model, data["item"])
+    elif is_list and data == []:
+        return []
+    raise ValueError(f"Cached value is not a stored {_model_name(model)}")
+
+class MemoryEntry(NamedTuple):
+    """A value held by the in-memory cache tier."""
+    value: Any
+    stored_at: float
+    expires_at: Optional[float]
+    size: int
+
+class MemoryCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+    
+    Values are returned as stored, without copying, so callers must not
+    mutate them.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
         """
-        Initialize the cache.
+        Initialize the memory tier.
         
         Args:
-            cache_dir: Directory for cache files (default from config)
-            enabled: Whether cache is enabled (default from config)
+            max_entries: Maximum number of entries, 0 for unlimited (default from config)
+            max_bytes: Maximum total serialized size, 0 for unlimited (default from config)
         """
-        self.cache_dir = Path(cache_dir or config.CACHE_DIR)
-        self.enabled = enabled if enabled is not None else config.CACHE_ENABLED
+        self.max_entries = config.CACHE_MEMORY_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.CACHE_MEMORY_BYTES if max_bytes is None else max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, MemoryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str, max_age: int) -> Optional[MemoryEntry]:
+        """
+        Get an entry if present, younger than max_age and not past its expiry.
         
-        # Create cache directory if it doesn't exist and caching is enabled
-        if self.enabled and not self.cache_dir.exists():
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created cache directory: {self.cache_dir}")
+        Args:
+            key: Cache key
+            max_age: Maximum age in seconds
+            
+        Returns:
+            The entry, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry.stored_at > max_age or (entry.expires_at is not None and now > entry.expires_at):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key: str, value: Any, size: int, stored_at: Optional[float] = None, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay in budget.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Serialized size of the value in bytes
+            stored_at: Time the value was produced (default: now)
+            ttl: Optional lifetime in seconds after stored_at
+        """
+        stored_at = time.time() if stored_at is None else stored_at
+        expires_at = stored_at + ttl if ttl is not None else None
+        if self.max_bytes and size > self.max_bytes:
+            self.discard(key)
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            self._entries[key] = MemoryEntry(value, stored_at, expires_at, size)
+            self.total_bytes += size
+            
+            while self._entries and (
+                (self.max_entries and len(self._entries) > self.max_entries)
+                or (self.max_bytes and self.total_bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+    
+    def discard(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry.size
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+class CachePayload(NamedTuple):
+    """A serialized value ready to be written by a storage backend."""
+    data: bytes
+    # "json" for plain JSON, "zlib" for zlib-compressed JSON
+    encoding: str
+    # Size of the uncompressed JSON
+    raw_size: int
+
+class CacheRecord(NamedTuple):
+    """A serialized value as held by a storage backend."""
+    data: bytes
+    stored_at: float
+    expires_at: Optional[float]
+    # HTTP validators (etag, last_modified, length) of the response behind the value
+    validators: Optional[Dict[str, Any]] = None
+    encoding: str = "json"
+    raw_size: Optional[int] = None
+
+class EntryInfo(NamedTuple):
+    """Metadata of a stored entry, used for statistics and eviction."""
+    handle: Any
+    endpoint: str
+    size: int
+    stored_at: float
+    expires_at: Optional[float]
+    last_access: float
+    raw_size: int
+
+class StaleEntry(NamedTuple):
+    """A cached value returned regardless of its age."""
+    value: Any
+    stored_at: float
+    validators: Optional[Dict[str, Any]]
+
+class NotModified(Exception):
+    """Raised by the HTTP layer when the upstream answers 304 Not Modified."""
+
+class UpstreamUnavailable(ConnectionError):
+    """
+    Raised by the HTTP layer when a request is not sent because the upstream
+    is failing or the caller's time budget is spent. ``@cached`` answers it
+    with the expired entry, if there is one.
+    """
+
+class Revalidation:
+    """
+    Validators exchanged between ``@cached`` and the HTTP layer for one call.
+    
+    The decorator installs an instance (see ``revalidation_context``) holding
+    the validators of the expired entry; the HTTP layer sends them as
+    conditional headers and either raises NotModified on a 304 or records
+    the validators of the fresh response.
+    """
+    
+    def __init__(self, validators: Optional[Dict[str, Any]] = None):
+        self.validators = validators or {}
+        self.response_validators: Optional[Dict[str, Any]] = None
+    
+    def request_headers(self) -> Dict[str, str]:
+        """Return the conditional request headers for the stale entry."""
+        headers = {}
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+        return headers
+    
+    def capture(self, etag: Optional[str], last_modified: Optional[str], length: int) -> None:
+        """Record the validators and body size of a full (200) response."""
+        if etag or last_modified:
+            self.response_validators = {"etag": etag, "last_modified": last_modified, "length": length}
+        else:
+            self.response_validators = None
+
+_revalidation: ContextVar[Optional[Revalidation]] = ContextVar("cache_revalidation", default=None)
+
+def current_revalidation() -> Optional[Revalidation]:
+    """Return the revalidation state of the innermost ``@cached`` call, if any."""
+    return _revalidation.get()
+
+@contextmanager
+def revalidation_context(validators: Optional[Dict[str, Any]]) -> Iterator[Revalidation]:
+    """Install a Revalidation for the HTTP requests made inside the block."""
+    revalidation = Revalidation(validators)
+    token = _revalidation.set(revalidation)
+    try:
+        yield revalidation
+    finally:
+        _revalidation.reset(token)
+
+def endpoint_of(key: str) -> str:
+    """Return the endpoint (function name) part of a cache key."""
+    return key.split(":", 1)[0]
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """
+    Write a file aside and rename it into place, so that concurrent readers,
+    in this or another process, never see it half-written.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+class FileCacheBackend:
+    """
+    Stores each entry as ``<md5 of key>.json`` in the cache directory.
+    
+    Files start with a ``#sofascore-cache`` header line holding the key,
+    expiry and payload encoding, followed by the (possibly compressed)
+    payload; files without it (written by older versions) hold the bare JSON
+    value. The modification time is touched on reads and serves as the
+    last access time for LRU eviction.
+    """
+    
+    name = "file"
+    
+    HEADER_PREFIX = b"#sofascore-cache "
+    # Files without a header record no storage time, and their modification
+    # time is the last access; they count as stored at the epoch, so they are
+    # expired (still servable stale) and eventually pruned
+    LEGACY_STORED_AT = 0.0
+    META_FILE = "_meta"
+    UNKNOWN_ENDPOINT = "unknown"
+    
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the backend.
+        
+        Args:
+            cache_dir: Directory holding the cache files
+        """
+        self.cache_dir = cache_dir
+        self._meta_lock = threading.Lock()
     
     def _get_cache_path(self, key: str) -> Path:
         """
@@ -49,95 +410,1329 @@ class Cache:
         hashed_key = hashlib.md5(key.encode()).hexdigest()
         return self.cache_dir / f"{hashed_key}.json"
     
-    def get(self, key: str, max_age: int = 3600) -> Optional[Dict[str, Any]]:
+    @classmethod
+    def read_path(cls, path: Path, header_only: bool = False) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """
+        Read a cache file.
+        
+        Args:
+            path: Path to the cache file
+            header_only: Skip reading the value
+            
+        Returns:
+            Tuple of (header dict, empty for legacy files; payload bytes or None)
+        """
+        with open(path, 'rb') as f:
+            first = f.readline()
+            if first.startswith(cls.HEADER_PREFIX):
+                header = json.loads(first[len(cls.HEADER_PREFIX):])
+                return header, None if header_only else f.read()
+            return {}, None if header_only else first + f.read()
+    
+    def read(self, key: str) -> Optional[CacheRecord]:
+        """Read an entry and mark it as recently used."""
+        cache_path = self._get_cache_path(key)
+        try:
+            header, data = self.read_path(cache_path)
+            os.utime(cache_path)
+        except FileNotFoundError:
+            return None
+        return CacheRecord(
+            data,
+            header.get("stored_at", self.LEGACY_STORED_AT),
+            header.get("expires_at"),
+            header.get("validators"),
+            header.get("encoding", "json"),
+            header.get("raw_size"),
+        )
+    
+    def read_many(self, keys: Iterable[str]) -> Dict[str, CacheRecord]:
+        """Read several entries, skipping missing ones."""
+        records = {}
+        for key in keys:
+            record = self.read(key)
+            if record is not None:
+                records[key] = record
+        return records
+    
+    def write(
+        self,
+        key: str,
+        payload: CachePayload,
+        stored_at: float,
+        expires_at: Optional[float],
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Write an entry.
+        
+        Returns:
+            Number of bytes written
+        """
+        header = {
+            "key": key,
+            "stored_at": stored_at,
+            "expires_at": expires_at,
+            "encoding": payload.encoding,
+            "raw_size": payload.raw_size,
+        }
+        if validators:
+            header["validators"] = validators
+        content = self.HEADER_PREFIX + json.dumps(header).encode() + b"\n" + payload.data
+        # A concurrent sweep must never read a half-written entry as a headerless one
+        _write_atomic(self._get_cache_path(key), content)
+        return len(content)
+    
+    def write_many(
+        self,
+        items: Dict[str, CachePayload],
+        stored_at: float,
+        expires_at: Optional[float],
+        validators: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Write several entries, with optional validators per key."""
+        validators = validators or {}
+        for key, payload in items.items():
+            self.write(key, payload, stored_at, expires_at, validators.get(key))
+    
+    def touch(self, key: str, stored_at: float, expires_at: Optional[float]) -> bool:
+        """
+        Renew an entry's storage time and expiry without changing its value.
+        
+        Returns:
+            True if the entry exists
+        """
+        record = self.read(key)
+        if record is None:
+            return False
+        raw_size = record.raw_size if record.raw_size is not None else len(record.data)
+        payload = CachePayload(record.data, record.encoding, raw_size)
+        self.write(key, payload, stored_at, expires_at, record.validators)
+        return True
+    
+    def scan(self) -> Iterator[EntryInfo]:
+        """Yield metadata for every stored entry; only file headers are read."""
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+                header, _ = self.read_path(path, header_only=True)
+            except (IOError, ValueError):
+                continue
+            key = header.get("key")
+            yield EntryInfo(
+                handle=path,
+                endpoint=endpoint_of(key) if key else self.UNKNOWN_ENDPOINT,
+                size=stat.st_size,
+                stored_at=header.get("stored_at", self.LEGACY_STORED_AT),
+                expires_at=header.get("expires_at"),
+                last_access=stat.st_mtime,
+                raw_size=header.get("raw_size", stat.st_size),
+            )
+    
+    def delete(self, handles: Iterable[Any]) -> None:
+        """Delete entries by the handles returned from scan()."""
+        for path in handles:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def clear(self) -> int:
+        """
+        Delete every entry.
+        
+        Returns:
+            Number of deleted entries
+        """
+        paths = list(self.cache_dir.glob("*.json"))
+        self.delete(paths)
+        return len(paths)
+    
+    def _load_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_dir / self.META_FILE, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_meta(self, meta: Dict[str, Any]) -> None:
+        # Other processes read it while this one writes
+        _write_atomic(self.cache_dir / self.META_FILE, json.dumps(meta).encode())
+    
+    def load_counters(self) -> Dict[str, Dict[str, float]]:
+        """Return the persisted per-endpoint counters."""
+        return self._load_meta().get("counters", {})
+    
+    def add_counters(self, deltas: Dict[str, Dict[str, float]]) -> None:
+        """Add per-endpoint counter deltas to the persisted counters."""
+        with self._meta_lock:
+            meta = self._load_meta()
+            counters = meta.setdefault("counters", {})
+            for endpoint, values in deltas.items():
+                stored = counters.setdefault(endpoint, {})
+                for name, value in values.items():
+                    stored[name] = stored.get(name, 0) + value
+            self._save_meta(meta)
+    
+    def get_meta(self, name: str) -> Any:
+        """Get a persisted bookkeeping value."""
+        return self._load_meta().get(name)
+    
+    def set_meta(self, name: str, value: Any) -> None:
+        """Set a persisted bookkeeping value."""
+        with self._meta_lock:
+            meta = self._load_meta()
+            meta[name] = value
+            self._save_meta(meta)
+
+class SQLiteCacheBackend:
+    """
+    Stores all entries in a single SQLite database in WAL mode.
+    Entries are keyed by the same md5 digest as the file backend, so an
+    existing cache directory can be migrated into it without the original keys.
+    """
+    
+    name = "sqlite"
+    
+    SCHEMA_VERSION = 4
+    DB_NAME = "cache.sqlite3"
+    # Stay well below SQLite's bound parameter limit
+    BATCH_SIZE = 500
+    
+    def __init__(self, cache_dir: Path, migrate: bool = True):
+        """
+        Initialize the backend, creating the database on first use.
+        
+        Args:
+            cache_dir: Directory holding the database
+            migrate: Import ``*.json`` entries left by the file backend
+        """
+        self.cache_dir = cache_dir
+        self.db_path = cache_dir / self.DB_NAME
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self._create_schema(version)
+            if migrate and version < 1:
+                self.migrate_directory()
+            self._conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+    
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.md5(key.encode()).hexdigest()
+    
+    def _create_schema(self, version: int) -> None:
+        with self._lock:
+            if version < 1:
+                self._conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key_hash TEXT PRIMARY KEY,
+                        key TEXT,
+                        value TEXT NOT NULL,
+                        stored_at REAL NOT NULL,
+                        expires_at REAL
+                    );
+                    CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+                """)
+            if version < 2:
+                self._conn.executescript(f"""
+                    ALTER TABLE entries ADD COLUMN endpoint TEXT NOT NULL DEFAULT '{FileCacheBackend.UNKNOWN_ENDPOINT}';
+                    ALTER TABLE entries ADD COLUMN last_access REAL NOT NULL DEFAULT 0;
+                    UPDATE entries SET last_access = stored_at;
+                    CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+                    CREATE TABLE IF NOT EXISTS counters (
+                        endpoint TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        value REAL NOT NULL,
+                        PRIMARY KEY (endpoint, name)
+                    );
+                    CREATE TABLE IF NOT EXISTS meta (
+                        name TEXT PRIMARY KEY,
+                        value TEXT
+                    );
+                """)
+            if version < 3:
+                self._conn.execute("ALTER TABLE entries ADD COLUMN validators TEXT")
+            if version < 4:
+                self._conn.executescript("""
+                    ALTER TABLE entries ADD COLUMN encoding TEXT NOT NULL DEFAULT 'json';
+                    ALTER TABLE entries ADD COLUMN raw_size INTEGER;
+                """)
+    
+    def _executemany(self, sql: str, rows: List[tuple]) -> None:
+        """Run a statement for many rows in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(sql, rows)
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def migrate_directory(self) -> int:
+        """
+        Import entries written by the file backend and remove their files.
+        
+        Returns:
+            Number of migrated entries
+        """
+        rows = []
+        paths = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+                header, data = FileCacheBackend.read_path(path)
+            except (IOError, ValueError) as e:
+                logger.warning(f"Skipping unreadable cache file {path}: {e}")
+                continue
+            key = header.get("key")
+            endpoint = endpoint_of(key) if key else FileCacheBackend.UNKNOWN_ENDPOINT
+            stored_at = header.get("stored_at", FileCacheBackend.LEGACY_STORED_AT)
+            validators = header.get("validators")
+            rows.append((
+                path.stem, key, data, stored_at, header.get("expires_at"), endpoint, mtime,
+                json.dumps(validators) if validators else None,
+                header.get("encoding", "json"), header.get("raw_size", len(data)),
+            ))
+            paths.append(path)
+        
+        if rows:
+            self._executemany(
+                "INSERT OR IGNORE INTO entries "
+                "(key_hash, key, value, stored_at, expires_at, endpoint, last_access, validators, encoding, raw_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            for path in paths:
+                path.unlink()
+            logger.info(f"Migrated {len(rows)} cache files into {self.db_path}")
+        
+        meta_path = self.cache_dir / FileCacheBackend.META_FILE
+        if meta_path.exists():
+            self.add_counters(FileCacheBackend(self.cache_dir).load_counters())
+            meta_path.unlink()
+        return len(rows)
+    
+    def read(self, key: str) -> Optional[CacheRecord]:
+        """Read an entry and mark it as recently used."""
+        return self.read_many([key]).get(key)
+    
+    def read_many(self, keys: Iterable[str]) -> Dict[str, CacheRecord]:
+        """Read several entries with batched lookups, skipping missing ones."""
+        by_hash = {self._hash(key): key for key in keys}
+        hashes = list(by_hash)
+        records = {}
+        now = time.time()
+        for i in range(0, len(hashes), self.BATCH_SIZE):
+            batch = hashes[i:i + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key_hash, value, stored_at, expires_at, validators, encoding, raw_size "
+                    f"FROM entries WHERE key_hash IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE entries SET last_access = ? WHERE key_hash IN ({placeholders})",
+                        [now, *batch],
+                    )
+            for key_hash, value, stored_at, expires_at, validators, encoding, raw_size in rows:
+                # Entries written before compression support hold TEXT values
+                data = value.encode() if isinstance(value, str) else value
+                records[by_hash[key_hash]] = CacheRecord(
+                    data, stored_at, expires_at, json.loads(validators) if validators else None, encoding, raw_size
+                )
+        return records
+    
+    def write(
+        self,
+        key: str,
+        payload: CachePayload,
+        stored_at: float,
+        expires_at: Optional[float],
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Write an entry."""
+        self.write_many({key: payload}, stored_at, expires_at, {key: validators} if validators else None)
+    
+    def write_many(
+        self,
+        items: Dict[str, CachePayload],
+        stored_at: float,
+        expires_at: Optional[float],
+        validators: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Write several entries in one transaction, with optional validators per key."""
+        validators = validators or {}
+        rows = []
+        for key, payload in items.items():
+            key_validators = validators.get(key)
+            rows.append((
+                self._hash(key), key, payload.data, stored_at, expires_at, endpoint_of(key), stored_at,
+                json.dumps(key_validators) if key_validators else None, payload.encoding, payload.raw_size,
+            ))
+        self._executemany(
+            "INSERT OR REPLACE INTO entries "
+            "(key_hash, key, value, stored_at, expires_at, endpoint, last_access, validators, encoding, raw_size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    
+    def touch(self, key: str, stored_at: float, expires_at: Optional[float]) -> bool:
+        """
+        Renew an entry's storage time and expiry without changing its value.
+        
+        Returns:
+            True if the entry exists
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE entries SET stored_at = ?, expires_at = ?, last_access = ? WHERE key_hash = ?",
+                (stored_at, expires_at, stored_at, self._hash(key)),
+            )
+        return cursor.rowcount > 0
+    
+    def scan(self) -> Iterator[EntryInfo]:
+        """Yield metadata for every stored entry."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key_hash, endpoint, length(value), stored_at, expires_at, last_access, "
+                "COALESCE(raw_size, length(value)) FROM entries"
+            ).fetchall()
+        for row in rows:
+            yield EntryInfo(*row)
+    
+    def delete(self, handles: Iterable[Any]) -> None:
+        """Delete entries by the handles returned from scan()."""
+        self._executemany("DELETE FROM entries WHERE key_hash = ?", [(handle,) for handle in handles])
+    
+    def clear(self) -> int:
+        """
+        Delete every entry.
+        
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            return self._conn.execute("DELETE FROM entries").rowcount
+    
+    def load_counters(self) -> Dict[str, Dict[str, float]]:
+        """Return the persisted per-endpoint counters."""
+        counters: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT endpoint, name, value FROM counters").fetchall()
+        for endpoint, name, value in rows:
+            counters.setdefault(endpoint, {})[name] = value
+        return counters
+    
+    def add_counters(self, deltas: Dict[str, Dict[str, float]]) -> None:
+        """Add per-endpoint counter deltas to the persisted counters."""
+        rows = [
+            (endpoint, name, value)
+            for endpoint, values in deltas.items()
+            for name, value in values.items()
+        ]
+        self._executemany(
+            "INSERT INTO counters (endpoint, name, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (endpoint, name) DO UPDATE SET value = value + excluded.value",
+            rows,
+        )
+    
+    def get_meta(self, name: str) -> Any:
+        """Get a persisted bookkeeping value."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def set_meta(self, name: str, value: Any) -> None:
+        """Set a persisted bookkeeping value."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                (name, json.dumps(value)),
+            )
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+BACKENDS = {
+    FileCacheBackend.name: FileCacheBackend,
+    SQLiteCacheBackend.name: SQLiteCacheBackend,
+}
+
+class Cache:
+    """Persistent cache with an in-memory LRU tier in front of a storage backend."""
+    
+    EVICTION_POLICIES = ("lru", "expiry")
+    STAT_FIELDS = (
+        "entries", "bytes", "raw_bytes", "expired", "hits", "misses", "revalidated", "bytes_saved",
+        "served_stale", "compressed", "compress_time", "decompressed", "decompress_time",
+    )
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        enabled: bool = None,
+        memory: Optional[MemoryCache] = None,
+        backend: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        eviction: Optional[str] = None,
+        compress_level: Optional[int] = None,
+        compress_min_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory for cache files (default from config)
+            enabled: Whether cache is enabled (default from config)
+            memory: In-memory tier to use (default: sized from config)
+            backend: Storage backend name, "file" or "sqlite" (default from config)
+            max_bytes: Size budget of the backend, 0 for unlimited (default from config)
+            max_entries: Entry budget of the backend, 0 for unlimited (default from config)
+            eviction: "lru" or "expiry" (soonest expiry first) (default from config)
+            compress_level: zlib level for large entries, 0 to disable (default from config)
+            compress_min_bytes: Smallest encoded size that gets compressed (default from config)
+        """
+        self.cache_dir = Path(cache_dir or config.CACHE_DIR)
+        self.enabled = enabled if enabled is not None else config.CACHE_ENABLED
+        self.memory = memory if memory is not None else MemoryCache()
+        self.max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_entries = config.CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.eviction = eviction or config.CACHE_EVICTION
+        self.compress_level = config.CACHE_COMPRESS_LEVEL if compress_level is None else compress_level
+        self.compress_min_bytes = config.CACHE_COMPRESS_MIN_BYTES if compress_min_bytes is None else compress_min_bytes
+        
+        self.backend_name = backend or config.CACHE_BACKEND
+        if self.backend_name not in BACKENDS:
+            raise ValueError(f"Unknown cache backend: {self.backend_name}")
+        if self.eviction not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown cache eviction policy: {self.eviction}")
+        
+        # Per-endpoint counters not yet flushed to the backend
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._counters_lock = threading.Lock()
+        self._last_sweep: Optional[float] = None
+        self._sweep_lock = threading.Lock()
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        # An existing cache is opened (and migrated) right away; a missing
+        # directory is only created once something is stored or looked up
+        if self.enabled and self.cache_dir.exists():
+            self._backend = BACKENDS[self.backend_name](self.cache_dir)
+    
+    @property
+    def backend(self):
+        """
+        Storage backend, opened on first use so that commands which never
+        touch the cache do not create its directory or database.
+        
+        Returns:
+            The backend, or None when caching is disabled
+        """
+        if not self.enabled:
+            return None
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    # Create cache directory if it doesn't exist
+                    if not self.cache_dir.exists():
+                        self.cache_dir.mkdir(parents=True, exist_ok=True)
+                        logger.info(f"Created cache directory: {self.cache_dir}")
+                    self._backend = BACKENDS[self.backend_name](self.cache_dir)
+        return self._backend
+    
+    def _count(self, key: str, name: str, amount: float = 1) -> None:
+        endpoint = endpoint_of(key)
+        with self._counters_lock:
+            values = self._counters.setdefault(endpoint, {})
+            values[name] = values.get(name, 0) + amount
+    
+    def flush_counters(self) -> None:
+        """Persist the hit/miss counters gathered by this process."""
+        if not self.enabled:
+            return
+        with self._counters_lock:
+            deltas, self._counters = self._counters, {}
+        if not deltas:
+            return
+        try:
+            self.backend.add_counters(deltas)
+        except (IOError, sqlite3.Error) as e:
+            logger.warning(f"Failed to save cache counters: {e}")
+    
+    @staticmethod
+    def _is_fresh(record: CacheRecord, max_age: int, now: float) -> bool:
+        if now - record.stored_at > max_age:
+            return False
+        return record.expires_at is None or now <= record.expires_at
+    
+    def _encode(self, key: str, value: Any) -> CachePayload:
+        """Serialize a value, compressing it when it is large enough to be worth it."""
+        return self._pack(key, json.dumps(encode_value(value)).encode())
+    
+    def _pack(self, key: str, raw: bytes) -> CachePayload:
+        """Wrap serialized JSON in a payload, compressing it when it is large enough to be worth it."""
+        if not self.compress_level or len(raw) < self.compress_min_bytes:
+            return CachePayload(raw, "json", len(raw))
+        
+        started = time.perf_counter()
+        compressed = zlib.compress(raw, self.compress_level)
+        self._count(key, "compressed")
+        self._count(key, "compress_time", time.perf_counter() - started)
+        if len(compressed) >= len(raw):
+            return CachePayload(raw, "json", len(raw))
+        return CachePayload(compressed, "zlib", len(raw))
+    
+    def _load(self, key: str, record: CacheRecord, decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Deserialize a backend record, decompressing it if needed."""
+        if record.encoding == "zlib":
+            started = time.perf_counter()
+            data = zlib.decompress(record.data)
+            self._count(key, "decompressed")
+            self._count(key, "decompress_time", time.perf_counter() - started)
+        elif record.encoding == "json":
+            data = record.data
+        else:
+            raise ValueError(f"Unknown cache entry encoding: {record.encoding}")
+        value = json.loads(data)
+        return decode(value) if decode is not None else value
+    
+    def _decode(self, key: str, record: CacheRecord, decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Decode a backend record and promote it into the memory tier."""
+        value = self._load(key, record, decode)
+        size = record.raw_size if record.raw_size is not None else len(record.data)
+        ttl = record.expires_at - record.stored_at if record.expires_at is not None else None
+        self.memory.set(key, value, size=size, stored_at=record.stored_at, ttl=ttl)
+        return value
+    
+    def get(
+        self,
+        key: str,
+        max_age: int = 3600,
+        decode: Optional[Callable[[Any], Any]] = None,
+        count: bool = True,
+    ) -> Optional[Dict[str, Any]]:
         """
         Get a value from the cache.
+        The memory tier is consulted first; backend hits are promoted into it.
         
         Args:
             key: Cache key
             max_age: Maximum age in seconds (default: 1 hour)
+            decode: Optional function rebuilding the value from its stored form
+                (see ``decode_value``); the memory tier keeps the rebuilt value
+            count: Record the lookup in the hit / miss statistics
             
         Returns:
             Cached value or None if not found or expired
         """
         if not self.enabled:
             return None
+        
+        entry = self.memory.get(key, max_age)
+        if entry is not None:
+            if count:
+                self._count(key, "hits")
+            return entry.value
+        
+        value = None
+        try:
+            record = self.backend.read(key)
+            if record is not None and not self._is_fresh(record, max_age, time.time()):
+                logger.debug(f"Cache expired for key: {key}")
+            elif record is not None:
+                value = self._decode(key, record, decode)
+        except (ValueError, TypeError, IOError, zlib.error, sqlite3.Error) as e:
+            logger.warning(f"Failed to read cache for key {key}: {e}")
+        
+        if count:
+            self._count(key, "hits" if value is not None else "misses")
+        return value
+    
+    def get_many(
+        self,
+        keys: Iterable[str],
+        max_age: int = 3600,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get several values from the cache with one batched backend lookup.
+        
+        Args:
+            keys: Cache keys
+            max_age: Maximum age in seconds (default: 1 hour)
+            decode: Optional function rebuilding values from their stored form
             
-        cache_path = self._get_cache_path(key)
+        Returns:
+            Dictionary of the keys that were found and fresh
+        """
+        if not self.enabled:
+            return {}
         
-        # Check if cache file exists
-        if not cache_path.exists():
-            return None
+        keys = list(keys)
+        values = {}
+        missing = []
+        for key in keys:
+            entry = self.memory.get(key, max_age)
+            if entry is not None:
+                values[key] = entry.value
+            else:
+                missing.append(key)
+        if not missing:
+            return values
+        
+        try:
+            records = self.backend.read_many(missing)
+        except (IOError, sqlite3.Error) as e:
+            logger.warning(f"Failed to read {len(missing)} cache entries: {e}")
+            return values
+        
+        now = time.time()
+        for key, record in records.items():
+            if not self._is_fresh(record, max_age, now):
+                continue
+            try:
+                values[key] = self._decode(key, record, decode)
+            except (ValueError, TypeError, zlib.error) as e:
+                logger.warning(f"Failed to read cache for key {key}: {e}")
+        
+        for key in keys:
+            self._count(key, "hits" if key in values else "misses")
+        return values
+    
+    def get_stale(self, key: str, decode: Optional[Callable[[Any], Any]] = None) -> Optional[StaleEntry]:
+        """
+        Get a value regardless of its age, together with its HTTP validators.
+        
+        Args:
+            key: Cache key
+            decode: Optional function rebuilding the value from its stored form
             
-        # Check if cache is expired
-        if time.time() - cache_path.stat().st_mtime > max_age:
-            logger.debug(f"Cache expired for key: {key}")
+        Returns:
+            StaleEntry or None if not stored
+        """
+        if not self.enabled:
             return None
-            
-        # Read and return cache
         try:
-            with open(cache_path, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            record = self.backend.read(key)
+            if record is None:
+                return None
+            return StaleEntry(self._load(key, record, decode), record.stored_at, record.validators)
+        except (ValueError, TypeError, IOError, zlib.error, sqlite3.Error) as e:
             logger.warning(f"Failed to read cache for key {key}: {e}")
             return None
     
-    def set(self, key: str, value: Dict[str, Any]) -> bool:
+    def refresh(self, key: str, entry: StaleEntry, max_age: Optional[int] = None) -> bool:
         """
-        Set a value in the cache.
+        Renew a stale entry after the upstream confirmed it is unchanged (304).
+        
+        Args:
+            key: Cache key
+            entry: The stale entry that was revalidated
+            max_age: Lifetime of the renewed entry
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled:
+            return False
+        stored_at = time.time()
+        expires_at = stored_at + max_age if max_age is not None else None
+        try:
+            if not self.backend.touch(key, stored_at, expires_at):
+                return False
+        except (IOError, sqlite3.Error) as e:
+            logger.warning(f"Failed to refresh cache for key {key}: {e}")
+            return False
+        
+        size = (entry.validators or {}).get("length", 0)
+        self.memory.set(key, entry.value, size=size, stored_at=stored_at, ttl=max_age)
+        self._count(key, "revalidated")
+        self._count(key, "bytes_saved", size)
+        return True
+    
+    def set(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        max_age: Optional[int] = None,
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Set a value in the cache, writing through to the backend.
         
         Args:
             key: Cache key
             value: Value to cache
+            max_age: Optional lifetime of the entry, stored as its expiry
+            validators: Optional HTTP validators of the response behind the value
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.set_many({key: value}, max_age, {key: validators} if validators else None)
+    
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        max_age: Optional[int] = None,
+        validators: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Set several values in the cache with one batched backend write.
+        
+        Args:
+            items: Mapping of cache key to value
+            max_age: Optional lifetime of the entries, stored as their expiry
+            validators: Optional mapping of cache key to HTTP validators
             
         Returns:
             True if successful, False otherwise
         """
         if not self.enabled:
             return False
+        
+        stored_at = time.time()
+        expires_at = stored_at + max_age if max_age is not None else None
+        try:
+            encoded = {key: self._encode(key, value) for key, value in items.items()}
+            self.backend.write_many(encoded, stored_at, expires_at, validators)
+        except (IOError, TypeError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"Failed to write cache for keys {list(items)}: {e}")
+            for key in items:
+                self.memory.discard(key)
+            return False
+        
+        for key, value in items.items():
+            self.memory.set(key, value, size=encoded[key].raw_size, stored_at=stored_at, ttl=max_age)
+        
+        self._maybe_sweep(stored_at)
+        return True
+    
+    def set_encoded(
+        self,
+        key: str,
+        data: bytes,
+        max_age: Optional[int] = None,
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Store a value that is already in its serialized form, bypassing the memory tier.
+        Lets streaming producers cache a result they never hold in memory as a whole.
+        
+        Args:
+            key: Cache key
+            data: JSON of the value's stored form (see ``encode_value``)
+            max_age: Optional lifetime of the entry, stored as its expiry
+            validators: Optional HTTP validators of the response behind the value
             
-        cache_path = self._get_cache_path(key)
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled:
+            return False
         
+        self.memory.discard(key)
+        stored_at = time.time()
+        expires_at = stored_at + max_age if max_age is not None else None
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(value, f)
-            return True
-        except IOError as e:
+            payload = self._pack(key, data)
+            self.backend.write_many({key: payload}, stored_at, expires_at, {key: validators} if validators else None)
+        except (IOError, sqlite3.Error) as e:
             logger.warning(f"Failed to write cache for key {key}: {e}")
             return False
+        
+        self._maybe_sweep(stored_at)
+        return True
+    
+    def _maybe_sweep(self, now: float) -> None:
+        """
+        Prune the backend in a background thread if the sweep interval has
+        elapsed since the last sweep, so that writes never wait for a scan
+        of the whole cache. At most one sweep runs at a time.
+        """
+        interval = config.CACHE_SWEEP_INTERVAL
+        if interval <= 0:
+            return
+        if self._last_sweep is None:
+            self._last_sweep = self.backend.get_meta("last_sweep") or 0
+        if now - self._last_sweep < interval or not self._sweep_lock.acquire(blocking=False):
+            return
+        
+        self._last_sweep = now
+        threading.Thread(target=self._sweep, args=(now,), name="cache-sweep", daemon=True).start()
+    
+    def _sweep(self, now: float) -> None:
+        try:
+            self.prune(now)
+            # Recorded once done, so a sweep cut short by the process exiting is retried
+            self.backend.set_meta("last_sweep", now)
+        except (IOError, sqlite3.Error) as e:
+            logger.warning(f"Cache sweep failed: {e}")
+        finally:
+            self._sweep_lock.release()
+    
+    def prune(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Delete long-expired entries, then evict entries until the backend
+        fits the configured size and entry budget.
+        
+        Expired entries are kept for ``CACHE_EXPIRED_GRACE`` seconds so they
+        can still be served stale or revalidated. Entries with no recorded
+        expiry count as expiring when they were stored.
+        
+        Args:
+            now: Reference time (default: current time)
+            
+        Returns:
+            Dictionary with the number of expired and evicted entries and freed bytes
+        """
+        result = {"expired": 0, "evicted": 0, "bytes_freed": 0}
+        if not self.enabled:
+            return result
+        
+        now = time.time() if now is None else now
+        cutoff = now - config.CACHE_EXPIRED_GRACE
+        
+        expired, live = [], []
+        for info in self.backend.scan():
+            expires_at = info.expires_at if info.expires_at is not None else info.stored_at
+            (expired if expires_at < cutoff else live).append(info)
+        
+        total_bytes = sum(info.size for info in live)
+        evicted = []
+        if (self.max_entries and len(live) > self.max_entries) or (self.max_bytes and total_bytes > self.max_bytes):
+            if self.eviction == "lru":
+                live.sort(key=lambda info: info.last_access)
+            else:
+                live.sort(key=lambda info: info.expires_at if info.expires_at is not None else info.stored_at)
+            remaining = len(live)
+            for info in live:
+                if not ((self.max_entries and remaining > self.max_entries) or (self.max_bytes and total_bytes > self.max_bytes)):
+                    break
+                evicted.append(info)
+                remaining -= 1
+                total_bytes -= info.size
+        
+        removed = expired + evicted
+        if removed:
+            self.backend.delete([info.handle for info in removed])
+            # The memory tier is keyed by the original keys; drop it rather than map handles back
+            self.memory.clear()
+            logger.debug(f"Pruned {len(expired)} expired and evicted {len(evicted)} cache entries")
+        
+        result.update(
+            expired=len(expired),
+            evicted=len(evicted),
+            bytes_freed=sum(info.size for info in removed),
+        )
+        return result
+    
+    def clear(self) -> int:
+        """
+        Delete every cached entry.
+        
+        Returns:
+            Number of deleted entries
+        """
+        self.memory.clear()
+        if not self.enabled:
+            return 0
+        return self.backend.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report per-endpoint entry counts, sizes, hit/miss ratios and compression.
+        
+        ``raw_bytes`` is the uncompressed size of the stored entries, so
+        ``compression_ratio`` is ``raw_bytes / bytes``. The ``*_time`` counters
+        hold the seconds spent in zlib over ``compressed``/``decompressed`` calls.
+        
+        Returns:
+            Dictionary with an ``endpoints`` mapping, ``totals`` and ``memory`` usage
+        """
+        report: Dict[str, Any] = {
+            "backend": self.backend.name if self.backend else None,
+            "endpoints": {},
+            "memory": {"entries": len(self.memory), "bytes": self.memory.total_bytes},
+        }
+        if not self.enabled:
+            return report
+        
+        self.flush_counters()
+        endpoints: Dict[str, Dict[str, float]] = {}
+        
+        def row(endpoint: str) -> Dict[str, float]:
+            return endpoints.setdefault(endpoint, dict.fromkeys(self.STAT_FIELDS, 0))
+        
+        now = time.time()
+        for info in self.backend.scan():
+            values = row(info.endpoint)
+            values["entries"] += 1
+            values["bytes"] += info.size
+            values["raw_bytes"] += info.raw_size
+            if info.expires_at is not None and info.expires_at < now:
+                values["expired"] += 1
+        for endpoint, counters in self.backend.load_counters().items():
+            values = row(endpoint)
+            for name, value in counters.items():
+                values[name] = values.get(name, 0) + value
+        
+        totals = dict.fromkeys(self.STAT_FIELDS, 0)
+        for values in endpoints.values():
+            for name in totals:
+                totals[name] += values.get(name, 0)
+        for values in [*endpoints.values(), totals]:
+            lookups = values["hits"] + values["misses"]
+            values["hit_ratio"] = values["hits"] / lookups if lookups else None
+            values["compression_ratio"] = values["raw_bytes"] / values["bytes"] if values["bytes"] else None
+        
+        report["endpoints"] = dict(sorted(endpoints.items()))
+        report["totals"] = totals
+        return report
 
 # Create global cache instance
 cache = Cache()
+atexit.register(cache.flush_counters)
+
+def make_cache_key(name: str, *args: Any) -> str:
+    """
+    Build a cache key from a function name and its argument values.
+    
+    Args:
+        name: Function name
+        *args: Argument values in signature order (defaults included)
+        
+    Returns:
+        Cache key string
+    """
+    return ":".join([name, *(str(arg) for arg in args)])
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution."""
+    
+    class _Flight:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, "SingleFlight._Flight"] = {}
+    
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for the key is currently running."""
+        with self._lock:
+            return key in self._flights
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the call already running for the same key and
+        share its result (or exception).
+        
+        Args:
+            key: Coalescing key
+            fn: Function to run
+            
+        Returns:
+            Result of fn
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = self._Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutines for the same key into one execution.
+    Counterpart of SingleFlight for callers on one event loop.
+    """
+    
+    def __init__(self):
+        self._flights: Dict[str, Any] = {}
+    
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for the key is currently running."""
+        return key in self._flights
+    
+    async def do(self, key: str, make: Callable[[], Any]) -> Any:
+        """
+        Await make(), or the call already running for the same key, sharing
+        its result (or exception).
+        
+        Args:
+            key: Coalescing key
+            make: Returns the coroutine to run
+            
+        Returns:
+            Result of the coroutine
+        """
+        # Imported here so that sync-only commands do not pay for asyncio at startup
+        import asyncio
+        
+        future = self._flights.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        try:
+            result = await make()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+# Shared by every @cached function so concurrent misses hit the API once
+single_flight = SingleFlight()
+
+class CachedCall:
+    """
+    The caching rules of ``@cached`` for one key, as steps around a fetch.
+    
+    ``@cached`` runs them around synchronous functions; callers fetching
+    another way, such as the async client, run the same steps around their
+    own fetch (with disk access off the event loop) and so share the rules:
+    
+    1. ``fresh()``: serve a fresh entry.
+    2. ``servable_stale()``: with stale-while-revalidate, serve a recently
+       expired entry and refresh it in the background.
+    3. Otherwise fetch in a single flight, under ``revalidation_context``
+       for the validators of ``stale()``, checking ``fresh(count=False)``
+       first, then finish with ``store()``, ``renewed()`` on NotModified or
+       ``unavailable()`` on UpstreamUnavailable.
+    """
+    
+    def __init__(
+        self,
+        key: str,
+        max_age: int,
+        decode: Optional[Callable[[Any], Any]] = None,
+        stale_while_revalidate: int = 0,
+        fallback: Optional[Callable[[], Any]] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize the call.
+        
+        Args:
+            key: Cache key
+            max_age: Maximum age of the entry in seconds
+            decode: Rebuilds values from their stored form (see ``decode_value``)
+            stale_while_revalidate: Seconds past max_age during which a stale
+                value is served while refreshing in the background
+            fallback: Returns the result when the upstream is unavailable and
+                nothing is cached
+            name: Name used in log messages (default: the key)
+        """
+        self.key = key
+        self.max_age = max_age
+        self.decode = decode
+        self.stale_while_revalidate = stale_while_revalidate
+        self.fallback = fallback
+        self.name = name or key
+    
+    def fresh(self, count: bool = True) -> Any:
+        """Return the fresh cached value, or None."""
+        return cache.get(self.key, self.max_age, self.decode, count=count)
+    
+    def stale(self) -> Optional[StaleEntry]:
+        """Return the entry however old, to revalidate or fall back on."""
+        return cache.get_stale(self.key, self.decode)
+    
+    def servable_stale(self) -> Optional[StaleEntry]:
+        """Return the expired entry if it may be served while it is refreshed, else None."""
+        if not self.stale_while_revalidate:
+            return None
+        stale = self.stale()
+        if stale is None or time.time() - stale.stored_at > self.max_age + self.stale_while_revalidate:
+            return None
+        logger.debug(f"Serving stale {self.name} while revalidating")
+        return stale
+    
+    def store(self, result: Any, validators: Optional[Dict[str, Any]] = None) -> Any:
+        """Cache a fetched result along with the validators of the response behind it."""
+        cache.set(self.key, result, self.max_age, validators)
+        return result
+    
+    def renewed(self, stale: StaleEntry) -> Any:
+        """Renew an entry the upstream answered as not modified, and return its value."""
+        logger.debug(f"Revalidated cache entry for {self.name}")
+        cache.refresh(self.key, stale, self.max_age)
+        return stale.value
+    
+    def unavailable(self, error: UpstreamUnavailable, stale: Optional[StaleEntry], strict: bool = False) -> Any:
+        """
+        Answer a fetch that found the upstream unavailable: with the expired
+        entry, however old, or else with the fallback (uncached).
+        
+        Args:
+            error: The fetch's error
+            stale: Entry read before the fetch
+            strict: Re-raise the error instead
+            
+        Raises:
+            UpstreamUnavailable: If strict, or with neither an entry nor a fallback
+        """
+        if strict:
+            raise error
+        if stale is not None:
+            logger.warning(f"Serving stale {self.name}: {error}")
+            cache._count(self.key, "served_stale")
+            return stale.value
+        if self.fallback is None:
+            raise error
+        logger.warning(f"{self.name} unavailable: {error}")
+        return self.fallback()
 
-def cached(max_age: int = 3600):
+def cached(max_age: int = 3600, stale_while_revalidate: int = 0, fallback: Optional[Callable[[], Any]] = None):
     """
     Decorator for caching function results.
     
+    Arguments are bound to the function signature with defaults applied,
+    so ``f(day)`` and ``f(day, sport="football")`` share one cache entry.
+    When an expired entry has HTTP validators, the function runs with a
+    revalidation context and a NotModified answer renews the old value.
+    
+    Concurrent misses on the same key (across threads) are coalesced into
+    a single call, and a miss that lands just after such a call stored its
+    result is served from the cache without a call of its own. With
+    ``stale_while_revalidate``, an entry that expired less than that many
+    seconds ago is returned immediately while one background thread
+    refreshes it.
+    
+    When the function raises UpstreamUnavailable, the expired entry is
+    returned, however old, or else ``fallback()`` (uncached) if given.
+    
+    Results are stored through ``encode_value`` and, when the function's
+    return annotation is a model or a list of models (e.g. ``List[Event]``),
+    hits are rebuilt as model instances without re-validation.
+    
+    The decorated function gains a ``refresh(*args, **kwargs)`` attribute
+    that bypasses the fresh-entry check and stores the new result. It raises
+    UpstreamUnavailable rather than returning a stale entry or the fallback,
+    so callers can tell a fresh result from a failed fetch.
+    
+    The steps are those of ``CachedCall``.
+    
     Args:
         max_age: Maximum age of cache in seconds
+        stale_while_revalidate: Seconds past max_age during which a stale
+            value is served while refreshing in the background
+        fallback: Returns the result when the upstream is unavailable and
+            nothing is cached (default: UpstreamUnavailable is raised)
         
     Returns:
         Decorated function
     """
     def decorator(func):
+        signature = inspect.signature(func)
+        decoders = []
+        
+        def decode(data):
+            # Resolved on first use so forward references in annotations work
+            if not decoders:
+                return_type = get_type_hints(func).get("return")
+                decoders.append(partial(decode_value, expected_type=return_type))
+            return decoders[0](data)
+        
+        def make_call(args, kwargs) -> CachedCall:
+            # Generate cache key from function name and bound arguments
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_cache_key(func.__name__, *bound.arguments.values())
+            return CachedCall(key, max_age, decode, stale_while_revalidate, fallback, func.__name__)
+        
+        def load(call: CachedCall, args, kwargs, stale: Optional[StaleEntry] = None, strict: bool = False):
+            # Expired entries with HTTP validators are revalidated upstream
+            if stale is None:
+                stale = call.stale()
+            with revalidation_context(stale.validators if stale else None) as revalidation:
+                try:
+                    result = func(*args, **kwargs)
+                except NotModified:
+                    return call.renewed(stale)
+                except UpstreamUnavailable as e:
+                    return call.unavailable(e, stale, strict)
+            return call.store(result, revalidation.response_validators)
+        
+        def load_if_missing(call: CachedCall, args, kwargs):
+            # A caller that missed just as the previous flight stored its result finds it here
+            cached_result = call.fresh(count=False)
+            if cached_result is not None:
+                return cached_result
+            return load(call, args, kwargs)
+        
+        def refresh_in_background(call: CachedCall, args, kwargs, stale: StaleEntry) -> None:
+            if single_flight.in_flight(call.key):
+                return
+            
+            def run():
+                try:
+                    single_flight.do(call.key, lambda: load(call, args, kwargs, stale, strict=True))
+                except Exception as e:
+                    logger.warning(f"Background refresh of {func.__name__} failed: {e}")
+            
+            threading.Thread(target=run, name=f"refresh-{func.__name__}", daemon=True).start()
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            key_parts = [func.__name__]
-            key_parts.extend(str(arg) for arg in args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = ":".join(key_parts)
+            call = make_call(args, kwargs)
             
             # Check cache
-            cached_result = cache.get(cache_key, max_age)
+            cached_result = call.fresh()
             if cached_result is not None:
                 logger.debug(f"Cache hit for {func.__name__}")
                 return cached_result
-                
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result)
-            return result
             
+            stale = call.servable_stale()
+            if stale is not None:
+                refresh_in_background(call, args, kwargs, stale)
+                return stale.value
+            
+            return single_flight.do(call.key, lambda: load_if_missing(call, args, kwargs))
+        
+        def refresh(*args, **kwargs):
+            call = make_call(args, kwargs)
+            return single_flight.do(call.key, lambda: load(call, args, kwargs, strict=True))
+        
+        wrapper.refresh = refresh
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,111 @@
+"""
+Incremental JSON parsing for SofaScore CLI.
+Yields the items of an array inside a top-level JSON object while the
+document is still arriving, so large listings never sit in memory whole.
+"""
+import re
+import codecs
+import json
+from typing import Any, Collection, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+
+class _Reader:
+    """Text buffer over a stream of byte chunks, refilled on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Read the next chunk, dropping the consumed part of the buffer.
+
+        Returns:
+            False once the stream is exhausted
+        """
+        if self.eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.eof = True
+            chunk = b""
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end of the stream)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more data until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut by the end of the buffer (e.g. "1." of "1.5") decodes
+            # early, so only accept values followed by a delimiter
+            if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                self.pos = end
+                return value
+            self.fill()
+
+def iter_array_items(chunks: Iterable[bytes], keys: Collection[str] = ("events",)) -> Iterator[Any]:
+    """
+    Yield the items of the first array found under one of ``keys`` in a JSON object.
+
+    Other members of the object are decoded and discarded; only one array
+    item (plus one chunk of input) is held in memory at a time.
+
+    Args:
+        chunks: UTF-8 encoded document, in chunks of any size
+        keys: Member names of the array to stream
+
+    Yields:
+        Decoded array items
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    reader = _Reader(chunks)
+    decoder = json.JSONDecoder()
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value(decoder)
+        reader.expect(":")
+        if key in keys and reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value(decoder)
+                if reader.peek() == "]":
+                    return
+                reader.expect(",")
+        reader.value(decoder)
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
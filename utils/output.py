@@ -0,0 +1,150 @@
+"""
+Machine-readable output for SofaScore CLI.
+Writes rows as JSON lines, CSV or TSV as they are produced, so long listings
+can be piped into other tools without building the whole output in memory.
+"""
+import os
+import csv
+import sys
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, IO, Iterable, Iterator, Optional, Sequence
+
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps the CLI's argument parsing free of pydantic
+    from src.adapter.models import Event
+
+# Output formats; "text" is the human-readable default of each command
+FORMATS = ("text", "jsonl", "csv", "tsv")
+
+EVENT_FIELDS = (
+    "id", "start_time", "start_timestamp", "tournament_id", "tournament",
+    "home_team_id", "home_team", "away_team_id", "away_team",
+    "home_score", "away_score", "status",
+)
+STAT_FIELDS = ("event_id", "period", "group", "name", "home", "away")
+
+class RowWriter:
+    """
+    Writes dict rows in one of the machine-readable formats.
+
+    Output goes through the stream's own buffer and is flushed every
+    ``flush_every`` rows and on ``flush()``, so a consumer at the other end of
+    a pipe sees each batch as soon as it is complete. Used as a context
+    manager, it exits the program quietly once the consumer stops reading
+    (e.g. "| head").
+    """
+
+    def __init__(self, fmt: str, fields: Sequence[str], stream: Optional[IO[str]] = None, flush_every: int = 500):
+        """
+        Initialize the writer; CSV and TSV output starts with a header row.
+
+        Args:
+            fmt: One of "jsonl", "csv" or "tsv"
+            fields: Column names, in output order
+            stream: Text stream to write to (default: stdout)
+            flush_every: Number of rows between automatic flushes
+        """
+        if fmt not in ("jsonl", "csv", "tsv"):
+            raise ValueError(f"Unsupported output format: {fmt}")
+        self.fmt = fmt
+        self.fields = tuple(fields)
+        self.stream = stream if stream is not None else sys.stdout
+        self.flush_every = max(1, flush_every)
+        self.rows = 0
+        self._csv = None
+        if fmt != "jsonl":
+            self._csv = csv.writer(self.stream, delimiter="," if fmt == "csv" else "\t", lineterminator="\n")
+            self._csv.writerow(self.fields)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Write one row; missing fields are written as empty values."""
+        if self._csv is None:
+            self.stream.write(json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False) + "\n")
+        else:
+            self._csv.writerow(["" if row.get(field) is None else row[field] for field in self.fields])
+        self.rows += 1
+        if self.rows % self.flush_every == 0:
+            self.flush()
+
+    def write_all(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Write rows as they are produced, then flush."""
+        for row in rows:
+            self.write(row)
+        self.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __enter__(self) -> "RowWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            try:
+                self.flush()
+            except BrokenPipeError:
+                self._broken_pipe()
+        elif issubclass(exc_type, BrokenPipeError):
+            self._broken_pipe()
+
+    def _broken_pipe(self) -> None:
+        """The consumer stopped reading; discard the rest of the output and exit quietly."""
+        try:
+            fd = self.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            fd = None
+        if fd is not None:
+            # Buffered output is flushed again at exit; let it go to devnull instead of failing
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, fd)
+            os.close(devnull)
+        raise SystemExit(0)
+
+def event_row(event: "Event") -> Dict[str, Any]:
+    """
+    Flatten an event into an output row.
+
+    Args:
+        event: Event to flatten
+
+    Returns:
+        Dictionary with the EVENT_FIELDS columns
+    """
+    return {
+        "id": event.id,
+        "start_time": datetime.fromtimestamp(event.start_timestamp).isoformat(timespec="minutes"),
+        "start_timestamp": event.start_timestamp,
+        "tournament_id": event.tournament.get("id"),
+        "tournament": event.tournament.get("name"),
+        "home_team_id": event.home_team.id,
+        "home_team": event.home_team.name,
+        "away_team_id": event.away_team.id,
+        "away_team": event.away_team.name,
+        "home_score": event.home_score,
+        "away_score": event.away_score,
+        "status": event.status.description or event.status.type if event.status else None,
+    }
+
+def stat_rows(event_id: int, stats_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Flatten a statistics payload into one row per statistic and period.
+
+    Args:
+        event_id: Event the statistics belong to
+        stats_data: Raw statistics payload
+
+    Yields:
+        Dictionaries with the STAT_FIELDS columns
+    """
+    for period in stats_data.get("statistics", []):
+        for group in period.get("groups", []):
+            for item in group.get("statisticsItems", []):
+                yield {
+                    "event_id": event_id,
+                    "period": period.get("period", period.get("name")),
+                    "group": group.get("groupName"),
+                    "name": item.get("name"),
+                    "home": item.get("home"),
+                    "away": item.get("away"),
+                }